@@ -39,7 +39,10 @@ def create_app(config_name="production"):
     # Initialize encryption
     from app.services.encryption_service import EncryptionService
 
-    EncryptionService.initialize(app.instance_path)
+    EncryptionService.initialize(
+        app.instance_path,
+        record_version=app.config["ENCRYPTION_RECORD_VERSION"],
+    )
 
     # Register blueprints
     from app.auth.routes import auth_bp
@@ -69,12 +72,75 @@ def create_app(config_name="production"):
     # Exempt API from CSRF (uses token auth)
     csrf.exempt(api_v1_bp)
 
+    # Per-request metrics (exported at /admin/metrics)
+    from app.services.metrics_service import MetricsService
+
+    MetricsService.init_app(app)
+
+    # Slow-query log with EXPLAIN capture (report at /admin/slow-queries)
+    from app.services.slow_query_service import SlowQueryService
+
+    SlowQueryService.init_app(app)
+
+    # On-demand request profiler (captures listed at /admin/profiles)
+    from app.services.profiler_service import ProfilerService
+
+    ProfilerService.init_app(app)
+
+    # Full-text search index (rebuilt with `flask search-rebuild`)
+    from app.services.search_service import SearchService
+
+    SearchService.init_app(app)
+
+    # Trigram fuzzy fallback for both searches
+    from app.services.fuzzy_search_service import FuzzySearchService
+
+    FuzzySearchService.init_app(app)
+
+    # Global quick-search prefix index (/api/v1/search)
+    from app.services.quick_search_service import QuickSearchService
+
+    QuickSearchService.init_app(app)
+
+    # License spend/renewal rollups
+    from app.services.report_service import ReportService
+
+    ReportService.init_app(app)
+
+    # Offline breached-password lookups
+    from app.services.breach_service import BreachService
+
+    BreachService.init_app(app)
+
+    # Password reuse/weakness/rotation report
+    from app.services.hygiene_service import HygieneService
+
+    HygieneService.init_app(app)
+
+    # Per-request access contexts over cached group memberships
+    from app.services.access_service import AccessService
+
+    AccessService.init_app(app)
+
+    # Cached user snapshots for the session loader
+    from app.services.user_cache_service import UserCacheService
+
+    UserCacheService.init_app(app)
+
+    # Application endpoint health probes
+    from app.services.health_check_service import HealthCheckService
+
+    HealthCheckService.init_app(app)
+
+    # CLI commands
+    from app.cli import register_commands
+
+    register_commands(app)
+
     # User loader for flask-login
     @login_manager.user_loader
     def load_user(user_id):
-        from app.models.user import User
-
-        return db.session.get(User, int(user_id))
+        return UserCacheService.load(int(user_id))
 
     # Make session permanent by default (for timeout)
     @app.before_request
@@ -2,4 +2,4 @@ from flask import Blueprint
 
 api_v1_bp = Blueprint("api_v1", __name__)
 
-from app.api.v1 import secrets, folders, users, audit, generator  # noqa: E402, F401
+from app.api.v1 import secrets, folders, users, audit, generator, search, licenses, reports, applications, shares  # noqa: E402, F401
@@ -0,0 +1,89 @@
+import csv
+import io
+import json
+
+from flask import Response, jsonify, request, stream_with_context
+from flask_login import current_user, login_required
+
+from app.api.v1 import api_v1_bp
+from app.auth.decorators import admin_required
+from app.services.application_service import TRANSFER_FIELDS, ApplicationService
+
+# Rows serialized per yielded chunk of a streamed export
+EXPORT_BATCH = 500
+
+
+def _export_csv():
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=TRANSFER_FIELDS)
+    writer.writeheader()
+    for number, row in enumerate(ApplicationService.export_rows(), start=1):
+        writer.writerow(row)
+        if number % EXPORT_BATCH == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _export_ndjson():
+    lines = []
+    for row in ApplicationService.export_rows():
+        lines.append(json.dumps(row, ensure_ascii=False))
+        if len(lines) >= EXPORT_BATCH:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+@api_v1_bp.route("/applications/export", methods=["GET"])
+@login_required
+def api_export_applications():
+    """Stream the whole inventory as CSV (default) or NDJSON."""
+    fmt = request.args.get("format", "csv")
+    if fmt == "ndjson":
+        body, mimetype = _export_ndjson(), "application/x-ndjson"
+    elif fmt == "csv":
+        body, mimetype = _export_csv(), "text/csv"
+    else:
+        return jsonify({"success": False, "message": "format must be csv or ndjson"}), 400
+    return Response(
+        stream_with_context(body),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename=applications.{fmt}"},
+    )
+
+
+def _ndjson_rows(lines):
+    for line in lines:
+        line = line.strip()
+        if line:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield None
+
+
+@api_v1_bp.route("/applications/import", methods=["POST"])
+@login_required
+@admin_required
+def api_import_applications():
+    """Upsert applications keyed on (name, server_name) from a CSV or NDJSON
+    body (columns as in the export). ``?dry_run=1`` returns the diff only."""
+    dry_run = request.args.get("dry_run", "").lower() in ("1", "true", "yes")
+    stream = io.TextIOWrapper(request.stream, encoding="utf-8-sig")
+    if request.mimetype == "text/csv":
+        rows = csv.DictReader(stream)
+    elif request.mimetype in ("application/x-ndjson", "application/jsonl"):
+        rows = _ndjson_rows(stream)
+    else:
+        return jsonify({
+            "success": False,
+            "message": "Send text/csv or application/x-ndjson",
+        }), 415
+
+    summary = ApplicationService.import_applications(rows, current_user, dry_run=dry_run)
+    if not summary["rows"]:
+        return jsonify({"success": False, "message": "No rows provided"}), 400
+    return jsonify({"success": True, "data": summary})
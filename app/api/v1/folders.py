@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from flask import abort, jsonify, request
 from flask_login import current_user, login_required
 
@@ -5,6 +7,10 @@ from app import db
 from app.api.v1 import api_v1_bp
 from app.auth.decorators import write_required
 from app.models.folder import Folder
+from app.models.group import Group
+from app.models.share import FolderShare
+from app.models.user import User
+from app.services.share_service import ShareService
 
 
 @api_v1_bp.route("/folders", methods=["GET"])
@@ -71,3 +77,76 @@ def api_delete_folder(folder_id):
     db.session.delete(folder)
     db.session.commit()
     return jsonify({"success": True, "message": "Folder deleted"})
+
+
+def _folder_for_sharing(folder_id):
+    folder = db.session.get(Folder, folder_id)
+    if not folder:
+        abort(404)
+    if folder.owner_id != current_user.id and not current_user.is_admin():
+        abort(403)
+    return folder
+
+
+@api_v1_bp.route("/folders/<int:folder_id>/shares", methods=["GET"])
+@login_required
+def api_list_folder_shares(folder_id):
+    folder = _folder_for_sharing(folder_id)
+    return jsonify({
+        "success": True,
+        "data": [
+            {
+                "id": s.id,
+                "user_id": s.user_id,
+                "group_id": s.group_id,
+                "permission": s.permission,
+                "expires_at": s.expires_at.isoformat() if s.expires_at else None,
+            }
+            for s in folder.shares
+        ],
+    })
+
+
+@api_v1_bp.route("/folders/<int:folder_id>/shares", methods=["POST"])
+@login_required
+@write_required
+def api_share_folder(folder_id):
+    """Grant a user or group access to everything under the folder."""
+    folder = _folder_for_sharing(folder_id)
+    data = request.get_json() or {}
+    if bool(data.get("user_id")) == bool(data.get("group_id")):
+        return jsonify({"success": False,
+                        "message": "Exactly one of user_id or group_id is required"}), 400
+    permission = data.get("permission", "read")
+    if permission not in ("read", "write"):
+        return jsonify({"success": False, "message": "permission must be read or write"}), 400
+    if data.get("user_id"):
+        user = db.session.get(User, data["user_id"])
+        if not user or not user.is_active:
+            return jsonify({"success": False, "message": "Unknown user"}), 400
+    if data.get("group_id") and not db.session.get(Group, data["group_id"]):
+        return jsonify({"success": False, "message": "Unknown group"}), 400
+    expires_at = None
+    if data.get("expires_at"):
+        try:
+            expires_at = datetime.fromisoformat(data["expires_at"])
+        except ValueError:
+            return jsonify({"success": False, "message": "expires_at must be an ISO date"}), 400
+
+    share = ShareService.share_folder(
+        folder, current_user, user_id=data.get("user_id"), group_id=data.get("group_id"),
+        permission=permission, expires_at=expires_at,
+    )
+    return jsonify({"success": True, "data": {"id": share.id}}), 201
+
+
+@api_v1_bp.route("/folders/<int:folder_id>/shares/<int:share_id>", methods=["DELETE"])
+@login_required
+@write_required
+def api_unshare_folder(folder_id, share_id):
+    folder = _folder_for_sharing(folder_id)
+    share = db.session.get(FolderShare, share_id)
+    if not share or share.folder_id != folder.id:
+        abort(404)
+    ShareService.unshare_folder(share, current_user)
+    return jsonify({"success": True, "message": "Share removed"})
@@ -1,19 +1,84 @@
-from flask import jsonify, request
+import json
+
+from flask import Response, jsonify, request, stream_with_context
 from flask_login import login_required
 
 from app.api.v1 import api_v1_bp
-from app.services.password_generator import PasswordGenerator
+from app.services.password_generator import (
+    PASSPHRASE_MAX_WORDS,
+    PASSPHRASE_MIN_WORDS,
+    PasswordGenerator,
+)
+
+MAX_BATCH = 10000
+
+# Passwords serialized per yielded chunk of a streamed batch
+STREAM_BATCH = 200
+
+
+def _stream(results):
+    def generate():
+        lines = []
+        for password, strength in results:
+            lines.append(json.dumps({"password": password, "strength": strength}))
+            if len(lines) >= STREAM_BATCH:
+                yield "\n".join(lines) + "\n"
+                lines = []
+        if lines:
+            yield "\n".join(lines) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+
+def _passphrase_options(data):
+    words, digits = data.get("words", 6), data.get("digits", 0)
+    separator = data.get("separator", "-")
+    if not isinstance(words, int) or isinstance(words, bool):
+        raise ValueError("words must be an integer")
+    if not isinstance(digits, int) or isinstance(digits, bool):
+        raise ValueError("digits must be an integer")
+    if not isinstance(separator, str) or len(separator) > 3:
+        raise ValueError("separator must be a string of at most 3 characters")
+    return dict(
+        words=max(PASSPHRASE_MIN_WORDS, min(PASSPHRASE_MAX_WORDS, words)),
+        separator=separator,
+        capitalize=data.get("capitalize", "none"),
+        digits=digits,
+    )
 
 
 @api_v1_bp.route("/generator/password", methods=["POST"])
 @login_required
 def api_generate_password():
+    """One password, or with ``count`` a stream of NDJSON lines
+    ``{"password": ..., "strength": {...}}``. ``"mode": "passphrase"``
+    generates word passphrases (``words``, ``separator``, ``capitalize``,
+    ``digits``) instead, with their exact ``entropy`` in bits."""
     data = request.get_json() or {}
 
+    if "count" in data:
+        count = data["count"]
+        if not isinstance(count, int) or isinstance(count, bool) or not 1 <= count <= MAX_BATCH:
+            return jsonify({"success": False, "message": f"count must be between 1 and {MAX_BATCH}"}), 400
+
+    if data.get("mode") == "passphrase":
+        try:
+            options = _passphrase_options(data)
+            if "count" in data:
+                return _stream(PasswordGenerator.generate_passphrase_batch(data["count"], **options))
+            password = PasswordGenerator.generate_passphrase(**options)
+        except ValueError as exc:
+            return jsonify({"success": False, "message": str(exc)}), 400
+        strength = PasswordGenerator.calculate_strength(password)
+        strength["entropy"] = round(PasswordGenerator.passphrase_entropy(
+            options["words"], options["capitalize"], options["digits"]
+        ), 2)
+        return jsonify({"success": True, "data": {"password": password, "strength": strength}})
+
     length = data.get("length", 20)
     length = max(8, min(128, length))
 
-    password = PasswordGenerator.generate(
+    options = dict(
         length=length,
         use_uppercase=data.get("uppercase", True),
         use_lowercase=data.get("lowercase", True),
@@ -21,6 +86,16 @@ def api_generate_password():
         use_symbols=data.get("symbols", True),
         exclude_ambiguous=data.get("exclude_ambiguous", True),
     )
+    if data.get("custom_symbols") is not None:
+        symbols = data["custom_symbols"]
+        if not isinstance(symbols, str) or not symbols or any(c.isspace() for c in symbols):
+            return jsonify({"success": False, "message": "custom_symbols must be a non-empty string without spaces"}), 400
+        options["custom_symbols"] = symbols
+
+    if "count" in data:
+        return _stream(PasswordGenerator.generate_batch(data["count"], **options))
+
+    password = PasswordGenerator.generate(**options)
     strength = PasswordGenerator.calculate_strength(password)
 
     return jsonify({
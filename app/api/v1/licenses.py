@@ -0,0 +1,90 @@
+import csv
+from collections import Counter
+from io import StringIO
+
+from flask import abort, jsonify, request
+from flask_login import current_user, login_required
+
+from app import db
+from app.api.v1 import api_v1_bp
+from app.auth.decorators import admin_required
+from app.models.license import License
+from app.services.license_service import LicenseService
+
+
+@api_v1_bp.route("/licenses/<int:license_id>/assignments", methods=["POST"])
+@login_required
+@admin_required
+def api_assign_license(license_id):
+    lic = db.session.get(License, license_id)
+    if not lic:
+        abort(404)
+
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"success": False, "message": "Send a JSON object"}), 400
+    assignees = data.get("assigned_to")
+    if isinstance(assignees, str):
+        assignees = [assignees]
+    if not assignees or not isinstance(assignees, list):
+        return jsonify({"success": False, "message": "assigned_to is required"}), 400
+
+    assignments, error = LicenseService.assign_users(
+        lic, [str(a) for a in assignees], current_user, notes=data.get("notes")
+    )
+    if error:
+        return jsonify({"success": False, "message": error}), 409
+
+    return jsonify({
+        "success": True,
+        "data": {
+            "assigned": [a.assigned_to for a in assignments],
+            "used_seats": lic.used_seats,
+            "available_seats": lic.available_seats,
+        },
+    }), 201
+
+
+MAX_IMPORT_ROWS = 10000
+
+
+@api_v1_bp.route("/licenses/<int:license_id>/assignments/import", methods=["POST"])
+@login_required
+@admin_required
+def api_import_license_assignments(license_id):
+    """Bulk assignment from CSV (assigned_to, machine_name, notes columns)
+    or a JSON list of row objects; returns a result per row."""
+    lic = db.session.get(License, license_id)
+    if not lic:
+        abort(404)
+
+    if request.mimetype == "text/csv":
+        rows = list(csv.DictReader(StringIO(request.get_data(as_text=True))))
+    else:
+        data = request.get_json(silent=True) or {}
+        if isinstance(data, list):
+            rows = data
+        elif not isinstance(data, dict):
+            return jsonify({"success": False, "message": "Send a JSON object or a list of rows"}), 400
+        elif data.get("format") == "csv":
+            rows = list(csv.DictReader(StringIO(data.get("content", ""))))
+        else:
+            rows = data.get("rows")
+    if not isinstance(rows, list) or not rows:
+        return jsonify({"success": False, "message": "No rows provided"}), 400
+    if len(rows) > MAX_IMPORT_ROWS:
+        return jsonify({
+            "success": False,
+            "message": f"At most {MAX_IMPORT_ROWS} rows per import",
+        }), 400
+
+    results = LicenseService.import_assignments(lic, rows, current_user)
+    return jsonify({
+        "success": True,
+        "data": {
+            "summary": dict(Counter(r["status"] for r in results)),
+            "results": results,
+            "used_seats": lic.used_seats,
+            "available_seats": lic.available_seats,
+        },
+    })
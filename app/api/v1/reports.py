@@ -0,0 +1,102 @@
+import csv
+from datetime import datetime
+from io import StringIO
+
+from flask import Response, jsonify, request, stream_with_context
+from flask_login import login_required
+
+from app.api.v1 import api_v1_bp
+from app.auth.decorators import admin_required
+from app.services.hygiene_service import HygieneService
+from app.services.report_service import SPEND_GROUPS, ReportService
+
+MAX_RENEWAL_MONTHS = 60
+MAX_HYGIENE_LIMIT = 500
+
+
+def _csv_response(rows, columns, filename):
+    """Stream ``rows`` (dicts) as CSV, one line per chunk."""
+
+    def generate():
+        buffer = StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow([row[column] for column in columns])
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue()
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/csv",
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
+
+
+def _json_rows(rows):
+    return [
+        {key: str(value) if key.endswith("_cost") else value for key, value in row.items()}
+        for row in rows
+    ]
+
+
+@api_v1_bp.route("/reports/license-spend", methods=["GET"])
+@login_required
+def api_license_spend():
+    """Spend per vendor and/or department (always split by currency)."""
+    group_by = [g.strip() for g in request.args.get("group_by", "vendor").split(",") if g.strip()]
+    unknown = [g for g in group_by if g not in SPEND_GROUPS]
+    if unknown:
+        return jsonify({
+            "success": False,
+            "message": f"group_by must be any of: {', '.join(SPEND_GROUPS)}",
+        }), 400
+
+    rows = ReportService.spend(group_by)
+    columns = [g for g in SPEND_GROUPS if g in group_by or g == "currency"]
+    columns += ["license_count", "total_cost", "active_count", "active_cost"]
+    if request.args.get("format") == "csv":
+        return _csv_response(rows, columns, "license-spend.csv")
+    return jsonify({"success": True, "data": _json_rows(rows), "group_by": columns[:-4]})
+
+
+@api_v1_bp.route("/reports/license-renewals", methods=["GET"])
+@login_required
+def api_license_renewals():
+    """Active licenses due for renewal per month, from ``from`` (YYYY-MM,
+    default this month) for ``months`` months."""
+    months = request.args.get("months", 12, type=int)
+    if not 1 <= months <= MAX_RENEWAL_MONTHS:
+        return jsonify({
+            "success": False,
+            "message": f"months must be between 1 and {MAX_RENEWAL_MONTHS}",
+        }), 400
+    start = None
+    if request.args.get("from"):
+        try:
+            start = datetime.strptime(request.args["from"], "%Y-%m").date()
+        except ValueError:
+            return jsonify({"success": False, "message": "from must be YYYY-MM"}), 400
+
+    rows = ReportService.renewals(start=start, months=months)
+    if request.args.get("format") == "csv":
+        return _csv_response(rows, ["month", "currency", "license_count", "total_cost"],
+                             "license-renewals.csv")
+    return jsonify({"success": True, "data": _json_rows(rows)})
+
+
+@api_v1_bp.route("/reports/password-hygiene", methods=["GET"])
+@login_required
+@admin_required
+def api_password_hygiene():
+    """Vault-wide reused, weak and rotation-overdue passwords (at most
+    ``limit`` entries per list)."""
+    limit = request.args.get("limit", 50, type=int)
+    if not 1 <= limit <= MAX_HYGIENE_LIMIT:
+        return jsonify({
+            "success": False,
+            "message": f"limit must be between 1 and {MAX_HYGIENE_LIMIT}",
+        }), 400
+    return jsonify({"success": True, "data": HygieneService.report(limit=limit)})
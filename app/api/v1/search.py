@@ -0,0 +1,48 @@
+from flask import current_app, jsonify, request, url_for
+from flask_login import current_user, login_required
+
+from app.api.v1 import api_v1_bp
+from app.auth.decorators import admin_required
+from app.services.quick_search_service import QUICK_SEARCH_KINDS, QuickSearchService
+
+_RESULT_URLS = {
+    "secrets": lambda ref_id: url_for("secrets.detail", secret_id=ref_id),
+    "licenses": lambda ref_id: url_for("licenses.detail", license_id=ref_id),
+    "applications": lambda ref_id: url_for("applications.detail", app_id=ref_id),
+    "folders": lambda ref_id: url_for("secrets.list_secrets", folder_id=ref_id),
+}
+
+
+@api_v1_bp.route("/search", methods=["GET"])
+@login_required
+def api_quick_search():
+    q = request.args.get("q", "").strip()
+    limit = max(1, min(request.args.get("limit", 10, type=int),
+                       current_app.config["QUICK_SEARCH_MAX_LIMIT"]))
+    kinds = None
+    if request.args.get("types"):
+        kinds = {k.strip() for k in request.args["types"].split(",")} & set(QUICK_SEARCH_KINDS)
+
+    results = QuickSearchService.search(current_user, q, limit=limit, kinds=kinds)
+    return jsonify({
+        "success": True,
+        "data": [
+            {"type": kind, "id": ref_id, "name": name, "url": _RESULT_URLS[kind](ref_id)}
+            for kind, ref_id, name in results
+        ],
+    })
+
+
+@api_v1_bp.route("/search/stats", methods=["GET"])
+@login_required
+@admin_required
+def api_quick_search_stats():
+    return jsonify({"success": True, "data": QuickSearchService.stats()})
+
+
+@api_v1_bp.route("/search/rebuild", methods=["POST"])
+@login_required
+@admin_required
+def api_quick_search_rebuild():
+    QuickSearchService.rebuild()
+    return jsonify({"success": True, "data": QuickSearchService.stats()})
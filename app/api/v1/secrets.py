@@ -8,6 +8,7 @@ from app.api.v1 import api_v1_bp
 from app.auth.decorators import write_required
 from app.models.secret import Secret
 from app.services.export_service import ExportService
+from app.services.search_service import SearchService
 from app.services.secret_service import SecretService
 
 
@@ -110,7 +111,11 @@ def api_create_secret():
         rotation_interval_days=data.get("rotation_interval_days"),
     )
 
-    return jsonify({"success": True, "data": _secret_to_dict(secret, include_sensitive=True)}), 201
+    response = {"success": True, "data": _secret_to_dict(secret, include_sensitive=True)}
+    warnings = SecretService.password_warnings(data.get("password"))
+    if warnings:
+        response["warnings"] = warnings
+    return jsonify(response), 201
 
 
 @api_v1_bp.route("/secrets/<int:secret_id>", methods=["PUT"])
@@ -141,7 +146,11 @@ def api_update_secret(secret_id):
             return jsonify({"success": False, "message": "Invalid expires_at format"}), 400
 
     SecretService.update_secret(secret, **kwargs)
-    return jsonify({"success": True, "data": _secret_to_dict(secret, include_sensitive=True)})
+    response = {"success": True, "data": _secret_to_dict(secret, include_sensitive=True)}
+    warnings = SecretService.password_warnings(kwargs.get("password"))
+    if warnings:
+        response["warnings"] = warnings
+    return jsonify(response)
 
 
 @api_v1_bp.route("/secrets/<int:secret_id>", methods=["DELETE"])
@@ -190,6 +199,8 @@ def api_import_secrets():
 
     for secret in created:
         db.session.add(secret)
+    db.session.flush()
+    SearchService.index_many(created)
     db.session.commit()
 
     return jsonify({"success": True, "message": f"{len(created)} secrets imported"})
@@ -0,0 +1,122 @@
+from datetime import datetime
+
+from flask import jsonify, request
+from flask_login import current_user, login_required
+
+from app import db
+from app.api.v1 import api_v1_bp
+from app.auth.decorators import write_required
+from app.models.group import Group
+from app.models.secret import Secret
+from app.models.user import User
+from app.services.secret_service import SecretService
+from app.services.share_service import ShareService
+
+MAX_BULK_IDS = 5000
+
+
+class _BadRequest(ValueError):
+    pass
+
+
+def _selection(data):
+    """Secret ids named in the request body: an explicit ``secret_ids`` list,
+    or a ``filter`` with the secret list's parameters (every match, unpaged)."""
+    if "secret_ids" in data:
+        ids = data["secret_ids"]
+        if not isinstance(ids, list) or not all(isinstance(i, int) for i in ids):
+            raise _BadRequest("secret_ids must be a list of integers")
+        if not ids or len(ids) > MAX_BULK_IDS:
+            raise _BadRequest(f"secret_ids must hold 1 to {MAX_BULK_IDS} ids")
+        return ids
+    criteria = data.get("filter")
+    if not isinstance(criteria, dict):
+        raise _BadRequest("secret_ids or filter is required")
+    query = SecretService.accessible_query(
+        current_user,
+        folder_id=criteria.get("folder_id"),
+        category=criteria.get("category"),
+        q=(criteria.get("q") or "").strip() or None,
+        favorites_only=bool(criteria.get("favorites")),
+        shared_only=bool(criteria.get("shared")),
+    )
+    return query.with_entities(Secret.id).order_by(None)
+
+
+def _target(data):
+    user_id, group_id = data.get("user_id"), data.get("group_id")
+    if bool(user_id) == bool(group_id):
+        raise _BadRequest("Exactly one of user_id or group_id is required")
+    if user_id:
+        user = db.session.get(User, user_id)
+        if not user or not user.is_active:
+            raise _BadRequest("Unknown user")
+    elif not db.session.get(Group, group_id):
+        raise _BadRequest("Unknown group")
+    return user_id, group_id
+
+
+@api_v1_bp.route("/shares/bulk", methods=["POST"])
+@login_required
+@write_required
+def api_bulk_share():
+    """Grant one user or group access to many secrets at once."""
+    data = request.get_json() or {}
+    try:
+        secret_ids = _selection(data)
+        user_id, group_id = _target(data)
+        permission = data.get("permission", "read")
+        if permission not in ("read", "write"):
+            raise _BadRequest("permission must be read or write")
+        expires_at = None
+        if data.get("expires_at"):
+            try:
+                expires_at = datetime.fromisoformat(data["expires_at"])
+            except ValueError:
+                raise _BadRequest("expires_at must be an ISO date")
+    except _BadRequest as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+
+    created, updated = ShareService.share_secrets(
+        secret_ids, current_user, user_id=user_id, group_id=group_id,
+        permission=permission, expires_at=expires_at,
+    )
+    return jsonify({"success": True, "data": {"created": created, "updated": updated}})
+
+
+@api_v1_bp.route("/shares/bulk", methods=["DELETE"])
+@login_required
+@write_required
+def api_bulk_unshare():
+    """Remove one user's or group's shares from many secrets at once."""
+    data = request.get_json() or {}
+    try:
+        secret_ids = _selection(data)
+        user_id, group_id = _target(data)
+    except _BadRequest as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+
+    removed = ShareService.unshare_secrets(
+        secret_ids, current_user, user_id=user_id, group_id=group_id
+    )
+    return jsonify({"success": True, "data": {"removed": removed}})
+
+
+@api_v1_bp.route("/shares/targets", methods=["GET"])
+@login_required
+def api_share_targets():
+    page = max(request.args.get("page", 1, type=int), 1)
+    per_page = min(max(request.args.get("per_page", 20, type=int), 1), 100)
+    q = request.args.get("q", "").strip()
+
+    items, total = ShareService.share_targets(current_user, q or None, page, per_page)
+    return jsonify({
+        "success": True,
+        "data": items,
+        "pagination": {
+            "page": page,
+            "per_page": per_page,
+            "total": total,
+            "pages": -(-total // per_page),
+        },
+    })
@@ -15,6 +15,7 @@ from app import db, limiter
 from app.models.user import User
 from app.services.audit_service import AuditService
 from app.services.ldap_service import LDAPService
+from app.services.search_service import SearchService
 
 auth_bp = Blueprint("auth", __name__, url_prefix="/auth")
 
@@ -105,6 +106,7 @@ def login():
 
         # Upsert user in local DB
         try:
+            searchable = (user.full_name, user.email) if user else None
             if not user:
                 user = User(
                     username=ad_user["username"],
@@ -135,6 +137,9 @@ def login():
             if role:
                 user.role = role
 
+            if searchable != (user.full_name, user.email):
+                db.session.flush()
+                SearchService.index(user)
             db.session.commit()
             login_user(user, remember=remember)
             AuditService.log(
@@ -0,0 +1,240 @@
+import click
+
+
+def register_commands(app):
+    """Attach KeyVault maintenance commands to ``flask``."""
+
+    @app.cli.command("migrate-encryption")
+    @click.option("--batch-size", default=500, show_default=True,
+                  help="Rows re-encrypted per transaction.")
+    def migrate_encryption(batch_size):
+        """Convert v1 encrypted rows to the v2 record format."""
+        from app.services.record_migration_service import RecordMigrationService
+
+        def report(label):
+            return lambda done: click.echo(f"  {label}: {done} converted")
+
+        click.echo("Migrating secrets...")
+        secrets = RecordMigrationService.migrate_secrets(
+            batch_size=batch_size, progress=report("secrets")
+        )
+        click.echo("Migrating licenses...")
+        licenses = RecordMigrationService.migrate_licenses(
+            batch_size=batch_size, progress=report("licenses")
+        )
+        click.echo(f"Done: {secrets} secrets, {licenses} licenses.")
+
+    @app.cli.command("seed-perf")
+    @click.option("--scale", default=1.0, show_default=True,
+                  help="Multiplier applied to every default count.")
+    @click.option("--seed", default=42, show_default=True,
+                  help="Random seed; the same seed produces the same data.")
+    @click.option("--users", type=int, help="Override the user count.")
+    @click.option("--groups", type=int, help="Override the group count.")
+    @click.option("--folders", type=int, help="Override the folder count.")
+    @click.option("--secrets", type=int, help="Override the secret count.")
+    @click.option("--licenses", type=int, help="Override the license count.")
+    @click.option("--applications", type=int, help="Override the application count.")
+    @click.option("--audit-logs", type=int, help="Override the audit log count.")
+    @click.option("--batch-size", default=5000, show_default=True,
+                  help="Rows per bulk insert.")
+    @click.option("--workers", type=int,
+                  help="Encryption worker processes (default: CPU count).")
+    def seed_perf(scale, seed, batch_size, workers, **counts):
+        """Generate a synthetic large vault for performance testing."""
+        import time
+
+        from app import db
+        from app.models.user import User
+        from app.services.seed_service import PerfSeeder
+
+        db.create_all()
+        if User.query.filter(User.username.like("perf.%")).first():
+            raise click.ClickException(
+                "Database already contains seed-perf data; use a fresh database."
+            )
+
+        seeder = PerfSeeder(
+            app.instance_path,
+            seed=seed,
+            scale=scale,
+            counts=counts,
+            batch_size=batch_size,
+            workers=workers,
+            record_version=app.config["ENCRYPTION_RECORD_VERSION"],
+            echo=click.echo,
+        )
+        click.echo(f"Seeding {seeder.counts} (seed={seed})...")
+        started = time.perf_counter()
+        seeder.run()
+        click.echo(f"Done in {time.perf_counter() - started:.1f}s.")
+
+    @app.cli.command("reconcile-seats")
+    def reconcile_seats():
+        """Recount active license seats and fix drifted counters."""
+        from app.services.license_service import LicenseService
+
+        drifted = LicenseService.reconcile_seat_counts()
+        if drifted:
+            click.echo(f"Fixed seat counts for {len(drifted)} license(s): "
+                       + ", ".join(str(i) for i in drifted[:20])
+                       + (" ..." if len(drifted) > 20 else ""))
+        else:
+            click.echo("All seat counts are correct.")
+
+    @app.cli.command("reports-refresh")
+    def reports_refresh():
+        """Rebuild the license spend and renewal rollups from scratch."""
+        import time
+
+        from app.services.report_service import ReportService
+
+        started = time.perf_counter()
+        ReportService.refresh_all()
+        click.echo(f"Report rollups rebuilt in {time.perf_counter() - started:.2f}s.")
+
+    @app.cli.command("hygiene-backfill")
+    @click.option("--batch-size", default=1000, show_default=True,
+                  help="Secrets assessed per transaction.")
+    @click.option("--workers", type=int,
+                  help="Decryption worker processes (default: CPU count).")
+    @click.option("--all", "recompute", is_flag=True,
+                  help="Reassess every secret, e.g. after a master key change.")
+    def hygiene_backfill(batch_size, workers, recompute):
+        """Fingerprint and score secret passwords for the hygiene report."""
+        import time
+
+        from app.services.hygiene_service import HygieneService
+
+        started = time.perf_counter()
+        done = HygieneService.backfill(
+            app.instance_path, batch_size=batch_size, workers=workers,
+            recompute=recompute, progress=lambda n: click.echo(f"  assessed: {n}"),
+        )
+        click.echo(f"Assessed {done} secret(s) in {time.perf_counter() - started:.1f}s.")
+
+    @app.cli.command("health-check")
+    @click.option("--app-id", "app_ids", type=int, multiple=True,
+                  help="Probe only these applications (repeatable).")
+    def health_check(app_ids):
+        """Probe application endpoints and store the results."""
+        import time
+
+        from app.services.health_check_service import HealthCheckService
+
+        started = time.perf_counter()
+        counts = HealthCheckService.run(app_ids=list(app_ids) or None)
+        summary = ", ".join(f"{status}: {counts[status]}" for status in sorted(counts))
+        click.echo(f"Probed {sum(counts.values())} application(s) in "
+                   f"{time.perf_counter() - started:.1f}s ({summary or 'nothing to probe'}).")
+
+    @app.cli.command("applications-export")
+    @click.argument("output", type=click.File("w", encoding="utf-8"))
+    @click.option("--format", "fmt", type=click.Choice(["csv", "ndjson"]), default="csv",
+                  show_default=True)
+    def applications_export(output, fmt):
+        """Write the application inventory to OUTPUT ("-" for stdout)."""
+        import csv
+        import json
+
+        from app.services.application_service import TRANSFER_FIELDS, ApplicationService
+
+        writer = csv.DictWriter(output, fieldnames=TRANSFER_FIELDS) if fmt == "csv" else None
+        if writer:
+            writer.writeheader()
+        count = 0
+        for count, row in enumerate(ApplicationService.export_rows(), start=1):
+            if writer:
+                writer.writerow(row)
+            else:
+                output.write(json.dumps(row, ensure_ascii=False) + "\n")
+        click.echo(f"Exported {count} application(s).", err=True)
+
+    @app.cli.command("applications-import")
+    @click.argument("source", type=click.File("r", encoding="utf-8-sig"))
+    @click.option("--username", required=True, help="Admin recorded as the importer.")
+    @click.option("--dry-run", is_flag=True, help="Show what would change without writing.")
+    @click.option("--chunk-size", default=1000, show_default=True,
+                  type=click.IntRange(1, 2000), help="Rows per transaction.")
+    def applications_import(source, username, dry_run, chunk_size):
+        """Upsert applications from a CSV or NDJSON file keyed on (name, server_name)."""
+        import csv
+        import json
+        import time
+
+        from app.models.user import User
+        from app.services.application_service import ApplicationService
+
+        user = User.query.filter_by(username=username).first()
+        if not user or not user.is_admin():
+            raise click.ClickException(f"No admin user named {username!r}.")
+
+        if source.name.endswith((".ndjson", ".jsonl")):
+            rows = (json.loads(line) for line in source if line.strip())
+        else:
+            rows = csv.DictReader(source)
+
+        started = time.perf_counter()
+
+        def progress(done):
+            click.echo(f"  {done} rows processed ({time.perf_counter() - started:.1f}s)", err=True)
+
+        summary = ApplicationService.import_applications(
+            rows, user, dry_run=dry_run, chunk_size=chunk_size, progress=progress
+        )
+        for change in summary["preview"]:
+            label = change["name"] + (f" @ {change['server_name']}" if change["server_name"] else "")
+            click.echo(f"{change['action']:>6} {label}")
+            for field, (old, new) in change["changes"].items():
+                click.echo(f"         {field}: {old!r} -> {new!r}")
+        for error in summary["errors"][:50]:
+            click.echo(f"row {error['row']}: {error['message']}", err=True)
+        verb = "Would import" if dry_run else "Imported"
+        click.echo(
+            f"{verb} {summary['rows']} rows: {summary['created']} created, "
+            f"{summary['updated']} updated, {summary['unchanged']} unchanged, "
+            f"{summary['skipped']} duplicate, {len(summary['errors'])} invalid "
+            f"in {time.perf_counter() - started:.1f}s."
+        )
+
+    @app.cli.command("breach-build")
+    @click.argument("source", type=click.File("r", encoding="ascii", errors="replace"))
+    @click.option("--output", type=click.Path(dir_okay=False),
+                  help="Index file (default: BREACH_INDEX_PATH).")
+    @click.option("--bloom-error-rate", type=float, default=None,
+                  help="Also write a Bloom filter with this false-positive rate, e.g. 0.001.")
+    def breach_build(source, output, bloom_error_rate):
+        """Build the breached-password index from a HIBP SHA-1 text file."""
+        import time
+
+        from app.services.breach_service import BreachService
+
+        output = output or str(BreachService._path)
+        started = time.perf_counter()
+        count = BreachService.build(
+            source, output, bloom_error_rate=bloom_error_rate,
+            progress=lambda done: click.echo(f"  {done:,} hashes sorted", err=True),
+        )
+        click.echo(f"Wrote {count:,} hashes to {output} in {time.perf_counter() - started:.1f}s.")
+
+    @app.cli.command("search-rebuild")
+    @click.option("--kind", type=click.Choice(["secrets", "licenses", "applications", "users"]),
+                  help="Rebuild one index only.")
+    @click.option("--batch-size", default=1000, show_default=True,
+                  help="Rows written per statement.")
+    def search_rebuild(kind, batch_size):
+        """Rebuild the full-text search index from the source tables."""
+        from app.services.search_service import SearchService
+
+        click.echo(f"Rebuilding search index ({SearchService.backend_name()})...")
+        for name, count in SearchService.rebuild(kind=kind, batch_size=batch_size).items():
+            click.echo(f"  {name}: {count} indexed")
+
+    @app.cli.command("profile-token")
+    def profile_token():
+        """Print a signed X-KeyVault-Profile header value."""
+        from app.services.profiler_service import PROFILE_HEADER, ProfilerService
+
+        max_age = app.config["PROFILE_TOKEN_MAX_AGE"]
+        click.echo(f"{PROFILE_HEADER}: {ProfilerService.create_token()}")
+        click.echo(f"(valid for {max_age} seconds)", err=True)
@@ -43,6 +43,74 @@ class BaseConfig:
     MAX_LOGIN_ATTEMPTS = int(os.environ.get("MAX_LOGIN_ATTEMPTS", "5"))
     LOCKOUT_DURATION_MINUTES = int(os.environ.get("LOCKOUT_DURATION_MINUTES", "15"))
 
+    # Encryption: record format used for newly written rows (1 = per-field
+    # Fernet tokens, 2 = single AES-GCM blob per row)
+    ENCRYPTION_RECORD_VERSION = int(os.environ.get("ENCRYPTION_RECORD_VERSION", "2"))
+
+    # Observability
+    METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "true").lower() == "true"
+    METRICS_SERVER_TIMING = os.environ.get("METRICS_SERVER_TIMING", "false").lower() == "true"
+
+    # Full-text search: "auto" (FTS5 / tsvector / in-memory by dialect),
+    # "memory" (in-process index only) or "off" (plain LIKE filters)
+    SEARCH_BACKEND = os.environ.get("SEARCH_BACKEND", "auto").lower()
+    SEARCH_MAX_RESULTS = int(os.environ.get("SEARCH_MAX_RESULTS", "1000"))
+    SEARCH_MEMORY_REFRESH_SECONDS = int(os.environ.get("SEARCH_MEMORY_REFRESH_SECONDS", "300"))
+
+    # Typo-tolerant fallback when full-text search finds nothing
+    FUZZY_SEARCH_ENABLED = os.environ.get("FUZZY_SEARCH_ENABLED", "true").lower() == "true"
+    FUZZY_SIMILARITY_THRESHOLD = float(os.environ.get("FUZZY_SIMILARITY_THRESHOLD", "0.4"))
+    FUZZY_MAX_RESULTS = 200
+
+    # Quick search (/api/v1/search): in-process name prefix index
+    QUICK_SEARCH_REFRESH_SECONDS = int(os.environ.get("QUICK_SEARCH_REFRESH_SECONDS", "300"))
+    QUICK_SEARCH_SCAN_LIMIT = int(os.environ.get("QUICK_SEARCH_SCAN_LIMIT", "2000"))
+    QUICK_SEARCH_MAX_LIMIT = 50
+
+    # License spend/renewal reports (/api/v1/reports/*): per-process cache
+    REPORT_CACHE_SECONDS = int(os.environ.get("REPORT_CACHE_SECONDS", "60"))
+
+    # Application endpoint health checks (`flask health-check`, or every
+    # HEALTH_CHECK_INTERVAL seconds in-process; 0 = run from cron only)
+    HEALTH_CHECK_INTERVAL = int(os.environ.get("HEALTH_CHECK_INTERVAL", "0"))
+    HEALTH_CHECK_CONCURRENCY = int(os.environ.get("HEALTH_CHECK_CONCURRENCY", "100"))
+    HEALTH_CHECK_TIMEOUT = float(os.environ.get("HEALTH_CHECK_TIMEOUT", "5"))
+    HEALTH_CHECK_HOST_INTERVAL = float(os.environ.get("HEALTH_CHECK_HOST_INTERVAL", "0.2"))
+    HEALTH_CHECK_SLOW_MS = int(os.environ.get("HEALTH_CHECK_SLOW_MS", "2000"))
+    HEALTH_CHECK_TLS_WARN_DAYS = int(os.environ.get("HEALTH_CHECK_TLS_WARN_DAYS", "14"))
+    HEALTH_CHECK_HISTORY = 48
+
+    # Offline breached-password index built by `flask breach-build`
+    # (default: instance/breach/pwned-sha1.bin)
+    BREACH_INDEX_PATH = os.environ.get("BREACH_INDEX_PATH", "")
+
+    # Password hygiene report (/api/v1/reports/password-hygiene): per-process
+    # cache; fill in fingerprints for older secrets with `flask hygiene-backfill`
+    HYGIENE_CACHE_SECONDS = int(os.environ.get("HYGIENE_CACHE_SECONDS", "60"))
+
+    # Effective group memberships cached across requests; any committed
+    # membership change drops the cache at once
+    ACCESS_CACHE_SECONDS = int(os.environ.get("ACCESS_CACHE_SECONDS", "30"))
+
+    # Logged-in user snapshots served by the session loader; role, status
+    # and lock changes drop the entry on commit
+    USER_CACHE_SECONDS = int(os.environ.get("USER_CACHE_SECONDS", "15"))
+
+    # Slow-query log (logs/slow_queries.log, report at /admin/slow-queries)
+    SLOW_QUERY_LOG_ENABLED = os.environ.get("SLOW_QUERY_LOG_ENABLED", "true").lower() == "true"
+    SLOW_QUERY_THRESHOLD_MS = int(os.environ.get("SLOW_QUERY_THRESHOLD_MS", "250"))
+    SLOW_QUERY_MAX_FINGERPRINTS = int(os.environ.get("SLOW_QUERY_MAX_FINGERPRINTS", "500"))
+
+    # Request profiler: sample 1 in PROFILE_SAMPLE_RATE requests (0 = off)
+    # to the listed blueprints; captures go to instance/profiles/
+    PROFILE_SAMPLE_RATE = int(os.environ.get("PROFILE_SAMPLE_RATE", "0"))
+    PROFILE_SAMPLE_BLUEPRINTS = [
+        b.strip() for b in os.environ.get("PROFILE_SAMPLE_BLUEPRINTS", "").split(",") if b.strip()
+    ]
+    PROFILE_SAMPLE_INTERVAL = float(os.environ.get("PROFILE_SAMPLE_INTERVAL", "0.005"))
+    PROFILE_MAX_CAPTURES = int(os.environ.get("PROFILE_MAX_CAPTURES", "50"))
+    PROFILE_TOKEN_MAX_AGE = int(os.environ.get("PROFILE_TOKEN_MAX_AGE", "3600"))
+
     # Pagination
     ITEMS_PER_PAGE = 25
 
@@ -2,11 +2,13 @@ from app.models.user import User
 from app.models.secret import Secret
 from app.models.folder import Folder
 from app.models.tag import Tag, secret_tags
-from app.models.share import SecretShare
+from app.models.share import FolderShare, SecretShare
 from app.models.group import Group, user_groups
 from app.models.audit_log import AuditLog
 from app.models.license import License, LicenseAssignment
+from app.models.license_rollup import LicenseRenewalRollup, LicenseSpendRollup
 from app.models.application import Application
+from app.models.application_health import ApplicationHealth
 
 __all__ = [
     "User",
@@ -15,10 +17,14 @@ __all__ = [
     "Tag",
     "secret_tags",
     "SecretShare",
+    "FolderShare",
     "Group",
     "user_groups",
     "AuditLog",
     "License",
     "LicenseAssignment",
+    "LicenseSpendRollup",
+    "LicenseRenewalRollup",
     "Application",
+    "ApplicationHealth",
 ]
@@ -0,0 +1,53 @@
+import json
+
+from app import db
+
+
+class ApplicationHealth(db.Model):
+    """Latest endpoint probe for an application, written by HealthCheckService.
+
+    ``history`` holds the most recent probes as a JSON list of
+    ``[unix_time, status, latency_ms]`` so the row stays one per application.
+    """
+
+    __tablename__ = "application_health"
+
+    id = db.Column(db.Integer, primary_key=True)
+    application_id = db.Column(
+        db.Integer,
+        db.ForeignKey("applications.id", ondelete="CASCADE"),
+        nullable=False,
+        unique=True,
+    )
+    status = db.Column(db.String(10), nullable=False, default="unknown")
+    tcp_ms = db.Column(db.Float, nullable=True)
+    http_status = db.Column(db.Integer, nullable=True)
+    http_ms = db.Column(db.Float, nullable=True)
+    tls_expires_at = db.Column(db.DateTime, nullable=True)
+    error = db.Column(db.String(255), nullable=True)
+    checked_at = db.Column(db.DateTime, nullable=False)
+    history = db.Column(db.Text, nullable=True)
+
+    application = db.relationship(
+        "Application",
+        backref=db.backref("health", uselist=False, cascade="all, delete-orphan"),
+    )
+
+    @property
+    def status_badge_class(self):
+        return {
+            "up": "success",
+            "degraded": "warning text-dark",
+            "down": "danger",
+        }.get(self.status, "secondary")
+
+    @property
+    def latency_ms(self):
+        return self.http_ms if self.http_ms is not None else self.tcp_ms
+
+    @property
+    def history_entries(self):
+        return json.loads(self.history) if self.history else []
+
+    def __repr__(self):
+        return f"<ApplicationHealth {self.application_id} {self.status}>"
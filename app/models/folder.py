@@ -23,6 +23,9 @@ class Folder(db.Model):
         "Folder", backref=db.backref("parent", remote_side=[id])
     )
     owner = db.relationship("User")
+    shares = db.relationship(
+        "FolderShare", back_populates="folder", cascade="all, delete-orphan"
+    )
 
     def __repr__(self):
         return f"<Folder {self.name}>"
@@ -16,6 +16,7 @@ class License(db.Model):
 
     # License key (encrypted)
     encrypted_license_key = db.Column(db.Text, nullable=True)
+    encrypted_blob = db.Column(db.LargeBinary, nullable=True)
 
     # Classification
     license_type = db.Column(db.String(50), nullable=False, default="perpetual")
@@ -30,8 +31,10 @@ class License(db.Model):
     expiration_date = db.Column(db.DateTime, nullable=True, index=True)
     support_expiration_date = db.Column(db.DateTime, nullable=True)
 
-    # Seats
+    # Seats (active_seat_count is maintained by LicenseService; see
+    # LicenseService.reconcile_seat_counts)
     seat_count = db.Column(db.Integer, nullable=True)
+    active_seat_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
 
     # Contact / support
     vendor_contact = db.Column(db.String(255), nullable=True)
@@ -67,9 +70,45 @@ class License(db.Model):
     )
 
     # --- Encrypted property accessor for license_key ---
+    #
+    # Version 1 rows store the key as a Fernet token in encrypted_license_key;
+    # version 2 rows store it inside the AES-GCM record blob.
+
+    _RECORD_CONTEXT = b"licenses"
+
+    def _uses_record(self):
+        # A new row takes the configured format on its first field write; a
+        # stored row with no version predates the column and is v1.
+        if self.encryption_version is None and self.id is None:
+            from app.services.encryption_service import EncryptionService
+
+            self.encryption_version = EncryptionService.record_version
+        return self.encryption_version == 2
+
+    def _record(self):
+        cached = self.__dict__.get("_record_cache")
+        if cached is not None and cached[0] is self.encrypted_blob:
+            return cached[1]
+
+        from app.services.encryption_service import EncryptionService
+
+        record = EncryptionService.decrypt_record(
+            self.encrypted_blob, self._RECORD_CONTEXT
+        )
+        self.__dict__["_record_cache"] = (self.encrypted_blob, record)
+        return record
+
+    @property
+    def has_license_key(self):
+        if self._uses_record():
+            return "license_key" in self._record()
+        return self.encrypted_license_key is not None
 
     @property
     def license_key(self):
+        if self._uses_record():
+            return self._record().get("license_key")
+
         if self.encrypted_license_key:
             from app.services.encryption_service import EncryptionService
 
@@ -80,6 +119,14 @@ class License(db.Model):
     def license_key(self, value):
         from app.services.encryption_service import EncryptionService
 
+        if self._uses_record():
+            record = {"license_key": value} if value else {}
+            self.encrypted_blob = EncryptionService.encrypt_record(
+                record, self._RECORD_CONTEXT
+            )
+            self.__dict__["_record_cache"] = (self.encrypted_blob, record)
+            return
+
         self.encrypted_license_key = (
             EncryptionService.encrypt(value) if value else None
         )
@@ -88,7 +135,7 @@ class License(db.Model):
 
     @property
     def used_seats(self):
-        return len([a for a in self.assignments if a.is_active])
+        return self.active_seat_count or 0
 
     @property
     def available_seats(self):
@@ -102,17 +149,23 @@ class License(db.Model):
             return None
         return round((self.used_seats / self.seat_count) * 100, 1)
 
+    def _expiration_utc(self):
+        expires = self.expiration_date
+        if expires and expires.tzinfo is None:
+            expires = expires.replace(tzinfo=timezone.utc)
+        return expires
+
     @property
     def is_expired(self):
         if self.expiration_date:
-            return self.expiration_date <= datetime.now(timezone.utc)
+            return self._expiration_utc() <= datetime.now(timezone.utc)
         return False
 
     @property
     def is_expiring_soon(self):
         if self.expiration_date and not self.is_expired:
             cutoff = datetime.now(timezone.utc) + timedelta(days=30)
-            return self.expiration_date <= cutoff
+            return self._expiration_utc() <= cutoff
         return False
 
     @property
@@ -131,6 +184,19 @@ class License(db.Model):
 
 class LicenseAssignment(db.Model):
     __tablename__ = "license_assignments"
+    __table_args__ = (
+        # One active assignment per person per license; inactive history rows
+        # are unrestricted.
+        db.Index(
+            "uq_license_assignments_active",
+            "license_id",
+            "assigned_to",
+            unique=True,
+            sqlite_where=db.text("is_active = 1"),
+            postgresql_where=db.text("is_active"),
+            mssql_where=db.text("is_active = 1"),
+        ),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     license_id = db.Column(
@@ -140,8 +206,10 @@ class LicenseAssignment(db.Model):
         index=True,
     )
 
-    # Free-text user identification
+    # Free-text user identification; assignee_key is the lowercased username
+    # when assigned_to names a known user, else the lowercased text itself
     assigned_to = db.Column(db.String(255), nullable=False)
+    assignee_key = db.Column(db.String(255), nullable=True, index=True)
 
     # Assignment metadata
     assigned_by_id = db.Column(
@@ -0,0 +1,44 @@
+from app import db
+
+
+class LicenseSpendRollup(db.Model):
+    """License cost per (vendor, department, currency), kept by ReportService.
+
+    Missing vendor/department are stored as "" so the grain stays unique.
+    """
+
+    __tablename__ = "license_spend_rollups"
+    __table_args__ = (
+        db.UniqueConstraint("vendor", "department", "currency", name="uq_license_spend_rollup"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    vendor = db.Column(db.String(255), nullable=False, default="")
+    department = db.Column(db.String(200), nullable=False, default="")
+    currency = db.Column(db.String(3), nullable=False, default="")
+    license_count = db.Column(db.Integer, nullable=False, default=0)
+    total_cost = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    active_count = db.Column(db.Integer, nullable=False, default=0)
+    active_cost = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<LicenseSpendRollup {self.vendor}/{self.department}/{self.currency}>"
+
+
+class LicenseRenewalRollup(db.Model):
+    """Active licenses expiring per (year, month, currency)."""
+
+    __tablename__ = "license_renewal_rollups"
+    __table_args__ = (
+        db.UniqueConstraint("year", "month", "currency", name="uq_license_renewal_rollup"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    year = db.Column(db.Integer, nullable=False)
+    month = db.Column(db.Integer, nullable=False)
+    currency = db.Column(db.String(3), nullable=False, default="")
+    license_count = db.Column(db.Integer, nullable=False, default=0)
+    total_cost = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<LicenseRenewalRollup {self.year}-{self.month:02d} {self.currency}>"
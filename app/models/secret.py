@@ -1,4 +1,4 @@
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 from app import db
 
@@ -11,7 +11,7 @@ class Secret(db.Model):
     description = db.Column(db.Text, nullable=True)
     category = db.Column(db.String(50), nullable=False, default="credential")
 
-    # Encrypted fields (stored as Fernet-encrypted base64 strings)
+    # Encrypted fields (format v1: Fernet-encrypted base64 strings)
     encrypted_username = db.Column(db.Text, nullable=True)
     encrypted_password = db.Column(db.Text, nullable=True)
     encrypted_url = db.Column(db.Text, nullable=True)
@@ -19,6 +19,9 @@ class Secret(db.Model):
     encrypted_api_key = db.Column(db.Text, nullable=True)
     encrypted_extra_data = db.Column(db.Text, nullable=True)
 
+    # Encrypted record (format v2: all sensitive fields in one AES-GCM blob)
+    encrypted_blob = db.Column(db.LargeBinary, nullable=True)
+
     # Metadata (not encrypted - needed for search/filter)
     url_domain = db.Column(db.String(255), nullable=True, index=True)
 
@@ -32,6 +35,12 @@ class Secret(db.Model):
     password_last_changed = db.Column(db.DateTime, nullable=True)
     rotation_interval_days = db.Column(db.Integer, nullable=True)
 
+    # Password hygiene: keyed fingerprint and strength score of the current
+    # password, so reuse/weak/overdue reports never decrypt anything
+    password_fingerprint = db.Column(db.String(64), nullable=True, index=True)
+    password_score = db.Column(db.Integer, nullable=True, index=True)
+    password_rotate_at = db.Column(db.DateTime, nullable=True, index=True)
+
     # Encryption metadata
     encryption_version = db.Column(db.Integer, default=1)
 
@@ -48,51 +57,118 @@ class Secret(db.Model):
     )
     tags = db.relationship("Tag", secondary="secret_tags", back_populates="secrets")
 
-    # --- Encrypted property accessors ---
+    # --- Encrypted record helpers ---
+    #
+    # Version 1 rows keep one Fernet token per field in the encrypted_*
+    # columns. Version 2 rows keep every sensitive field in a single
+    # AES-GCM blob (encrypted_blob) that is decrypted once, on first access.
 
-    @property
-    def username(self):
-        if self.encrypted_username:
+    _RECORD_CONTEXT = b"secrets"
+
+    def _uses_record(self):
+        # A new row takes the configured format on its first field write; a
+        # stored row with no version predates the column and is v1.
+        if self.encryption_version is None and self.id is None:
             from app.services.encryption_service import EncryptionService
 
-            return EncryptionService.decrypt(self.encrypted_username)
-        return None
+            self.encryption_version = EncryptionService.record_version
+        return self.encryption_version == 2
+
+    def _record(self):
+        cached = self.__dict__.get("_record_cache")
+        if cached is not None and cached[0] is self.encrypted_blob:
+            return cached[1]
 
-    @username.setter
-    def username(self, value):
         from app.services.encryption_service import EncryptionService
 
-        self.encrypted_username = EncryptionService.encrypt(value) if value else None
+        record = EncryptionService.decrypt_record(
+            self.encrypted_blob, self._RECORD_CONTEXT
+        )
+        self.__dict__["_record_cache"] = (self.encrypted_blob, record)
+        return record
 
-    @property
-    def password(self):
-        if self.encrypted_password:
+    def _get_field(self, field):
+        if self._uses_record():
+            return self._record().get(field)
+
+        ciphertext = getattr(self, f"encrypted_{field}")
+        if ciphertext:
             from app.services.encryption_service import EncryptionService
 
-            return EncryptionService.decrypt(self.encrypted_password)
+            return EncryptionService.decrypt(ciphertext)
         return None
 
+    def _set_field(self, field, value):
+        from app.services.encryption_service import EncryptionService
+
+        if self._uses_record():
+            record = dict(self._record())
+            record[field] = value or None
+            self.encrypted_blob = EncryptionService.encrypt_record(
+                record, self._RECORD_CONTEXT
+            )
+            self.__dict__["_record_cache"] = (
+                self.encrypted_blob,
+                {k: v for k, v in record.items() if v},
+            )
+        else:
+            setattr(
+                self,
+                f"encrypted_{field}",
+                EncryptionService.encrypt(value) if value else None,
+            )
+
+    @property
+    def has_password(self):
+        if self._uses_record():
+            return "password" in self._record()
+        return self.encrypted_password is not None
+
+    # --- Encrypted property accessors ---
+
+    @property
+    def username(self):
+        return self._get_field("username")
+
+    @username.setter
+    def username(self, value):
+        self._set_field("username", value)
+
+    @property
+    def password(self):
+        return self._get_field("password")
+
     @password.setter
     def password(self, value):
-        from app.services.encryption_service import EncryptionService
+        from app.services.hygiene_service import HygieneService
 
-        self.encrypted_password = EncryptionService.encrypt(value) if value else None
+        self._set_field("password", value)
+        self.password_fingerprint, self.password_score = HygieneService.assess(value)
         if value:
             self.password_last_changed = datetime.now(timezone.utc)
 
+    @staticmethod
+    def rotation_due(last_changed, interval_days):
+        """When a password changed at ``last_changed`` is due for rotation."""
+        if last_changed is None or not interval_days:
+            return None
+        return last_changed + timedelta(days=interval_days)
+
+    @db.validates("password_last_changed", "rotation_interval_days")
+    def _track_rotation(self, key, value):
+        if key == "password_last_changed":
+            self.password_rotate_at = self.rotation_due(value, self.rotation_interval_days)
+        else:
+            self.password_rotate_at = self.rotation_due(self.password_last_changed, value)
+        return value
+
     @property
     def url(self):
-        if self.encrypted_url:
-            from app.services.encryption_service import EncryptionService
-
-            return EncryptionService.decrypt(self.encrypted_url)
-        return None
+        return self._get_field("url")
 
     @url.setter
     def url(self, value):
-        from app.services.encryption_service import EncryptionService
-
-        self.encrypted_url = EncryptionService.encrypt(value) if value else None
+        self._set_field("url", value)
         if value:
             from urllib.parse import urlparse
 
@@ -104,34 +180,25 @@ class Secret(db.Model):
 
     @property
     def notes(self):
-        if self.encrypted_notes:
-            from app.services.encryption_service import EncryptionService
-
-            return EncryptionService.decrypt(self.encrypted_notes)
-        return None
+        return self._get_field("notes")
 
     @notes.setter
     def notes(self, value):
-        from app.services.encryption_service import EncryptionService
-
-        self.encrypted_notes = EncryptionService.encrypt(value) if value else None
+        self._set_field("notes", value)
 
     @property
     def api_key(self):
-        if self.encrypted_api_key:
-            from app.services.encryption_service import EncryptionService
-
-            return EncryptionService.decrypt(self.encrypted_api_key)
-        return None
+        return self._get_field("api_key")
 
     @api_key.setter
     def api_key(self, value):
-        from app.services.encryption_service import EncryptionService
-
-        self.encrypted_api_key = EncryptionService.encrypt(value) if value else None
+        self._set_field("api_key", value)
 
     @property
     def extra_data(self):
+        if self._uses_record():
+            return self._record().get("extra_data")
+
         if self.encrypted_extra_data:
             from app.services.encryption_service import EncryptionService
             import json
@@ -141,6 +208,10 @@ class Secret(db.Model):
 
     @extra_data.setter
     def extra_data(self, value):
+        if self._uses_record():
+            self._set_field("extra_data", value)
+            return
+
         from app.services.encryption_service import EncryptionService
         import json
 
@@ -9,10 +9,11 @@ class SecretShare(db.Model):
         db.Integer,
         db.ForeignKey("secrets.id", ondelete="CASCADE"),
         nullable=False,
+        index=True,
     )
-    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True, index=True)
     group_id = db.Column(
-        db.Integer, db.ForeignKey("groups.id"), nullable=True
+        db.Integer, db.ForeignKey("groups.id"), nullable=True, index=True
     )
     permission = db.Column(db.String(20), default="read")
     shared_by_id = db.Column(
@@ -39,3 +40,46 @@ class SecretShare(db.Model):
     def __repr__(self):
         target = f"user={self.user_id}" if self.user_id else f"group={self.group_id}"
         return f"<SecretShare secret={self.secret_id} {target}>"
+
+
+class FolderShare(db.Model):
+    """Grants access to every secret in a folder and its subfolders."""
+
+    __tablename__ = "folder_shares"
+
+    id = db.Column(db.Integer, primary_key=True)
+    folder_id = db.Column(
+        db.Integer,
+        db.ForeignKey("folders.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True, index=True)
+    group_id = db.Column(
+        db.Integer, db.ForeignKey("groups.id"), nullable=True, index=True
+    )
+    permission = db.Column(db.String(20), default="read")
+    shared_by_id = db.Column(
+        db.Integer, db.ForeignKey("users.id"), nullable=False
+    )
+    expires_at = db.Column(db.DateTime, nullable=True)
+    created_at = db.Column(
+        db.DateTime, server_default=db.func.now(), nullable=False
+    )
+
+    # Relationships
+    folder = db.relationship("Folder", back_populates="shares")
+    user = db.relationship("User", foreign_keys=[user_id])
+    group = db.relationship("Group")
+    shared_by = db.relationship("User", foreign_keys=[shared_by_id])
+
+    __table_args__ = (
+        db.CheckConstraint(
+            "user_id IS NOT NULL OR group_id IS NOT NULL",
+            name="folder_share_target_check",
+        ),
+    )
+
+    def __repr__(self):
+        target = f"user={self.user_id}" if self.user_id else f"group={self.group_id}"
+        return f"<FolderShare folder={self.folder_id} {target}>"
@@ -0,0 +1,205 @@
+import threading
+import time
+from collections import defaultdict
+
+from flask import g, has_request_context
+from sqlalchemy import event, inspect, select
+
+from app import db
+from app.models.group import Group, user_groups
+from app.models.user import User
+
+OWNER = frozenset(("read", "write"))
+
+_NO_ACCESS = frozenset()
+
+# Ids per IN list when resolving many secrets at once
+_PREFETCH_CHUNK = 1000
+
+# Cross-request cache bound; it is cleared rather than evicted piecemeal
+_MAX_ENTRIES = 50000
+
+
+class AccessContext:
+    """One user's role and effective group ids, resolved once per request,
+    plus memoized permissions for every secret checked so far."""
+
+    def __init__(self, user_id, role, group_ids, version):
+        self.user_id = user_id
+        self.role = role
+        self.group_ids = group_ids
+        self.version = version
+        self._permissions = {}
+
+    def is_admin(self):
+        return self.role == "admin"
+
+    def permissions(self, secret):
+        """Permissions held on ``secret``: read and write for its owner,
+        otherwise those granted by shares (empty when there are none)."""
+        found = self._permissions.get(secret.id)
+        if found is None:
+            from app.services.share_service import ShareService
+
+            if secret.owner_id == self.user_id:
+                found = OWNER
+            else:
+                found = frozenset(ShareService.permissions(secret, self))
+            self._permissions[secret.id] = found
+        return found
+
+    def can_access(self, secret, require_write=False):
+        """Whether ``secret`` (a ``Secret`` or its id) may be opened, or
+        changed with ``require_write``."""
+        if self.is_admin():
+            return True
+        if isinstance(secret, int):
+            if secret not in self._permissions:
+                self.prefetch([secret])
+            permissions = self._permissions[secret]
+        else:
+            permissions = self.permissions(secret)
+        return bool(permissions) and (not require_write or "write" in permissions)
+
+    def prefetch(self, secret_ids):
+        """Resolve permissions for many secrets with three queries per chunk
+        (secrets, explicit shares, shared folder tree) instead of per id."""
+        if self.is_admin():
+            return
+        missing = list({i for i in secret_ids if i not in self._permissions})
+        for start in range(0, len(missing), _PREFETCH_CHUNK):
+            self._resolve(missing[start:start + _PREFETCH_CHUNK])
+
+    def _resolve(self, ids):
+        from app.models.secret import Secret
+        from app.models.share import SecretShare
+        from app.services.share_service import ShareService
+
+        rows = db.session.execute(
+            select(Secret.id, Secret.owner_id, Secret.folder_id).where(Secret.id.in_(ids))
+        ).all()
+        explicit = defaultdict(set)
+        for secret_id, permission in db.session.execute(
+            select(SecretShare.secret_id, SecretShare.permission).where(
+                SecretShare.secret_id.in_(ids),
+                ShareService.active_grant(SecretShare, self),
+            )
+        ):
+            explicit[secret_id].add(permission)
+
+        # Explicit shares override inherited ones, as in ShareService.permissions
+        folders = {
+            folder_id for secret_id, owner_id, folder_id in rows
+            if owner_id != self.user_id and secret_id not in explicit and folder_id is not None
+        }
+        inherited = defaultdict(set)
+        if folders:
+            tree = ShareService.shared_folder_permissions(self)
+            for folder_id, permission in db.session.execute(
+                select(tree.c.id, tree.c.permission).where(tree.c.id.in_(folders))
+            ):
+                inherited[folder_id].add(permission)
+
+        for secret_id in ids:
+            self._permissions[secret_id] = _NO_ACCESS
+        for secret_id, owner_id, folder_id in rows:
+            if owner_id == self.user_id:
+                self._permissions[secret_id] = OWNER
+            else:
+                self._permissions[secret_id] = frozenset(
+                    explicit.get(secret_id) or inherited.get(folder_id, ())
+                )
+
+
+class AccessService:
+    """Builds the :class:`AccessContext` of the current request.
+
+    Group memberships are kept in a process-local cache for
+    ACCESS_CACHE_SECONDS, stamped with a version counter. Any commit that
+    touches a group or a user's group list bumps the counter, so a
+    membership change applies to the next access check in this process;
+    other processes pick it up within the TTL.
+    """
+
+    _cache = {}
+    _cache_seconds = 30
+    _version = 0
+    _lock = threading.Lock()
+
+    @classmethod
+    def init_app(cls, app):
+        cls._cache_seconds = app.config["ACCESS_CACHE_SECONDS"]
+        cls._cache = {}
+        app.teardown_request(cls._forget)
+        if not event.contains(db.session, "after_flush", cls._collect):
+            event.listen(db.session, "after_flush", cls._collect)
+            event.listen(db.session, "after_commit", cls._apply)
+            event.listen(db.session, "after_rollback", cls._discard)
+
+    @classmethod
+    def context(cls, user):
+        """The access context of ``user`` (a ``User`` or an existing
+        context), shared by every check within the current request."""
+        if isinstance(user, AccessContext):
+            return user
+        if not has_request_context():
+            return cls._build(user)
+        contexts = g.setdefault("access_contexts", {})
+        context = contexts.get(user.id)
+        if context is None or context.version != cls._version or context.role != user.role:
+            context = contexts[user.id] = cls._build(user)
+        return context
+
+    @classmethod
+    def _build(cls, user):
+        version = cls._version
+        return AccessContext(user.id, user.role, cls.group_ids(user.id), version)
+
+    @classmethod
+    def group_ids(cls, user_id):
+        """Ids of the groups ``user_id`` belongs to (a frozenset)."""
+        now = time.monotonic()
+        with cls._lock:
+            hit = cls._cache.get(user_id)
+            version = cls._version
+        if hit and hit[0] == version and now - hit[1] < cls._cache_seconds:
+            return hit[2]
+        value = frozenset(db.session.scalars(
+            select(user_groups.c.group_id).where(user_groups.c.user_id == user_id)
+        ))
+        with cls._lock:
+            if cls._version == version:
+                if len(cls._cache) >= _MAX_ENTRIES:
+                    cls._cache = {}
+                cls._cache[user_id] = (version, now, value)
+        return value
+
+    @classmethod
+    def invalidate(cls):
+        with cls._lock:
+            cls._version += 1
+            cls._cache = {}
+
+    @staticmethod
+    def _forget(exc=None):
+        g.pop("access_contexts", None)
+
+    # -- Session hooks ------------------------------------------------------
+
+    @staticmethod
+    def _collect(session, flush_context):
+        for obj in session.new | session.dirty | session.deleted:
+            if isinstance(obj, Group) or (
+                isinstance(obj, User) and inspect(obj).attrs.groups.history.has_changes()
+            ):
+                session.info["access_changed"] = True
+                return
+
+    @classmethod
+    def _apply(cls, session):
+        if session.info.pop("access_changed", False):
+            cls.invalidate()
+
+    @staticmethod
+    def _discard(session):
+        session.info.pop("access_changed", None)
@@ -1,8 +1,13 @@
-from sqlalchemy import or_
+from datetime import date, datetime, timezone
+
+from sqlalchemy import func, insert, literal, or_, select, union_all, update
 
 from app import db
 from app.models.application import Application
 from app.services.audit_service import AuditService
+from app.services.fuzzy_search_service import FuzzySearchService
+from app.services.quick_search_service import QuickSearchService
+from app.services.search_service import INDEXED_FIELDS, SearchService
 
 PLATFORM_CHOICES = [
     ("java", "Java"),
@@ -40,13 +45,59 @@ STATUS_CHOICES = [
     ("inactive", "Inactive"),
 ]
 
+# Columns offered as list filters, each with per-value counts
+FACET_FIELDS = (
+    "status",
+    "platform",
+    "department",
+    "criticality",
+    "sla_level",
+    "deployment_type",
+    "database_type",
+    "operating_system",
+)
+
+# Columns read and written by bulk export/import; (name, server_name) is the key
+TRANSFER_FIELDS = (
+    "name",
+    "server_name",
+    "ip_address",
+    "port",
+    "url",
+    "status",
+    "description",
+    "operating_system",
+    "platform",
+    "database_type",
+    "app_version",
+    "deployment_type",
+    "responsible_person",
+    "department",
+    "maintenance_date",
+    "sla_level",
+    "criticality",
+    "notes",
+)
+_TRANSFER_COLUMNS = [getattr(Application, field) for field in TRANSFER_FIELDS]
+
+# Keeps the keyed IN list of one import chunk under SQL Server's 2100 parameters
+MAX_IMPORT_CHUNK = 2000
+
+
+def _transfer_key(name, server_name):
+    # Case-insensitive, as (name, server_name) compare under SQL Server's
+    # default collation
+    return name.casefold(), (server_name or "").casefold() or None
+_SEARCH_FIELDS = frozenset(INDEXED_FIELDS["applications"][1])
+
 
 class ApplicationService:
 
     @staticmethod
-    def get_applications(q=None, status=None, platform=None, page=1, per_page=25):
-        query = Application.query
-
+    def _search(query, q):
+        ranked = SearchService.apply(query, "applications", q) if q else None
+        if ranked is not None:
+            return ranked
         if q:
             search = f"%{q}%"
             query = query.filter(
@@ -59,17 +110,59 @@ class ApplicationService:
                     Application.department.ilike(search),
                 )
             )
+        return query
 
-        if status:
-            query = query.filter(Application.status == status)
-
-        if platform:
-            query = query.filter(Application.platform == platform)
+    @staticmethod
+    def get_applications(q=None, status=None, platform=None, page=1, per_page=25, filters=None):
+        """Page of applications matching ``q`` and ``filters`` ({facet: value})."""
+        filters = dict(filters or {})
+        if status is not None:
+            filters["status"] = status
+        if platform is not None:
+            filters["platform"] = platform
+        query = ApplicationService._search(Application.query, q)
+        for field, value in filters.items():
+            if value and field in FACET_FIELDS:
+                query = query.filter(getattr(Application, field) == value)
 
         return query.order_by(Application.name).paginate(
             page=page, per_page=per_page, error_out=False
         )
 
+    @staticmethod
+    def facet_counts(q=None, filters=None):
+        """Per-value counts for every facet, in a single UNION ALL query.
+
+        Each facet is counted under the search and every *other* active
+        filter, so a selected facet still lists its alternatives. Returns
+        ``{field: [(value, count), ...]}`` with the largest counts first.
+        """
+        filters = {f: v for f, v in (filters or {}).items() if v and f in FACET_FIELDS}
+        matching = None
+        if q:
+            searched = ApplicationService._search(Application.query, q)
+            matching = searched.with_entities(Application.id).order_by(None).subquery()
+
+        selects = []
+        for field in FACET_FIELDS:
+            column = getattr(Application, field)
+            stmt = select(
+                literal(field).label("facet"), column.label("value"), func.count().label("count")
+            ).where(column.isnot(None))
+            if matching is not None:
+                stmt = stmt.where(Application.id.in_(select(matching.c.id)))
+            for other, value in filters.items():
+                if other != field:
+                    stmt = stmt.where(getattr(Application, other) == value)
+            selects.append(stmt.group_by(column))
+
+        facets = {field: [] for field in FACET_FIELDS}
+        for facet, value, count in db.session.execute(union_all(*selects)):
+            facets[facet].append((value, count))
+        for values in facets.values():
+            values.sort(key=lambda item: (-item[1], item[0]))
+        return facets
+
     @staticmethod
     def create_application(user, **kwargs):
         app_record = Application(created_by_id=user.id)
@@ -77,6 +170,8 @@ class ApplicationService:
             if hasattr(app_record, key):
                 setattr(app_record, key, value)
         db.session.add(app_record)
+        db.session.flush()
+        SearchService.index(app_record)
         db.session.commit()
 
         AuditService.log(
@@ -94,6 +189,7 @@ class ApplicationService:
         for key, value in kwargs.items():
             if hasattr(app_record, key):
                 setattr(app_record, key, value)
+        SearchService.index(app_record)
         db.session.commit()
 
         AuditService.log(
@@ -116,9 +212,187 @@ class ApplicationService:
             resource_id=app_record.id,
             resource_name=app_record.name,
         )
+        SearchService.remove("applications", app_record.id)
         db.session.delete(app_record)
         db.session.commit()
 
+    @staticmethod
+    def export_rows(batch_size=2000):
+        """Yield every application as a dict of TRANSFER_FIELDS, in id order,
+        without loading the table into memory."""
+        rows = (
+            db.session.query(*_TRANSFER_COLUMNS)
+            .order_by(Application.id)
+            .execution_options(yield_per=batch_size)
+        )
+        for row in rows:
+            record = dict(zip(TRANSFER_FIELDS, row))
+            if record["maintenance_date"] is not None:
+                record["maintenance_date"] = record["maintenance_date"].isoformat()
+            yield record
+
+    @staticmethod
+    def _parse_import_row(row):
+        """Validate one CSV/NDJSON row; returns ``(values, error)``.
+
+        Only columns present in the row are returned, so a partial file
+        leaves the other columns untouched; an empty cell clears the value.
+        """
+        if not isinstance(row, dict):
+            return None, "Row must be an object."
+        values = {}
+        for field in TRANSFER_FIELDS:
+            if field not in row:
+                continue
+            value = row[field]
+            value = str(value).strip() if value is not None else ""
+            if not value:
+                values[field] = None
+                continue
+            if field == "port":
+                if not value.isdigit() or not 0 < int(value) < 65536:
+                    return None, "port must be a number between 1 and 65535."
+                value = int(value)
+            elif field == "maintenance_date":
+                try:
+                    value = date.fromisoformat(value)
+                except ValueError:
+                    return None, "maintenance_date must be YYYY-MM-DD."
+            elif field == "status" and value not in dict(STATUS_CHOICES):
+                return None, f"status must be one of: {', '.join(dict(STATUS_CHOICES))}."
+            else:
+                length = Application.__table__.c[field].type.length
+                if length and len(value) > length:
+                    return None, f"{field} is longer than {length} characters."
+            values[field] = value
+        if not values.get("name"):
+            return None, "name is required."
+        values.setdefault("server_name", None)
+        return values, None
+
+    @staticmethod
+    def import_applications(rows, user, dry_run=False, chunk_size=1000, progress=None,
+                            preview_limit=100):
+        """Upsert applications keyed on (name, server_name), ignoring case,
+        chunk by chunk (at most MAX_IMPORT_CHUNK rows each).
+
+        ``rows`` may be any iterable of dicts (it is consumed lazily, so a
+        streamed file is never held in memory). Each chunk is one
+        transaction: a keyed SELECT, one executemany UPDATE for changed rows
+        and one executemany INSERT for new ones, plus one audit entry. With
+        ``dry_run`` nothing is written and the first ``preview_limit``
+        changes are returned as a diff. ``progress(rows_done)`` is called
+        after every chunk. Within one import the first row for a key wins.
+        """
+        summary = {"rows": 0, "created": 0, "updated": 0, "unchanged": 0, "skipped": 0,
+                   "errors": [], "preview": [], "dry_run": dry_run}
+        chunk_size = max(1, min(chunk_size, MAX_IMPORT_CHUNK))
+        seen = set()
+        chunk = []
+        batch = 0
+
+        def flush():
+            nonlocal batch
+            batch += 1
+            ApplicationService._import_chunk(chunk, user, dry_run, summary, preview_limit, batch)
+            chunk.clear()
+            if progress:
+                progress(summary["rows"])
+
+        for number, row in enumerate(rows, start=1):
+            summary["rows"] = number
+            values, error = ApplicationService._parse_import_row(row)
+            if error:
+                summary["errors"].append({"row": number, "message": error})
+                continue
+            key = _transfer_key(values["name"], values["server_name"])
+            if key in seen:
+                summary["skipped"] += 1
+                continue
+            seen.add(key)
+            chunk.append(values)
+            if len(chunk) >= chunk_size:
+                flush()
+        if chunk:
+            flush()
+        elif progress:
+            progress(summary["rows"])
+
+        if not dry_run and (summary["created"] or summary["updated"]):
+            # Bulk statements bypass the session events that keep these
+            # in-process indexes current; rebuild them on next use.
+            QuickSearchService.reset()
+            FuzzySearchService.reset()
+        return summary
+
+    @staticmethod
+    def _import_chunk(chunk, user, dry_run, summary, preview_limit, batch):
+        if not chunk:
+            return
+        existing = {}
+        rows = (
+            db.session.query(Application.id, *_TRANSFER_COLUMNS)
+            .filter(func.lower(Application.name).in_(
+                {values["name"].casefold() for values in chunk}
+            ))
+            .order_by(Application.id)
+        )
+        for row in rows:
+            record = dict(zip(TRANSFER_FIELDS, row[1:]))
+            existing.setdefault(_transfer_key(record["name"], record["server_name"]),
+                                (row[0], record))
+
+        now = datetime.now(timezone.utc)
+        inserts, updates, documents = [], [], []
+        for values in chunk:
+            match = existing.get(_transfer_key(values["name"], values["server_name"]))
+            if match is None:
+                inserts.append({"status": "active", **values, "created_by_id": user.id})
+                change = {"action": "create", "name": values["name"],
+                          "server_name": values["server_name"],
+                          "changes": {f: [None, v] for f, v in values.items()
+                                      if v is not None and f not in ("name", "server_name")}}
+            else:
+                app_id, record = match
+                changed = {f: v for f, v in values.items()
+                           if record[f] != v and f not in ("name", "server_name")}
+                if not changed:
+                    summary["unchanged"] += 1
+                    continue
+                updates.append({"id": app_id, **changed, "updated_at": now})
+                if _SEARCH_FIELDS.intersection(changed):
+                    documents.append({**record, **changed, "id": app_id})
+                change = {"action": "update", "id": app_id, "name": values["name"],
+                          "server_name": values["server_name"],
+                          "changes": {f: [record[f], v] for f, v in changed.items()}}
+            if dry_run and len(summary["preview"]) < preview_limit:
+                summary["preview"].append(change)
+
+        summary["created"] += len(inserts)
+        summary["updated"] += len(updates)
+        if dry_run or not (inserts or updates):
+            return
+
+        if updates:
+            db.session.execute(update(Application), updates)
+        if inserts:
+            new_ids = db.session.scalars(
+                insert(Application).returning(Application.id, sort_by_parameter_order=True),
+                inserts,
+            ).all()
+            documents += [{**values, "id": new_id} for new_id, values in zip(new_ids, inserts)]
+        if documents:
+            SearchService.index_records("applications", documents)
+        db.session.commit()
+
+        AuditService.log(
+            action="applications_imported",
+            user_id=user.id,
+            username=user.username,
+            resource_type="application",
+            details=f"Import batch {batch}: {len(inserts)} created, {len(updates)} updated",
+        )
+
     @staticmethod
     def get_dashboard_stats():
         total = Application.query.count()
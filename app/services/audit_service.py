@@ -1,7 +1,10 @@
+import time
+
 from flask import request
 
 from app import db
 from app.models.audit_log import AuditLog
+from app.services.metrics_service import MetricsService
 
 
 class AuditService:
@@ -18,6 +21,7 @@ class AuditService:
         success: bool = True,
     ):
         """Create an audit log entry. Designed to never throw."""
+        started = time.perf_counter()
         try:
             log_entry = AuditLog(
                 user_id=user_id,
@@ -35,6 +39,8 @@ class AuditService:
             db.session.commit()
         except Exception:
             db.session.rollback()
+        finally:
+            MetricsService.add_time("audit", time.perf_counter() - started)
 
 
 def _get_remote_addr():
@@ -0,0 +1,224 @@
+import hashlib
+import heapq
+import math
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+DIGEST_SIZE = 20
+
+_RECHECK_SECONDS = 5
+
+# Bloom filter file: magic, bit count, hash count, then the bit array.
+_BLOOM_HEADER = struct.Struct(">8sQI")
+_BLOOM_MAGIC = b"KVBLOOM1"
+
+
+def _bloom_positions(digest, bits, hashes):
+    # SHA-1 output is already uniform, so two 64-bit slices of it drive
+    # Kirsch-Mitzenmacher double hashing instead of k separate hashes.
+    h1, h2 = struct.unpack_from(">QQ", digest)
+    h2 |= 1
+    return [(h1 + i * h2) % bits for i in range(hashes)]
+
+
+def _read_digests(handle, block=DIGEST_SIZE * 65536):
+    for data in iter(lambda: handle.read(block), b""):
+        for start in range(0, len(data), DIGEST_SIZE):
+            yield data[start:start + DIGEST_SIZE]
+
+
+class _Index:
+    """A memory-mapped sorted digest file plus optional Bloom filter."""
+
+    def __init__(self, path):
+        self.path = path
+        self.stamp = path.stat().st_mtime_ns
+        self.size = path.stat().st_size // DIGEST_SIZE
+        self.map = self._map(path) if self.size else None
+        self.bloom = None
+        bloom_path = path.with_suffix(".bloom")
+        if bloom_path.exists():
+            bloom = self._map(bloom_path)
+            magic, bits, hashes = _BLOOM_HEADER.unpack_from(bloom)
+            if magic == _BLOOM_MAGIC:
+                self.bloom, self.bits, self.hashes = bloom, bits, hashes
+
+    @staticmethod
+    def _map(path):
+        with open(path, "rb") as handle:
+            return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def contains(self, digest):
+        if self.bloom is not None:
+            offset = _BLOOM_HEADER.size
+            for position in _bloom_positions(digest, self.bits, self.hashes):
+                if not self.bloom[offset + (position >> 3)] & (1 << (position & 7)):
+                    return False
+        lo, hi = 0, self.size
+        data = self.map
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = mid * DIGEST_SIZE
+            probe = data[start:start + DIGEST_SIZE]
+            if probe < digest:
+                lo = mid + 1
+            elif probe > digest:
+                hi = mid
+            else:
+                return True
+        return False
+
+
+class BreachService:
+    """Offline check of passwords against a breach corpus (HIBP-style SHA-1).
+
+    ``flask breach-build`` turns a ``HASH[:COUNT]`` text file into a sorted
+    file of raw 20-byte digests (and optionally a Bloom filter beside it).
+    Lookups memory-map that file and binary-search it, so only the few
+    pages touched stay resident and nothing leaves the host. Without an
+    index every check answers ``None`` (unknown).
+    """
+
+    _path = None
+    _index = None
+    _checked_at = float("-inf")
+    _lock = threading.Lock()
+
+    @classmethod
+    def init_app(cls, app):
+        configured = app.config["BREACH_INDEX_PATH"]
+        cls._path = Path(configured or Path(app.instance_path) / "breach" / "pwned-sha1.bin")
+        cls._index = None
+        cls._checked_at = float("-inf")
+
+    @classmethod
+    def _current(cls):
+        # Re-stat the file at most every few seconds so a rebuilt index is
+        # picked up without a syscall on every lookup.
+        now = time.monotonic()
+        if now - cls._checked_at < _RECHECK_SECONDS:
+            return cls._index
+        cls._checked_at = now
+        try:
+            stamp = cls._path.stat().st_mtime_ns
+        except (AttributeError, OSError):
+            cls._index = None
+            return None
+        if cls._index is None or cls._index.stamp != stamp:
+            with cls._lock:
+                if cls._index is None or cls._index.stamp != stamp:
+                    cls._index = _Index(cls._path)
+        return cls._index
+
+    @classmethod
+    def available(cls):
+        return cls._current() is not None
+
+    @classmethod
+    def is_breached(cls, password):
+        """True/False when an index is installed, otherwise None."""
+        if not password:
+            return None
+        index = cls._current()
+        if index is None:
+            return None
+        return index.contains(hashlib.sha1(password.encode("utf-8")).digest())
+
+    @classmethod
+    def stats(cls):
+        index = cls._current()
+        return {
+            "path": str(cls._path) if cls._path else None,
+            "available": index is not None,
+            "hashes": index.size if index else 0,
+            "bloom": bool(index and index.bloom is not None),
+        }
+
+    # -- Building ---------------------------------------------------------
+
+    @staticmethod
+    def _digests(lines):
+        for line in lines:
+            value = line.split(":", 1)[0].strip()
+            if len(value) == 2 * DIGEST_SIZE:
+                try:
+                    yield bytes.fromhex(value)
+                except ValueError:
+                    continue
+
+    @classmethod
+    def build(cls, source_lines, output, chunk_size=2_000_000, bloom_error_rate=None,
+              progress=None):
+        """Write a sorted, de-duplicated digest file from ``HASH[:COUNT]`` lines.
+
+        Digests are sorted in runs of ``chunk_size`` and merged from
+        temporary files, so memory stays bounded by one run whatever the
+        input order. With ``bloom_error_rate`` a Bloom filter is written
+        next to the output. Returns the digest count.
+        """
+        output = Path(output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        partial = output.with_suffix(".tmp")
+        runs = []
+        count = 0
+        with tempfile.TemporaryDirectory(dir=output.parent) as scratch:
+            chunk = []
+            for digest in cls._digests(source_lines):
+                chunk.append(digest)
+                if len(chunk) >= chunk_size:
+                    runs.append(cls._write_run(chunk, scratch, len(runs)))
+                    chunk = []
+                    if progress:
+                        progress(len(runs) * chunk_size)
+            if chunk or not runs:
+                runs.append(cls._write_run(chunk, scratch, len(runs)))
+
+            handles = [open(run, "rb") for run in runs]
+            try:
+                previous = None
+                with open(partial, "wb") as out:
+                    merged = heapq.merge(*(_read_digests(handle) for handle in handles))
+                    for digest in merged:
+                        if digest != previous:
+                            out.write(digest)
+                            previous = digest
+                            count += 1
+            finally:
+                for handle in handles:
+                    handle.close()
+
+        if bloom_error_rate:
+            cls._write_bloom(partial, output.with_suffix(".bloom"), count, bloom_error_rate)
+        else:
+            output.with_suffix(".bloom").unlink(missing_ok=True)
+        os.replace(partial, output)
+        cls._checked_at = float("-inf")
+        return count
+
+    @staticmethod
+    def _write_run(chunk, scratch, number):
+        chunk.sort()
+        path = os.path.join(scratch, f"run-{number}.bin")
+        with open(path, "wb") as run:
+            run.write(b"".join(chunk))
+        return path
+
+    @staticmethod
+    def _write_bloom(digests_path, bloom_path, count, error_rate):
+        bits = max(64, math.ceil(-count * math.log(error_rate) / math.log(2) ** 2))
+        hashes = max(1, round(bits / max(count, 1) * math.log(2)))
+        array = bytearray((bits + 7) // 8)
+        with open(digests_path, "rb") as digests:
+            for digest in _read_digests(digests):
+                for position in _bloom_positions(digest, bits, hashes):
+                    array[position >> 3] |= 1 << (position & 7)
+        partial = bloom_path.with_suffix(".bloom-tmp")
+        with open(partial, "wb") as out:
+            out.write(_BLOOM_HEADER.pack(_BLOOM_MAGIC, bits, hashes))
+            out.write(array)
+        os.replace(partial, bloom_path)
@@ -1,14 +1,40 @@
+import base64
+import hashlib
+import hmac
+import json
 import os
+import struct
+import zlib
 from pathlib import Path
 
+from cryptography.exceptions import InvalidTag
 from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+from app.services.metrics_service import MetricsService
+
+# Record format v2: one AES-GCM blob holding all sensitive fields of a row.
+#   byte 0     format version (2)
+#   byte 1     flags (bit 0: payload is zlib-compressed)
+#   bytes 2-13 GCM nonce
+#   rest       ciphertext + 16-byte tag
+RECORD_VERSION = 2
+_FLAG_COMPRESSED = 0x01
+_NONCE_SIZE = 12
+_HEADER = struct.Struct(">BB")
+_COMPRESS_THRESHOLD = 512
 
 
 class EncryptionService:
     _fernet = None
+    _aesgcm = None
+    _fingerprint_key = None
+    record_version = 1
 
     @classmethod
-    def initialize(cls, instance_path: str):
+    def initialize(cls, instance_path: str, record_version: int = 1):
         """Load or generate the master encryption key."""
         key_path = Path(instance_path) / "encryption.key"
 
@@ -23,12 +49,16 @@ class EncryptionService:
             cls._restrict_file_permissions(key_path)
 
         cls._fernet = Fernet(key)
+        cls._aesgcm = AESGCM(cls._derive_key(key, b"keyvault-record-v2"))
+        cls._fingerprint_key = cls._derive_key(key, b"keyvault-password-fingerprint")
+        cls.record_version = record_version
 
     @classmethod
     def encrypt(cls, plaintext: str) -> str:
         """Encrypt a string and return base64-encoded ciphertext."""
         if not plaintext:
             return ""
+        MetricsService.incr("crypto_encrypt")
         token = cls._fernet.encrypt(plaintext.encode("utf-8"))
         return token.decode("utf-8")
 
@@ -37,12 +67,85 @@ class EncryptionService:
         """Decrypt a Fernet token back to plaintext."""
         if not ciphertext:
             return ""
+        MetricsService.incr("crypto_decrypt")
         try:
             plaintext = cls._fernet.decrypt(ciphertext.encode("utf-8"))
             return plaintext.decode("utf-8")
         except InvalidToken:
             raise ValueError("Decryption failed: invalid token or wrong key")
 
+    @classmethod
+    def encrypt_record(cls, record: dict, context: bytes) -> bytes | None:
+        """Encrypt a dict of fields into a single v2 binary blob.
+
+        ``context`` is bound as associated data so a blob cannot be moved
+        between record types (e.g. from a license into a secret).
+        Empty values are dropped; an empty record encrypts to None.
+        """
+        record = {k: v for k, v in record.items() if v}
+        if not record:
+            return None
+
+        payload = json.dumps(
+            record, ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+        flags = 0
+        if len(payload) >= _COMPRESS_THRESHOLD:
+            compressed = zlib.compress(payload, 6)
+            if len(compressed) < len(payload):
+                payload = compressed
+                flags |= _FLAG_COMPRESSED
+
+        MetricsService.incr("crypto_encrypt")
+        header = _HEADER.pack(RECORD_VERSION, flags)
+        nonce = os.urandom(_NONCE_SIZE)
+        ciphertext = cls._aesgcm.encrypt(nonce, payload, header + context)
+        return header + nonce + ciphertext
+
+    @classmethod
+    def decrypt_record(cls, blob: bytes, context: bytes) -> dict:
+        """Decrypt a v2 blob produced by ``encrypt_record``."""
+        if not blob:
+            return {}
+        MetricsService.incr("crypto_decrypt")
+        blob = bytes(blob)
+        header = blob[: _HEADER.size]
+        try:
+            version, flags = _HEADER.unpack(header)
+        except struct.error:
+            raise ValueError("Decryption failed: truncated record")
+        if version != RECORD_VERSION:
+            raise ValueError(f"Unsupported record format version {version}")
+
+        nonce = blob[_HEADER.size : _HEADER.size + _NONCE_SIZE]
+        ciphertext = blob[_HEADER.size + _NONCE_SIZE :]
+        try:
+            payload = cls._aesgcm.decrypt(nonce, ciphertext, header + context)
+        except InvalidTag:
+            raise ValueError("Decryption failed: invalid record or wrong key")
+
+        if flags & _FLAG_COMPRESSED:
+            payload = zlib.decompress(payload)
+        return json.loads(payload.decode("utf-8"))
+
+    @classmethod
+    def fingerprint(cls, value: str) -> str:
+        """Keyed HMAC-SHA256 of ``value`` (hex); equal inputs give equal output.
+
+        Without the master key the digest cannot be brute-forced offline.
+        """
+        return hmac.new(cls._fingerprint_key, value.encode("utf-8"), hashlib.sha256).hexdigest()
+
+    @staticmethod
+    def _derive_key(fernet_key: bytes, info: bytes) -> bytes:
+        """Derive a 256-bit subkey from the Fernet master key."""
+        return HKDF(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=None,
+            info=info,
+        ).derive(base64.urlsafe_b64decode(fernet_key))
+
     @staticmethod
     def _restrict_file_permissions(path: Path):
         """On Windows, restrict key file access using icacls."""
@@ -0,0 +1,205 @@
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+
+from sqlalchemy import event, func, literal, or_, text
+
+from app import db
+from app.models.application import Application
+from app.models.license import License
+from app.models.secret import Secret
+
+# kind -> (model, fields compared against the query)
+FUZZY_FIELDS = {
+    "secrets": (Secret, ("name", "url_domain")),
+    "applications": (Application, ("name", "server_name")),
+    "licenses": (License, ("name", "vendor")),
+}
+_KIND_BY_MODEL = {model: kind for kind, (model, _) in FUZZY_FIELDS.items()}
+
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+def trigrams(value):
+    """pg_trgm-style trigrams: each word padded with two leading and one
+    trailing space, so "jenkins-prod" and "jenkins_prod" are identical."""
+    grams = set()
+    for word in _WORD_RE.findall((value or "").casefold()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class _TrigramIndex:
+    def __init__(self):
+        self.postings = defaultdict(set)
+        self.documents = {}
+        self.loaded_at = time.monotonic()
+
+    def put(self, ref_id, grams):
+        self.remove(ref_id)
+        self.documents[ref_id] = grams
+        for gram in grams:
+            self.postings[gram].add(ref_id)
+
+    def remove(self, ref_id):
+        for gram in self.documents.pop(ref_id, ()):
+            posting = self.postings.get(gram)
+            if posting is not None:
+                posting.discard(ref_id)
+                if not posting:
+                    del self.postings[gram]
+
+    def match(self, grams, threshold, limit):
+        shared = Counter()
+        for gram in grams:
+            posting = self.postings.get(gram)
+            if posting:
+                shared.update(posting)
+        needed = threshold * len(grams)
+        scored = [(count / len(grams), ref_id) for ref_id, count in shared.items()
+                  if count >= needed]
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [(ref_id, score) for score, ref_id in scored[:limit]]
+
+
+class FuzzySearchService:
+    """Typo-tolerant lookup by trigram word similarity.
+
+    Similarity is the share of the query's trigrams found in the record
+    (pg_trgm's ``word_similarity``), so "orcale" still reaches "Oracle PROD".
+    PostgreSQL with the pg_trgm extension answers from GIN trigram indexes;
+    every other database uses per-process posting lists maintained from
+    session commits like the quick-search index.
+    """
+
+    _enabled = True
+    _threshold = 0.4
+    _max_results = 200
+    _refresh = 300
+    _pg_trgm = None
+    _indexes = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def init_app(cls, app):
+        cls._enabled = app.config["FUZZY_SEARCH_ENABLED"]
+        cls._threshold = app.config["FUZZY_SIMILARITY_THRESHOLD"]
+        cls._max_results = app.config["FUZZY_MAX_RESULTS"]
+        cls._refresh = app.config["QUICK_SEARCH_REFRESH_SECONDS"]
+        cls.reset()
+        if not event.contains(db.session, "after_flush", cls._collect):
+            event.listen(db.session, "after_flush", cls._collect)
+            event.listen(db.session, "after_commit", cls._apply)
+            event.listen(db.session, "after_rollback", cls._discard)
+
+    @classmethod
+    def reset(cls):
+        cls._pg_trgm = None
+        cls._indexes = {}
+
+    @classmethod
+    def _uses_pg_trgm(cls):
+        if cls._pg_trgm is None:
+            cls._pg_trgm = db.engine.dialect.name == "postgresql" and bool(
+                db.session.execute(
+                    text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+                ).scalar()
+            )
+        return cls._pg_trgm
+
+    # -- In-memory maintenance ----------------------------------------------
+
+    @staticmethod
+    def _grams(obj, fields):
+        grams = set()
+        for field in fields:
+            grams |= trigrams(getattr(obj, field, None))
+        return grams
+
+    @classmethod
+    def _collect(cls, session, flush_context):
+        if not cls._indexes:
+            return
+        pending = session.info.setdefault("fuzzy_search", {})
+        for obj in session.new | session.dirty:
+            kind = _KIND_BY_MODEL.get(type(obj))
+            if kind:
+                pending[(kind, obj.id)] = cls._grams(obj, FUZZY_FIELDS[kind][1])
+        for obj in session.deleted:
+            kind = _KIND_BY_MODEL.get(type(obj))
+            if kind:
+                pending[(kind, obj.id)] = None
+
+    @classmethod
+    def _apply(cls, session):
+        pending = session.info.pop("fuzzy_search", None)
+        if not pending:
+            return
+        with cls._lock:
+            for (kind, ref_id), grams in pending.items():
+                index = cls._indexes.get(kind)
+                if index is None:
+                    continue
+                if grams:
+                    index.put(ref_id, grams)
+                else:
+                    index.remove(ref_id)
+
+    @classmethod
+    def _discard(cls, session):
+        session.info.pop("fuzzy_search", None)
+
+    @classmethod
+    def _index(cls, kind):
+        index = cls._indexes.get(kind)
+        if index is None or time.monotonic() - index.loaded_at > cls._refresh:
+            model, fields = FUZZY_FIELDS[kind]
+            index = _TrigramIndex()
+            columns = [getattr(model, field) for field in fields]
+            for row in db.session.query(model.id, *columns).yield_per(5000):
+                grams = set()
+                for value in row[1:]:
+                    grams |= trigrams(value)
+                if grams:
+                    index.put(row[0], grams)
+            with cls._lock:
+                cls._indexes[kind] = index
+        return index
+
+    # -- Queries ------------------------------------------------------------
+
+    @classmethod
+    def matches(cls, kind, q, limit=None):
+        """Return ``[(id, similarity)]`` above the threshold, best first."""
+        if not cls._enabled or kind not in FUZZY_FIELDS:
+            return []
+        limit = limit or cls._max_results
+        if cls._uses_pg_trgm():
+            return cls._pg_matches(kind, q, limit)
+        grams = trigrams(q)
+        if not grams:
+            return []
+        index = cls._index(kind)
+        with cls._lock:
+            return index.match(grams, cls._threshold, limit)
+
+    @classmethod
+    def _pg_matches(cls, kind, q, limit):
+        model, fields = FUZZY_FIELDS[kind]
+        columns = [getattr(model, field) for field in fields]
+        db.session.execute(
+            text("SELECT set_config('pg_trgm.word_similarity_threshold', :t, true)"),
+            {"t": str(cls._threshold)},
+        )
+        score = func.greatest(*[
+            func.word_similarity(q, func.coalesce(column, "")) for column in columns
+        ])
+        rows = (
+            db.session.query(model.id, score)
+            .filter(or_(*[literal(q).op("<%")(column) for column in columns]))
+            .order_by(score.desc(), model.id)
+            .limit(limit)
+        )
+        return [(ref_id, float(similarity)) for ref_id, similarity in rows]
@@ -0,0 +1,261 @@
+import asyncio
+import json
+import ssl
+import threading
+import time
+from collections import Counter, namedtuple
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlsplit
+
+from cryptography import x509
+
+from app import db
+from app.models.application import Application
+from app.models.application_health import ApplicationHealth
+
+# host/port are probed with a TCP connect; url (http/https) additionally gets
+# a GET whose status line, latency and certificate expiry are recorded.
+_Target = namedtuple("_Target", "app_id host port url")
+
+USER_AGENT = "KeyVault-HealthCheck/1.0"
+
+
+def probe_target(app_record):
+    """Derive what to probe for an application, or None if nothing is set."""
+    host, port = app_record.ip_address or app_record.server_name, app_record.port
+    url = None
+    if app_record.url:
+        parts = urlsplit(app_record.url if "://" in app_record.url else f"http://{app_record.url}")
+        if parts.scheme in ("http", "https") and parts.hostname:
+            url = parts.geturl()
+            if not host or not port:
+                host = parts.hostname
+                port = parts.port or (443 if parts.scheme == "https" else 80)
+    if not host or not port:
+        return None
+    return _Target(app_record.id, host, port, url)
+
+
+class _HostLimiter:
+    """Spaces consecutive probes of one host at least ``interval`` apart."""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.locks = {}
+        self.next_at = {}
+
+    async def wait(self, host):
+        lock = self.locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            delay = self.next_at.get(host, 0) - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.next_at[host] = time.monotonic() + self.interval
+
+
+class _Prober:
+    def __init__(self, concurrency, timeout, host_interval, slow_ms, tls_warn_days):
+        self.timeout = timeout
+        self.slow_ms = slow_ms
+        self.tls_warn = timedelta(days=tls_warn_days)
+        self.host_interval = host_interval
+        self.concurrency = concurrency
+        self.semaphore = self.limiter = None
+
+    async def run(self, targets):
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        self.limiter = _HostLimiter(self.host_interval)
+        return await asyncio.gather(*(self.probe(target) for target in targets))
+
+    async def probe(self, target):
+        result = {"app_id": target.app_id, "status": "down", "tcp_ms": None,
+                  "http_status": None, "http_ms": None, "tls_expires_at": None, "error": None}
+        await self.limiter.wait(target.host)
+        async with self.semaphore:
+            try:
+                result["tcp_ms"] = await self._connect(target.host, target.port)
+                if target.url:
+                    result.update(await self._http(target.url))
+            except (OSError, asyncio.TimeoutError, ssl.SSLError, ValueError) as exc:
+                result["error"] = (str(exc) or type(exc).__name__)[:255]
+                return result
+        result["status"] = self._classify(result)
+        return result
+
+    async def _connect(self, host, port):
+        started = time.perf_counter()
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), self.timeout)
+        elapsed = (time.perf_counter() - started) * 1000
+        writer.close()
+        await self._closed(writer)
+        return round(elapsed, 1)
+
+    async def _http(self, url):
+        parts = urlsplit(url)
+        https = parts.scheme == "https"
+        context = None
+        if https:
+            # Inventory endpoints often use internal CAs; the probe reports
+            # certificate expiry, not trust.
+            context = ssl.create_default_context()
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+        port = parts.port or (443 if https else 80)
+        path = parts.path or "/"
+        if parts.query:
+            path += f"?{parts.query}"
+
+        started = time.perf_counter()
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(parts.hostname, port, ssl=context,
+                                    server_hostname=parts.hostname if https else None),
+            self.timeout,
+        )
+        try:
+            writer.write(
+                f"GET {path} HTTP/1.1\r\nHost: {parts.netloc}\r\n"
+                f"User-Agent: {USER_AGENT}\r\nConnection: close\r\n\r\n".encode("latin-1")
+            )
+            await writer.drain()
+            status_line = await asyncio.wait_for(reader.readline(), self.timeout)
+            elapsed = (time.perf_counter() - started) * 1000
+            fields = status_line.split(None, 2)
+            if len(fields) < 2 or not fields[0].startswith(b"HTTP/"):
+                raise ValueError("Invalid HTTP response")
+            result = {"http_status": int(fields[1]), "http_ms": round(elapsed, 1)}
+            if https:
+                der = writer.get_extra_info("ssl_object").getpeercert(binary_form=True)
+                if der:
+                    expires = x509.load_der_x509_certificate(der).not_valid_after_utc
+                    result["tls_expires_at"] = expires.replace(tzinfo=None)
+            return result
+        finally:
+            writer.close()
+            await self._closed(writer)
+
+    @staticmethod
+    async def _closed(writer):
+        try:
+            await writer.wait_closed()
+        except (OSError, ssl.SSLError):
+            pass
+
+    def _classify(self, result):
+        status = result["http_status"]
+        if status is not None and status >= 500:
+            return "down"
+        if status is not None and status >= 400:
+            return "degraded"
+        latency = result["http_ms"] if result["http_ms"] is not None else result["tcp_ms"]
+        if latency > self.slow_ms:
+            return "degraded"
+        expires = result["tls_expires_at"]
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        if expires is not None and expires - now < self.tls_warn:
+            return "degraded"
+        return "up"
+
+
+class HealthCheckService:
+    """Concurrent TCP/HTTP probing of application endpoints.
+
+    One run probes every active application with a target under asyncio,
+    bounded by HEALTH_CHECK_CONCURRENCY open probes and at most one probe per
+    host every HEALTH_CHECK_HOST_INTERVAL seconds, and stores the latest
+    result plus a short history in ``application_health``. Pages only read
+    those rows. Runs come from ``flask health-check`` (cron) or, when
+    HEALTH_CHECK_INTERVAL is set, a background thread started with the first
+    request.
+    """
+
+    _config = {}
+    _history = 48
+    _scheduler = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def init_app(cls, app):
+        cls._config = {
+            "concurrency": app.config["HEALTH_CHECK_CONCURRENCY"],
+            "timeout": app.config["HEALTH_CHECK_TIMEOUT"],
+            "host_interval": app.config["HEALTH_CHECK_HOST_INTERVAL"],
+            "slow_ms": app.config["HEALTH_CHECK_SLOW_MS"],
+            "tls_warn_days": app.config["HEALTH_CHECK_TLS_WARN_DAYS"],
+        }
+        cls._history = app.config["HEALTH_CHECK_HISTORY"]
+        interval = app.config["HEALTH_CHECK_INTERVAL"]
+        if interval > 0 and not app.testing:
+
+            @app.before_request
+            def _start_health_checks():
+                cls._start_scheduler(app, interval)
+
+    @classmethod
+    def _start_scheduler(cls, app, interval):
+        if cls._scheduler is not None:
+            return
+        with cls._lock:
+            if cls._scheduler is None:
+                cls._scheduler = threading.Thread(
+                    target=cls._schedule, args=(app, interval),
+                    name="health-check", daemon=True,
+                )
+                cls._scheduler.start()
+
+    @classmethod
+    def _schedule(cls, app, interval):
+        while True:
+            started = time.monotonic()
+            with app.app_context():
+                try:
+                    cls.run()
+                except Exception:
+                    db.session.rollback()
+                    app.logger.exception("Application health check run failed")
+                finally:
+                    db.session.remove()
+            time.sleep(max(interval - (time.monotonic() - started), 1))
+
+    @classmethod
+    def run(cls, app_ids=None):
+        """Probe active applications (or just ``app_ids``); returns status counts."""
+        query = Application.query.filter(Application.status == "active")
+        if app_ids is not None:
+            query = query.filter(Application.id.in_(app_ids))
+        targets = [t for t in map(probe_target, query) if t is not None]
+        if not targets:
+            return Counter()
+
+        results = asyncio.run(_Prober(**cls._config).run(targets))
+        cls._store(results)
+        return Counter(result["status"] for result in results)
+
+    @classmethod
+    def _store(cls, results):
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        existing = {
+            row.application_id: row
+            for row in ApplicationHealth.query.filter(
+                ApplicationHealth.application_id.in_([r["app_id"] for r in results])
+            )
+        }
+        for result in results:
+            row = existing.get(result["app_id"])
+            if row is None:
+                row = ApplicationHealth(application_id=result["app_id"])
+                db.session.add(row)
+            for field in ("status", "tcp_ms", "http_status", "http_ms", "tls_expires_at", "error"):
+                setattr(row, field, result[field])
+            row.checked_at = now
+            latency = result["http_ms"] if result["http_ms"] is not None else result["tcp_ms"]
+            history = row.history_entries + [[int(time.time()), result["status"], latency]]
+            row.history = json.dumps(history[-cls._history:], separators=(",", ":"))
+        db.session.commit()
+
+    @staticmethod
+    def latest(app_ids):
+        """Stored results for ``app_ids`` as ``{application_id: ApplicationHealth}``."""
+        if not app_ids:
+            return {}
+        rows = ApplicationHealth.query.filter(ApplicationHealth.application_id.in_(app_ids))
+        return {row.application_id: row for row in rows}
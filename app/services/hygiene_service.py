@@ -0,0 +1,251 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sqlalchemy import func, select, update
+
+from app import db
+from app.models.secret import Secret
+from app.models.user import User
+from app.services.encryption_service import EncryptionService
+
+# Same boundary as the "weak" label of PasswordGenerator.calculate_strength
+WEAK_SCORE = 40
+
+
+def _init_worker(instance_path, breach_path):
+    from app.services.breach_service import BreachService
+
+    EncryptionService.initialize(instance_path)
+    BreachService._path = Path(breach_path) if breach_path else None
+
+
+def _assess_chunk(rows):
+    """Decrypt and assess ``(id, version, encrypted_password, blob)`` rows
+    (runs in workers). Returns ``(id, fingerprint, score)`` tuples."""
+    results = []
+    for secret_id, version, token, blob in rows:
+        password = None
+        if version == 2 and blob is not None:
+            password = EncryptionService.decrypt_record(blob, Secret._RECORD_CONTEXT).get("password")
+        elif token:
+            password = EncryptionService.decrypt(token)
+        results.append((secret_id, *HygieneService.assess(password)))
+    return results
+
+
+class HygieneService:
+    """Vault-wide password reuse, weakness and rotation report.
+
+    Every secret carries a keyed HMAC fingerprint and a strength score of its
+    password, set by the ``Secret.password`` setter, plus the date its
+    rotation falls due. Reuse groups, weak and overdue lists are indexed
+    aggregates over those columns, so the report stays current as secrets
+    change without decrypting anything. Rows written before the columns
+    existed (or after a master key change) are filled in by
+    :meth:`backfill` (``flask hygiene-backfill``). Reports are cached per
+    process for HYGIENE_CACHE_SECONDS and dropped on every secret write.
+    """
+
+    _cache = {}
+    _cache_seconds = 60
+    _version = 0
+    _lock = threading.Lock()
+
+    @classmethod
+    def init_app(cls, app):
+        cls._cache_seconds = app.config["HYGIENE_CACHE_SECONDS"]
+        cls._cache = {}
+
+    @staticmethod
+    def assess(password):
+        """``(fingerprint, score)`` for ``password``, or ``(None, None)``."""
+        if not password:
+            return None, None
+        from app.services.password_generator import PasswordGenerator
+
+        score = PasswordGenerator.calculate_strength(password)["score"]
+        return EncryptionService.fingerprint(password), score
+
+    # -- Maintenance --------------------------------------------------------
+
+    @classmethod
+    def invalidate(cls):
+        with cls._lock:
+            cls._version += 1
+            cls._cache = {}
+
+    @classmethod
+    def backfill(cls, instance_path, batch_size=1000, workers=None, recompute=False,
+                 progress=None):
+        """Fingerprint and score secrets that have no fingerprint yet (or all
+        of them with ``recompute``). Returns the number of rows assessed.
+
+        Rows are read in keyset-paginated batches and decrypted in a process
+        pool with a bounded number of batches in flight; each batch is
+        written with one executemany UPDATE and committed, so the job can be
+        interrupted and resumed. ``workers=1`` assesses in-process.
+        """
+        from app.services.breach_service import BreachService
+
+        def batches():
+            last_id = 0
+            while True:
+                query = select(
+                    Secret.id, Secret.encryption_version, Secret.encrypted_password,
+                    Secret.encrypted_blob, Secret.password_last_changed,
+                    Secret.rotation_interval_days,
+                ).where(Secret.id > last_id)
+                if not recompute:
+                    query = query.where(Secret.password_fingerprint.is_(None))
+                rows = db.session.execute(query.order_by(Secret.id).limit(batch_size)).all()
+                if not rows:
+                    return
+                last_id = rows[-1].id
+                due = {row.id: Secret.rotation_due(row.password_last_changed,
+                                                   row.rotation_interval_days)
+                       for row in rows}
+                yield due, [tuple(row[:4]) for row in rows]
+
+        done = 0
+
+        def write(due, results):
+            nonlocal done
+            db.session.execute(
+                update(Secret).execution_options(synchronize_session=False),
+                [
+                    {"id": secret_id, "password_fingerprint": fingerprint,
+                     "password_score": score, "password_rotate_at": due[secret_id]}
+                    for secret_id, fingerprint, score in results
+                ],
+            )
+            db.session.commit()
+            done += len(results)
+            if progress:
+                progress(done)
+
+        workers = workers or os.cpu_count() or 1
+        if workers == 1:
+            for due, rows in batches():
+                write(due, _assess_chunk(rows))
+        else:
+            breach_path = str(BreachService._path) if BreachService._path else None
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(instance_path, breach_path),
+            ) as pool:
+                pending = deque()
+                for due, rows in batches():
+                    pending.append((due, pool.submit(_assess_chunk, rows)))
+                    if len(pending) >= workers * 2:
+                        due, future = pending.popleft()
+                        write(due, future.result())
+                while pending:
+                    due, future = pending.popleft()
+                    write(due, future.result())
+        cls.invalidate()
+        return done
+
+    # -- Reports ------------------------------------------------------------
+
+    @classmethod
+    def report(cls, limit=50):
+        """Counts plus the largest reuse groups, weakest and most overdue
+        secrets (at most ``limit`` of each)."""
+        now = time.monotonic()
+        with cls._lock:
+            hit = cls._cache.get(limit)
+            version = cls._version
+        if hit and hit[0] == version and now - hit[1] < cls._cache_seconds:
+            return hit[2]
+        value = cls._build(limit)
+        with cls._lock:
+            if cls._version == version:
+                cls._cache[limit] = (version, now, value)
+        return value
+
+    @classmethod
+    def _build(cls, limit):
+        now = datetime.now(timezone.utc)
+        weak = Secret.password_score < WEAK_SCORE
+        overdue = Secret.password_rotate_at < now
+        # Separate counts so each one is a range scan of its own index.
+        assessed, weak_count, overdue_count = (
+            db.session.scalar(select(func.count()).where(condition))
+            for condition in (Secret.password_fingerprint.isnot(None), weak, overdue)
+        )
+
+        groups = (
+            select(Secret.password_fingerprint, func.count().label("size"))
+            .where(Secret.password_fingerprint.isnot(None))
+            .group_by(Secret.password_fingerprint)
+            .having(func.count() > 1)
+            .subquery()
+        )
+        group_count, reused = db.session.query(
+            func.count(), func.coalesce(func.sum(groups.c.size), 0)
+        ).select_from(groups).one()
+
+        top = db.session.execute(
+            select(groups.c.password_fingerprint, groups.c.size)
+            .order_by(groups.c.size.desc(), groups.c.password_fingerprint)
+            .limit(limit)
+        ).all()
+        members = {fingerprint: [] for fingerprint, _ in top}
+        if members:
+            rows = cls._secret_rows(Secret.password_fingerprint.in_(members))
+            for fingerprint, item in rows:
+                members[fingerprint].append(item)
+
+        return {
+            "summary": {
+                "assessed": assessed,
+                "weak": weak_count,
+                "reused": int(reused),
+                "reuse_groups": group_count,
+                "overdue": overdue_count,
+            },
+            # Fingerprints stay server-side; groups are only numbered.
+            "reuse_groups": [
+                {"size": size, "secrets": members[fingerprint]}
+                for fingerprint, size in top
+            ],
+            "weak": [
+                item for _, item in cls._secret_rows(
+                    weak, order_by=(Secret.password_score, Secret.id), limit=limit
+                )
+            ],
+            "overdue": [
+                item for _, item in cls._secret_rows(
+                    overdue, order_by=(Secret.password_rotate_at, Secret.id), limit=limit
+                )
+            ],
+        }
+
+    @staticmethod
+    def _secret_rows(condition, order_by=(Secret.id,), limit=None):
+        query = (
+            select(Secret.password_fingerprint, Secret.id, Secret.name, User.username,
+                   Secret.password_score, Secret.password_rotate_at)
+            .join(User, User.id == Secret.owner_id)
+            .where(condition)
+            .order_by(*order_by)
+        )
+        if limit is not None:
+            query = query.limit(limit)
+        return [
+            (fingerprint, {
+                "id": secret_id,
+                "name": name,
+                "owner": owner,
+                "score": score,
+                "rotate_at": rotate_at.isoformat() if rotate_at else None,
+            })
+            for fingerprint, secret_id, name, owner, score, rotate_at
+            in db.session.execute(query)
+        ]
@@ -3,7 +3,10 @@ from ldap3 import ALL, NTLM, SUBTREE, Connection, Server
 from ldap3.core.exceptions import LDAPBindError, LDAPSocketOpenError
 from ldap3.utils.conv import escape_filter_chars
 
+from app.services.metrics_service import instrumented
 
+
+@instrumented("ldap")
 class LDAPService:
     def __init__(self, config):
         self.server_url = config["LDAP_SERVER"]
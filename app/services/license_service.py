@@ -1,10 +1,14 @@
 from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import or_
+from sqlalchemy import func, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
 
 from app import db
 from app.models.license import License, LicenseAssignment
+from app.models.user import User
 from app.services.audit_service import AuditService
+from app.services.report_service import ReportService
+from app.services.search_service import SearchService
 
 LICENSE_TYPES = [
     ("perpetual", "Perpetual"),
@@ -27,7 +31,10 @@ class LicenseService:
     def get_licenses(q=None, license_type=None, status=None, page=1, per_page=25):
         query = License.query
 
-        if q:
+        ranked = SearchService.apply(query, "licenses", q) if q else None
+        if ranked is not None:
+            query = ranked
+        elif q:
             search = f"%{q}%"
             query = query.filter(
                 or_(
@@ -70,22 +77,51 @@ class LicenseService:
         )
 
     @staticmethod
-    def get_user_licenses(username, full_name=None):
-        """Find assignments matching user's username or full name."""
-        filters = [LicenseAssignment.is_active == True]
-        name_conditions = [LicenseAssignment.assigned_to.ilike(f"%{username}%")]
-        if full_name:
-            name_conditions.append(
-                LicenseAssignment.assigned_to.ilike(f"%{full_name}%")
-            )
-        filters.append(or_(*name_conditions))
+    def get_user_licenses(user):
+        """Find active assignments for ``user`` by indexed assignee_key."""
+        keys = {
+            value.strip().casefold()
+            for value in (user.username, user.email, user.full_name)
+            if value and value.strip()
+        }
         return (
-            LicenseAssignment.query.filter(*filters)
+            LicenseAssignment.query.filter(
+                LicenseAssignment.assignee_key.in_(keys),
+                LicenseAssignment.is_active == True,
+            )
             .join(License)
             .order_by(License.name)
             .all()
         )
 
+    @staticmethod
+    def assignee_keys(names):
+        """Map each assigned_to text to its assignee_key.
+
+        A name matching a user's username, email or full name (ignoring case
+        and a leading ``DOMAIN\\``) resolves to that username; anything else
+        keys on its own lowercased text.
+        """
+        def normalize(name):
+            return name.strip().rsplit("\\", 1)[-1].casefold()
+
+        wanted = {normalize(n) for n in names if n and n.strip()}
+        known = {}
+        if wanted:
+            users = db.session.query(User.username, User.email, User.full_name).filter(
+                or_(
+                    func.lower(User.username).in_(wanted),
+                    func.lower(User.email).in_(wanted),
+                    func.lower(User.full_name).in_(wanted),
+                )
+            )
+            users = users.all()
+            for field in (2, 1, 0):  # username last, so it wins across users too
+                for row in users:
+                    if row[field]:
+                        known[row[field].casefold()] = row[0].casefold()
+        return {n: known.get(normalize(n), normalize(n)) for n in names if n and n.strip()}
+
     @staticmethod
     def create_license(user, **kwargs):
         license_key_value = kwargs.pop("license_key", None)
@@ -113,6 +149,9 @@ class LicenseService:
             lic.license_key = license_key_value
 
         db.session.add(lic)
+        db.session.flush()
+        SearchService.index(lic)
+        ReportService.apply_change(None, ReportService.snapshot(lic))
         db.session.commit()
 
         AuditService.log(
@@ -127,6 +166,7 @@ class LicenseService:
 
     @staticmethod
     def update_license(lic, user, **kwargs):
+        before = ReportService.snapshot(lic)
         plain_fields = (
             "name",
             "vendor",
@@ -153,6 +193,8 @@ class LicenseService:
         if "license_key" in kwargs and kwargs["license_key"]:
             lic.license_key = kwargs["license_key"]
 
+        SearchService.index(lic)
+        ReportService.apply_change(before, ReportService.snapshot(lic))
         db.session.commit()
 
         AuditService.log(
@@ -175,9 +217,35 @@ class LicenseService:
             resource_id=lic.id,
             resource_name=lic.name,
         )
+        SearchService.remove("licenses", lic.id)
+        ReportService.apply_change(ReportService.snapshot(lic), None)
         db.session.delete(lic)
         db.session.commit()
 
+    @staticmethod
+    def _claim_seats(license_id, count):
+        """Atomically take ``count`` seats; False if that would oversubscribe.
+
+        A single conditional UPDATE: the row lock it takes is held only until
+        the caller commits, and concurrent claims re-check the condition.
+        """
+        result = db.session.execute(
+            update(License)
+            .where(
+                License.id == license_id,
+                or_(
+                    License.seat_count.is_(None),
+                    License.active_seat_count + count <= License.seat_count,
+                ),
+            )
+            .values(active_seat_count=License.active_seat_count + count)
+            .execution_options(synchronize_session=False)
+        )
+        lic = db.session.get(License, license_id)
+        if lic is not None:
+            db.session.expire(lic, ["active_seat_count"])
+        return result.rowcount == 1
+
     @staticmethod
     def assign_user(lic, assigned_to, assigned_by, notes=None, machine_name=None):
         existing = LicenseAssignment.query.filter_by(
@@ -186,18 +254,25 @@ class LicenseService:
         if existing:
             return None, "This person is already assigned to this license."
 
-        if lic.seat_count is not None and lic.used_seats >= lic.seat_count:
+        if not LicenseService._claim_seats(lic.id, 1):
+            db.session.rollback()
             return None, "No available seats for this license."
 
         assignment = LicenseAssignment(
             license_id=lic.id,
             assigned_to=assigned_to,
+            assignee_key=LicenseService.assignee_keys([assigned_to])[assigned_to],
             assigned_by_id=assigned_by.id,
             notes=notes,
             machine_name=machine_name,
         )
         db.session.add(assignment)
-        db.session.commit()
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # uq_license_assignments_active: a concurrent request won the race.
+            db.session.rollback()
+            return None, "This person is already assigned to this license."
 
         AuditService.log(
             action="license_assigned",
@@ -210,11 +285,181 @@ class LicenseService:
         )
         return assignment, None
 
+    @staticmethod
+    def assign_users(lic, assignees, assigned_by, notes=None):
+        """Assign several people at once, claiming all their seats in one
+        statement. All or nothing: returns ``(assignments, None)`` or
+        ``([], error)``. People already assigned are skipped.
+        """
+        names = list(dict.fromkeys(a.strip() for a in assignees if a and a.strip()))
+        if not names:
+            return [], None
+        already = {
+            name for name, in db.session.query(LicenseAssignment.assigned_to).filter(
+                LicenseAssignment.license_id == lic.id,
+                LicenseAssignment.is_active == True,
+                LicenseAssignment.assigned_to.in_(names),
+            )
+        }
+        names = [name for name in names if name not in already]
+        if not names:
+            return [], None
+
+        if not LicenseService._claim_seats(lic.id, len(names)):
+            db.session.rollback()
+            return [], (f"Not enough seats: {len(names)} requested, "
+                        f"{lic.available_seats} available.")
+
+        keys = LicenseService.assignee_keys(names)
+        assignments = [
+            LicenseAssignment(
+                license_id=lic.id,
+                assigned_to=name,
+                assignee_key=keys[name],
+                assigned_by_id=assigned_by.id,
+                notes=notes,
+            )
+            for name in names
+        ]
+        db.session.add_all(assignments)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return [], "Some of these people were assigned concurrently; please retry."
+
+        AuditService.log(
+            action="license_assigned",
+            user_id=assigned_by.id,
+            username=assigned_by.username,
+            resource_type="license",
+            resource_id=lic.id,
+            resource_name=lic.name,
+            details=f"Assigned to {len(names)} people: {', '.join(names[:20])}"
+                    + (" ..." if len(names) > 20 else ""),
+        )
+        return assignments, None
+
+    @staticmethod
+    def import_assignments(lic, rows, assigned_by, chunk_size=500):
+        """Bulk-assign from parsed CSV/JSON rows, committing per chunk.
+
+        Each row is a dict with ``assigned_to`` and optional ``machine_name``
+        and ``notes``. Returns one result per input row:
+        ``{"row", "assigned_to", "status", "message"}`` where status is
+        ``assigned``, ``skipped`` (duplicate or already assigned) or
+        ``error``. Rows beyond the free seats are reported as errors.
+        """
+        results = []
+        pending = []
+        seen = set()
+        for number, row in enumerate(rows, start=1):
+            row = row if isinstance(row, dict) else {}
+            name = str(row.get("assigned_to") or "").strip()
+            machine = str(row.get("machine_name") or "").strip() or None
+            notes = str(row.get("notes") or "").strip() or None
+            result = {"row": number, "assigned_to": name, "status": "error", "message": None}
+            results.append(result)
+            if not name:
+                result["message"] = "assigned_to is required."
+            elif len(name) > 255 or (machine and len(machine) > 255) or (notes and len(notes) > 500):
+                result["message"] = "Value too long."
+            elif name.casefold() in seen:
+                result.update(status="skipped", message="Duplicate row.")
+            else:
+                seen.add(name.casefold())
+                pending.append((result, {"assigned_to": name, "machine_name": machine,
+                                         "notes": notes}))
+
+        for start in range(0, len(pending), chunk_size):
+            LicenseService._import_chunk(lic, pending[start:start + chunk_size], assigned_by)
+        return results
+
+    @staticmethod
+    def _import_chunk(lic, chunk, assigned_by):
+        names = [values["assigned_to"] for _, values in chunk]
+        already = {
+            name for name, in db.session.query(LicenseAssignment.assigned_to).filter(
+                LicenseAssignment.license_id == lic.id,
+                LicenseAssignment.is_active == True,
+                LicenseAssignment.assigned_to.in_(names),
+            )
+        }
+        todo = []
+        for result, values in chunk:
+            if values["assigned_to"] in already:
+                result.update(status="skipped", message="Already assigned.")
+            else:
+                todo.append((result, values))
+
+        # Claim as many seats as are free; if another writer takes some in
+        # between, re-read and retry with the smaller number.
+        claimed = 0
+        while todo and not claimed:
+            free = len(todo)
+            if lic.seat_count is not None:
+                db.session.refresh(lic, ["active_seat_count"])
+                free = min(free, lic.seat_count - lic.active_seat_count)
+            if free <= 0:
+                break
+            if LicenseService._claim_seats(lic.id, free):
+                claimed = free
+        for result, _ in todo[claimed:]:
+            result["message"] = "No available seats for this license."
+        todo = todo[:claimed]
+        if not todo:
+            db.session.rollback()
+            return
+
+        keys = LicenseService.assignee_keys([values["assigned_to"] for _, values in todo])
+        db.session.execute(
+            insert(LicenseAssignment),
+            [
+                {
+                    **values,
+                    "license_id": lic.id,
+                    "assignee_key": keys[values["assigned_to"]],
+                    "assigned_by_id": assigned_by.id,
+                    "is_active": True,
+                }
+                for _, values in todo
+            ],
+        )
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            for result, _ in todo:
+                result["message"] = "Assigned concurrently by someone else; please retry."
+            return
+
+        for result, _ in todo:
+            result.update(status="assigned", message=None)
+        AuditService.log(
+            action="license_assigned",
+            user_id=assigned_by.id,
+            username=assigned_by.username,
+            resource_type="license",
+            resource_id=lic.id,
+            resource_name=lic.name,
+            details=f"Bulk import assigned {len(todo)} people",
+        )
+
     @staticmethod
     def unassign_user(assignment, user):
-        assignment.is_active = False
-        assignment.unassigned_date = datetime.now(timezone.utc)
+        # Release the seat only if this call deactivates the row, so two
+        # concurrent unassigns cannot both decrement the counter.
+        released = db.session.execute(
+            update(LicenseAssignment)
+            .where(LicenseAssignment.id == assignment.id, LicenseAssignment.is_active == True)
+            .values(is_active=False, unassigned_date=datetime.now(timezone.utc))
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if released == 1:
+            LicenseService._adjust_seat_count(assignment.license_id, -1)
         db.session.commit()
+        if released != 1:
+            return
 
         AuditService.log(
             action="license_unassigned",
@@ -226,6 +471,49 @@ class LicenseService:
             details=f"Unassigned {assignment.assigned_to}",
         )
 
+    @staticmethod
+    def _adjust_seat_count(license_id, delta):
+        """Move the seat counter in SQL, inside the caller's transaction."""
+        db.session.execute(
+            update(License)
+            .where(License.id == license_id)
+            .values(active_seat_count=License.active_seat_count + delta)
+            .execution_options(synchronize_session=False)
+        )
+        lic = db.session.get(License, license_id)
+        if lic is not None:
+            db.session.expire(lic, ["active_seat_count"])
+
+    @staticmethod
+    def reconcile_seat_counts():
+        """Reset every drifted active_seat_count from the assignments table.
+
+        Returns the ids of licenses whose counter was wrong. Commits.
+        """
+        actual = (
+            select(func.count(LicenseAssignment.id))
+            .where(
+                LicenseAssignment.license_id == License.id,
+                LicenseAssignment.is_active == True,
+            )
+            .scalar_subquery()
+        )
+        drifted = [
+            license_id
+            for license_id, in db.session.query(License.id).filter(
+                License.active_seat_count != actual
+            )
+        ]
+        if drifted:
+            db.session.execute(
+                update(License)
+                .where(License.id.in_(drifted))
+                .values(active_seat_count=actual)
+                .execution_options(synchronize_session=False)
+            )
+        db.session.commit()
+        return drifted
+
     @staticmethod
     def get_dashboard_stats():
         now = datetime.now(timezone.utc)
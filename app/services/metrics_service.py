@@ -0,0 +1,272 @@
+import functools
+import inspect
+import threading
+import time
+from bisect import bisect_left
+
+from flask import request
+
+# Histogram upper bounds in seconds (Prometheus "le" buckets).
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_local = threading.local()
+
+
+class _RequestStats:
+    __slots__ = ("started", "counters", "timers")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.counters = {}
+        self.timers = {}
+
+
+class _Histogram:
+    __slots__ = ("buckets", "total", "count")
+
+    def __init__(self):
+        self.buckets = [0] * (len(DURATION_BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.buckets[bisect_left(DURATION_BUCKETS, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class _EndpointStats:
+    def __init__(self):
+        self.duration = _Histogram()
+        self.db_duration = _Histogram()
+        self.statuses = {}
+        self.counters = {}
+        self.timers = {}
+
+
+class MetricsService:
+    """In-process per-endpoint request metrics, exported in Prometheus format.
+
+    A request's own counters live in a thread-local while it runs (waitress
+    serves each request on one thread) and are folded into the per-endpoint
+    aggregates when it finishes.
+    """
+
+    _lock = threading.Lock()
+    _endpoints = {}
+    _in_flight = 0
+
+    @classmethod
+    def init_app(cls, app):
+        if not app.config.get("METRICS_ENABLED", True):
+            return
+
+        from app import db
+
+        with app.app_context():
+            cls._install_engine_listeners(db.engine)
+
+        server_timing = app.config.get("METRICS_SERVER_TIMING", False)
+
+        @app.before_request
+        def _metrics_start():
+            _local.stats = _RequestStats()
+            with cls._lock:
+                cls._in_flight += 1
+
+        @app.after_request
+        def _metrics_finish(response):
+            stats = cls._finish_request()
+            if stats is not None:
+                elapsed = time.perf_counter() - stats.started
+                cls._record(request.endpoint or "unmatched", response.status_code,
+                            elapsed, stats)
+                if server_timing:
+                    response.headers["Server-Timing"] = cls._server_timing(elapsed, stats)
+            return response
+
+        @app.teardown_request
+        def _metrics_teardown(exc):
+            # Normally after_request has already recorded the request.
+            stats = cls._finish_request()
+            if stats is not None and exc is not None:
+                cls._record(request.endpoint or "unmatched", 500,
+                            time.perf_counter() - stats.started, stats)
+
+    @classmethod
+    def _finish_request(cls):
+        stats = getattr(_local, "stats", None)
+        if stats is not None:
+            _local.stats = None
+            with cls._lock:
+                cls._in_flight -= 1
+        return stats
+
+    @staticmethod
+    def _install_engine_listeners(engine):
+        from sqlalchemy import event
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _before(conn, cursor, statement, parameters, context, executemany):
+            if getattr(_local, "stats", None) is not None:
+                conn.info.setdefault("metrics_started", []).append(time.perf_counter())
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def _after(conn, cursor, statement, parameters, context, executemany):
+            stats = getattr(_local, "stats", None)
+            started = conn.info.get("metrics_started")
+            if stats is None or not started:
+                return
+            elapsed = time.perf_counter() - started.pop()
+            stats.counters["db_statements"] = stats.counters.get("db_statements", 0) + 1
+            stats.timers["db"] = stats.timers.get("db", 0.0) + elapsed
+
+    # --- recording hooks used by services ---
+
+    @staticmethod
+    def incr(name, amount=1):
+        """Add to a per-request counter; no-op outside a request."""
+        stats = getattr(_local, "stats", None)
+        if stats is not None:
+            stats.counters[name] = stats.counters.get(name, 0) + amount
+
+    @staticmethod
+    def add_time(name, seconds):
+        """Add to a per-request timer (also counts calls); no-op outside a request."""
+        stats = getattr(_local, "stats", None)
+        if stats is not None:
+            stats.timers[name] = stats.timers.get(name, 0.0) + seconds
+            key = f"{name}_calls"
+            stats.counters[key] = stats.counters.get(key, 0) + 1
+
+    @classmethod
+    def _record(cls, endpoint, status, elapsed, stats):
+        with cls._lock:
+            agg = cls._endpoints.get(endpoint)
+            if agg is None:
+                agg = cls._endpoints[endpoint] = _EndpointStats()
+            agg.duration.observe(elapsed)
+            agg.db_duration.observe(stats.timers.get("db", 0.0))
+            agg.statuses[status] = agg.statuses.get(status, 0) + 1
+            for name, value in stats.counters.items():
+                agg.counters[name] = agg.counters.get(name, 0) + value
+            for name, value in stats.timers.items():
+                agg.timers[name] = agg.timers.get(name, 0.0) + value
+
+    @staticmethod
+    def _server_timing(elapsed, stats):
+        parts = [f"app;dur={elapsed * 1000:.1f}"]
+        if "db" in stats.timers:
+            parts.append(
+                f'db;dur={stats.timers["db"] * 1000:.1f};'
+                f'desc="{stats.counters.get("db_statements", 0)} queries"'
+            )
+        for name in ("ldap", "oracle", "audit"):
+            if name in stats.timers:
+                parts.append(f"{name};dur={stats.timers[name] * 1000:.1f}")
+        crypto = stats.counters.get("crypto_decrypt", 0) + stats.counters.get("crypto_encrypt", 0)
+        if crypto:
+            parts.append(f'crypto;desc="{crypto} ops"')
+        return ", ".join(parts)
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls._endpoints = {}
+
+    # --- export ---
+
+    @classmethod
+    def render_prometheus(cls):
+        """Render all aggregates in the Prometheus text exposition format."""
+        with cls._lock:
+            snapshot = sorted(cls._endpoints.items())
+            in_flight = cls._in_flight
+
+        lines = []
+
+        def header(name, kind, help_text):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def histogram(name, attr):
+            for endpoint, agg in snapshot:
+                hist = getattr(agg, attr)
+                cumulative = 0
+                for bound, count in zip(DURATION_BUCKETS, hist.buckets):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{endpoint="{endpoint}",le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{endpoint="{endpoint}",le="+Inf"}} {hist.count}')
+                lines.append(f'{name}_sum{{endpoint="{endpoint}"}} {hist.total:.6f}')
+                lines.append(f'{name}_count{{endpoint="{endpoint}"}} {hist.count}')
+
+        header("keyvault_requests_in_flight", "gauge", "Requests currently being served.")
+        lines.append(f"keyvault_requests_in_flight {in_flight}")
+
+        header("keyvault_requests_total", "counter", "Completed requests by endpoint and status.")
+        for endpoint, agg in snapshot:
+            for status, count in sorted(agg.statuses.items()):
+                lines.append(f'keyvault_requests_total{{endpoint="{endpoint}",status="{status}"}} {count}')
+
+        header("keyvault_request_duration_seconds", "histogram", "Request wall time.")
+        histogram("keyvault_request_duration_seconds", "duration")
+
+        header("keyvault_db_duration_seconds", "histogram", "Time spent in SQL per request.")
+        histogram("keyvault_db_duration_seconds", "db_duration")
+
+        header("keyvault_db_statements_total", "counter", "SQL statements executed.")
+        for endpoint, agg in snapshot:
+            lines.append(f'keyvault_db_statements_total{{endpoint="{endpoint}"}} '
+                         f'{agg.counters.get("db_statements", 0)}')
+
+        header("keyvault_crypto_operations_total", "counter", "Field encrypt/decrypt operations.")
+        for endpoint, agg in snapshot:
+            for op in ("encrypt", "decrypt"):
+                lines.append(f'keyvault_crypto_operations_total{{endpoint="{endpoint}",op="{op}"}} '
+                             f'{agg.counters.get(f"crypto_{op}", 0)}')
+
+        header("keyvault_user_cache_lookups_total", "counter", "Session user loads by cache result.")
+        for endpoint, agg in snapshot:
+            for result in ("hit", "miss"):
+                count = agg.counters.get(f"user_cache_{result}", 0)
+                if count:
+                    lines.append(f'keyvault_user_cache_lookups_total{{endpoint="{endpoint}",result="{result}"}} {count}')
+
+        header("keyvault_external_calls_total", "counter", "LDAP, Oracle and audit-log calls.")
+        for endpoint, agg in snapshot:
+            for service in ("ldap", "oracle", "audit"):
+                calls = agg.counters.get(f"{service}_calls", 0)
+                if calls:
+                    lines.append(f'keyvault_external_calls_total{{endpoint="{endpoint}",service="{service}"}} {calls}')
+
+        header("keyvault_external_call_seconds_total", "counter", "Time spent in LDAP, Oracle and audit-log calls.")
+        for endpoint, agg in snapshot:
+            for service in ("ldap", "oracle", "audit"):
+                if service in agg.timers:
+                    lines.append(f'keyvault_external_call_seconds_total{{endpoint="{endpoint}",service="{service}"}} '
+                                 f'{agg.timers[service]:.6f}')
+
+        return "\n".join(lines) + "\n"
+
+
+def instrumented(service):
+    """Class decorator timing every public method as calls to ``service``."""
+
+    def wrap(method):
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                MetricsService.add_time(service, time.perf_counter() - started)
+
+        return timed
+
+    def decorate(cls):
+        for name, attr in list(vars(cls).items()):
+            if inspect.isfunction(attr) and not name.startswith("_"):
+                setattr(cls, name, wrap(attr))
+        return cls
+
+    return decorate
@@ -1,6 +1,6 @@
 from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import and_
+from sqlalchemy import and_, or_
 
 from app.models.secret import Secret
 
@@ -36,7 +36,12 @@ class NotificationService:
         cutoff = datetime.now(timezone.utc) - timedelta(days=days_threshold)
         return Secret.query.filter(
             and_(
-                Secret.encrypted_password.isnot(None),
+                # v2 rows share one blob for every field; the hygiene
+                # fingerprint is what marks an actual password there.
+                or_(
+                    Secret.encrypted_password.isnot(None),
+                    Secret.password_fingerprint.isnot(None),
+                ),
                 Secret.password_last_changed.isnot(None),
                 Secret.password_last_changed < cutoff,
                 Secret.rotation_interval_days.isnot(None),
@@ -2,7 +2,10 @@ import re
 
 import oracledb
 
+from app.services.metrics_service import instrumented
 
+
+@instrumented("oracle")
 class OracleService:
     def __init__(self, config):
         self.host = config["ORACLE_HOST"]
@@ -1,62 +1,261 @@
-import secrets
+import math
+import os
 import string
+from array import array
+from functools import lru_cache
+from pathlib import Path
+
+from app.services.breach_service import BreachService
+
+WORDLIST_PATH = Path(__file__).resolve().parent.parent / "data" / "passphrase_words.txt"
+
+PASSPHRASE_MIN_WORDS = 3
+PASSPHRASE_MAX_WORDS = 20
+CAPITALIZE_MODES = ("none", "title", "random")
+
+
+class _RandomBuffer:
+    """Unbiased random integers drawn from one bulk ``os.urandom`` read.
+
+    ``below(n)`` uses rejection sampling: bytes at or above the largest
+    multiple of ``n`` are discarded, so every value in ``range(n)`` is
+    equally likely (a plain ``byte % n`` would favour low values).
+    """
+
+    def __init__(self, size=4096):
+        self._size = size
+        self._data = b""
+        self._pos = 0
+
+    def _take(self, count):
+        if self._pos + count > len(self._data):
+            self._data = os.urandom(max(self._size, count))
+            self._pos = 0
+        chunk = self._data[self._pos:self._pos + count]
+        self._pos += count
+        return chunk
+
+    def below(self, n):
+        if n <= 256:
+            limit = 256 - 256 % n
+            while True:
+                if self._pos >= len(self._data):
+                    self._data = os.urandom(self._size)
+                    self._pos = 0
+                value = self._data[self._pos]
+                self._pos += 1
+                if value < limit:
+                    return value % n
+        width = ((n - 1).bit_length() + 7) // 8
+        span = 256 ** width
+        limit = span - span % n
+        while True:
+            value = int.from_bytes(self._take(width), "big")
+            if value < limit:
+                return value % n
+
+
+class _Wordlist:
+    """Words packed into one bytes buffer plus an ``array`` of end offsets.
+
+    A few thousand short words cost one ~30 KB buffer and 4 bytes per offset
+    instead of a list of str objects at ~55 bytes each.
+    """
+
+    def __init__(self, raw):
+        words = raw.split()
+        self.data = b"".join(words)
+        self.offsets = array("I", [0])
+        for word in words:
+            self.offsets.append(self.offsets[-1] + len(word))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        return self.data[self.offsets[index]:self.offsets[index + 1]].decode("ascii")
+
+
+@lru_cache(maxsize=None)
+def _wordlist():
+    return _Wordlist(WORDLIST_PATH.read_bytes())
 
 
 class PasswordGenerator:
     @staticmethod
-    def generate(
-        length: int = 20,
-        use_uppercase: bool = True,
-        use_lowercase: bool = True,
-        use_digits: bool = True,
-        use_symbols: bool = True,
-        exclude_ambiguous: bool = True,
-        custom_symbols: str = "!@#$%^&*()-_=+[]{}|;:,.<>?",
-    ) -> str:
-        chars = ""
-        required = []
+    def _pools(
+        use_uppercase, use_lowercase, use_digits, use_symbols, exclude_ambiguous, custom_symbols
+    ):
+        """Return ``(required_pools, all_chars)`` for the given options."""
+        pools = []
 
         if use_lowercase:
             pool = string.ascii_lowercase
             if exclude_ambiguous:
                 pool = pool.replace("l", "")
-            chars += pool
-            required.append(secrets.choice(pool))
+            pools.append(pool)
 
         if use_uppercase:
             pool = string.ascii_uppercase
             if exclude_ambiguous:
                 pool = pool.replace("O", "").replace("I", "")
-            chars += pool
-            required.append(secrets.choice(pool))
+            pools.append(pool)
 
         if use_digits:
             pool = string.digits
             if exclude_ambiguous:
                 pool = pool.replace("0", "").replace("1", "")
-            chars += pool
-            required.append(secrets.choice(pool))
+            pools.append(pool)
 
-        if use_symbols:
-            chars += custom_symbols
-            required.append(secrets.choice(custom_symbols))
+        if use_symbols and custom_symbols:
+            pools.append(custom_symbols)
 
+        chars = "".join(pools)
         if not chars:
             raise ValueError("At least one character set must be enabled")
+        return pools, chars
 
-        remaining = length - len(required)
-        if remaining < 0:
-            remaining = 0
-            required = required[:length]
+    @staticmethod
+    def _assemble(length, pools, chars, rng):
+        # One character from each enabled class, the rest from the whole
+        # pool, then a Fisher-Yates shuffle so the guaranteed ones can be
+        # anywhere.
+        password_chars = [pool[rng.below(len(pool))] for pool in pools][:length]
+        size = len(chars)
+        password_chars += [chars[rng.below(size)] for _ in range(length - len(password_chars))]
+        for i in range(len(password_chars) - 1, 0, -1):
+            j = rng.below(i + 1)
+            password_chars[i], password_chars[j] = password_chars[j], password_chars[i]
+        return "".join(password_chars)
 
-        password_chars = required + [
-            secrets.choice(chars) for _ in range(remaining)
-        ]
+    @staticmethod
+    def generate(
+        length: int = 20,
+        use_uppercase: bool = True,
+        use_lowercase: bool = True,
+        use_digits: bool = True,
+        use_symbols: bool = True,
+        exclude_ambiguous: bool = True,
+        custom_symbols: str = "!@#$%^&*()-_=+[]{}|;:,.<>?",
+    ) -> str:
+        pools, chars = PasswordGenerator._pools(
+            use_uppercase, use_lowercase, use_digits, use_symbols, exclude_ambiguous, custom_symbols
+        )
+        return PasswordGenerator._assemble(length, pools, chars, _RandomBuffer(size=2 * length))
 
-        rng = secrets.SystemRandom()
-        rng.shuffle(password_chars)
+    @staticmethod
+    def generate_batch(
+        count: int,
+        length: int = 20,
+        use_uppercase: bool = True,
+        use_lowercase: bool = True,
+        use_digits: bool = True,
+        use_symbols: bool = True,
+        exclude_ambiguous: bool = True,
+        custom_symbols: str = "!@#$%^&*()-_=+[]{}|;:,.<>?",
+    ):
+        """Yield ``(password, strength)`` for ``count`` passwords.
 
-        return "".join(password_chars)
+        Same options and guarantees as :meth:`generate`, but all randomness
+        comes from a shared buffer refilled 64 KiB at a time.
+        """
+        pools, chars = PasswordGenerator._pools(
+            use_uppercase, use_lowercase, use_digits, use_symbols, exclude_ambiguous, custom_symbols
+        )
+        rng = _RandomBuffer(size=65536)
+        for _ in range(count):
+            password = PasswordGenerator._assemble(length, pools, chars, rng)
+            yield password, PasswordGenerator.calculate_strength(password)
+
+    @staticmethod
+    def _check_passphrase(words, separator, capitalize, digits):
+        if not PASSPHRASE_MIN_WORDS <= words <= PASSPHRASE_MAX_WORDS:
+            raise ValueError(
+                f"Word count must be between {PASSPHRASE_MIN_WORDS} and {PASSPHRASE_MAX_WORDS}"
+            )
+        if capitalize not in CAPITALIZE_MODES:
+            raise ValueError(f"Capitalization must be one of: {', '.join(CAPITALIZE_MODES)}")
+        if not 0 <= digits <= words:
+            raise ValueError("Digit count must be between 0 and the word count")
+        # Word boundaries must stay recoverable or the entropy figure would
+        # overstate how many distinct passphrases there are.
+        if any(c.isalnum() for c in separator):
+            raise ValueError("Separator cannot contain letters or digits")
+        if not separator and capitalize != "title":
+            raise ValueError("An empty separator needs title capitalization")
+
+    @staticmethod
+    def passphrase_entropy(words=6, capitalize="none", digits=0) -> float:
+        """Exact entropy in bits of a passphrase with these options."""
+        bits = words * math.log2(len(_wordlist()))
+        if capitalize == "random":
+            bits += words
+        if digits:
+            bits += math.log2(math.comb(words, digits)) + digits * math.log2(10)
+        return bits
+
+    @staticmethod
+    def _assemble_passphrase(words, separator, capitalize, digits, wordlist, rng):
+        size = len(wordlist)
+        chosen = [wordlist[rng.below(size)] for _ in range(words)]
+        if capitalize == "title":
+            chosen = [word.capitalize() for word in chosen]
+        elif capitalize == "random":
+            chosen = [word.capitalize() if rng.below(2) else word for word in chosen]
+        # A partial Fisher-Yates shuffle picks ``digits`` distinct words, and
+        # each gets one trailing digit.
+        slots = list(range(words))
+        for i in range(digits):
+            j = i + rng.below(words - i)
+            slots[i], slots[j] = slots[j], slots[i]
+            chosen[slots[i]] += str(rng.below(10))
+        return separator.join(chosen)
+
+    @staticmethod
+    def generate_passphrase(
+        words: int = 6,
+        separator: str = "-",
+        capitalize: str = "none",
+        digits: int = 0,
+    ) -> str:
+        """Diceware-style passphrase of ``words`` words from the bundled list.
+
+        ``capitalize`` is ``none``, ``title`` (every word) or ``random`` (each
+        word with probability 1/2); ``digits`` words get a random trailing
+        digit.
+        """
+        PasswordGenerator._check_passphrase(words, separator, capitalize, digits)
+        return PasswordGenerator._assemble_passphrase(
+            words, separator, capitalize, digits, _wordlist(), _RandomBuffer(size=4 * words)
+        )
+
+    @staticmethod
+    def generate_passphrase_batch(
+        count: int,
+        words: int = 6,
+        separator: str = "-",
+        capitalize: str = "none",
+        digits: int = 0,
+    ):
+        """Iterator of ``(passphrase, strength)`` for ``count`` passphrases,
+        drawing from a shared 64 KiB random buffer. ``strength`` also carries
+        the exact ``entropy`` in bits. Options are checked before returning.
+        """
+        PasswordGenerator._check_passphrase(words, separator, capitalize, digits)
+        entropy = round(PasswordGenerator.passphrase_entropy(words, capitalize, digits), 2)
+        wordlist = _wordlist()
+        rng = _RandomBuffer(size=65536)
+
+        def passphrases():
+            for _ in range(count):
+                passphrase = PasswordGenerator._assemble_passphrase(
+                    words, separator, capitalize, digits, wordlist, rng
+                )
+                strength = PasswordGenerator.calculate_strength(passphrase)
+                strength["entropy"] = entropy
+                yield passphrase, strength
+
+        return passphrases()
 
     @staticmethod
     def calculate_strength(password: str) -> dict:
@@ -90,8 +289,13 @@ class PasswordGenerator:
         else:
             feedback.append("Add symbols")
 
+        breached = BreachService.is_breached(password)
+        if breached:
+            score = min(score, 10)
+            feedback.insert(0, "Found in a known data breach")
+
         strength = (
             "weak" if score < 40 else "medium" if score < 70 else "strong"
         )
 
-        return {"score": score, "strength": strength, "feedback": feedback}
+        return {"score": score, "strength": strength, "feedback": feedback, "breached": breached}
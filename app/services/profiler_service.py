@@ -0,0 +1,239 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from flask import current_app, request
+from itsdangerous import BadSignature, SignatureExpired, TimestampSigner
+
+PROFILE_HEADER = "X-KeyVault-Profile"
+PROFILE_QUERY_FLAG = "_profile"
+
+_local = threading.local()
+
+
+class _StackSampler(threading.Thread):
+    """Sample one thread's Python stack at a fixed interval.
+
+    Produces collapsed stacks ("outer;inner;leaf count"), the input format of
+    flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, target_thread_id, interval):
+        super().__init__(daemon=True)
+        self.target_thread_id = target_thread_id
+        self.interval = interval
+        self.stacks = {}
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.target_thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            key = ";".join(reversed(names))
+            self.stacks[key] = self.stacks.get(key, 0) + 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def collapsed(self):
+        return "\n".join(f"{stack} {count}" for stack, count in
+                         sorted(self.stacks.items(), key=lambda kv: -kv[1]))
+
+
+class _Capture:
+    def __init__(self, mode, interval):
+        self.mode = mode
+        self.started = time.perf_counter()
+        self.profile = cProfile.Profile()
+        self.sampler = _StackSampler(threading.get_ident(), interval)
+        self.sampler.start()
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+        self.sampler.stop()
+        return time.perf_counter() - self.started
+
+
+class ProfilerService:
+    """Profile individual requests on demand and keep the captures on disk.
+
+    A request is profiled when an admin adds ``?_profile=1``, when it carries
+    a valid signed ``X-KeyVault-Profile`` header, or when it is the Nth
+    request to one of the blueprints listed in PROFILE_SAMPLE_BLUEPRINTS.
+    Only one sampled capture runs at a time so overhead stays bounded.
+    """
+
+    _sample_lock = threading.Lock()
+    _sample_counter = 0
+    _sampling_busy = threading.Semaphore(1)
+
+    @classmethod
+    def init_app(cls, app):
+        @app.before_request
+        def _profile_start():
+            mode = cls._requested_mode(app)
+            if mode is None:
+                return
+            if mode == "sampled" and not cls._sampling_busy.acquire(blocking=False):
+                return
+            _local.capture = _Capture(mode, app.config["PROFILE_SAMPLE_INTERVAL"])
+
+        @app.after_request
+        def _profile_finish(response):
+            capture = getattr(_local, "capture", None)
+            if capture is not None:
+                _local.capture = None
+                cls._save(capture, response.status_code)
+            return response
+
+        @app.teardown_request
+        def _profile_teardown(exc):
+            capture = getattr(_local, "capture", None)
+            if capture is not None:
+                _local.capture = None
+                cls._save(capture, 500)
+
+    # --- triggering ---
+
+    @classmethod
+    def _requested_mode(cls, app):
+        if request.endpoint == "static":
+            return None
+
+        token = request.headers.get(PROFILE_HEADER)
+        if token and cls.verify_token(token):
+            return "header"
+
+        if request.args.get(PROFILE_QUERY_FLAG) == "1":
+            from flask_login import current_user
+
+            if current_user.is_authenticated and current_user.is_admin():
+                return "flag"
+
+        rate = app.config["PROFILE_SAMPLE_RATE"]
+        blueprints = app.config["PROFILE_SAMPLE_BLUEPRINTS"]
+        if rate > 0 and request.blueprint in blueprints:
+            with cls._sample_lock:
+                cls._sample_counter += 1
+                if cls._sample_counter % rate == 0:
+                    return "sampled"
+        return None
+
+    @staticmethod
+    def _signer():
+        return TimestampSigner(current_app.config["SECRET_KEY"], salt="keyvault-profile")
+
+    @classmethod
+    def create_token(cls):
+        """Return a signed value for the X-KeyVault-Profile header."""
+        return cls._signer().sign("profile").decode("utf-8")
+
+    @classmethod
+    def verify_token(cls, token):
+        try:
+            cls._signer().unsign(
+                token, max_age=current_app.config["PROFILE_TOKEN_MAX_AGE"]
+            )
+            return True
+        except (BadSignature, SignatureExpired):
+            return False
+
+    # --- storage ---
+
+    @staticmethod
+    def profile_dir():
+        path = Path(current_app.instance_path) / "profiles"
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    @classmethod
+    def _save(cls, capture, status):
+        elapsed = capture.stop()
+        if capture.mode == "sampled":
+            cls._sampling_busy.release()
+
+        try:
+            stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S-%f")
+            endpoint = (request.endpoint or "unmatched").replace(".", "-")
+            name = f"{stamp}-{endpoint}"
+            directory = cls.profile_dir()
+
+            capture.profile.dump_stats(str(directory / f"{name}.pstats"))
+            (directory / f"{name}.collapsed").write_text(
+                capture.sampler.collapsed(), encoding="utf-8"
+            )
+            (directory / f"{name}.json").write_text(json.dumps({
+                "name": name,
+                "endpoint": request.endpoint,
+                "method": request.method,
+                "path": request.path,
+                "status": status,
+                "mode": capture.mode,
+                "duration_ms": round(elapsed * 1000, 2),
+                "captured_at": datetime.now(timezone.utc).isoformat(),
+            }), encoding="utf-8")
+            cls._enforce_retention(directory)
+        except Exception as e:
+            current_app.logger.error(f"Failed to save request profile: {e}")
+
+    @staticmethod
+    def _enforce_retention(directory):
+        keep = current_app.config["PROFILE_MAX_CAPTURES"]
+        captures = sorted(directory.glob("*.json"))
+        for meta in captures[:-keep] if keep else []:
+            for suffix in (".json", ".pstats", ".collapsed"):
+                meta.with_suffix(suffix).unlink(missing_ok=True)
+
+    @classmethod
+    def list_captures(cls, limit=50, top=5):
+        """Return recent captures, newest first, with their top functions."""
+        captures = []
+        for meta_path in sorted(cls.profile_dir().glob("*.json"), reverse=True)[:limit]:
+            try:
+                meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            meta["top_functions"] = cls.top_functions(meta_path.with_suffix(".pstats"), top)
+            captures.append(meta)
+        return captures
+
+    @staticmethod
+    def top_functions(pstats_path, limit=5):
+        """Top functions by cumulative time as dicts for display."""
+        try:
+            stats = pstats.Stats(str(pstats_path), stream=io.StringIO())
+        except (OSError, TypeError, ValueError):
+            return []
+        rows = []
+        for (filename, line, func), (cc, nc, tt, ct, _) in stats.stats.items():
+            rows.append({
+                "function": f"{func} ({os.path.basename(filename)}:{line})",
+                "calls": nc,
+                "own_ms": round(tt * 1000, 2),
+                "cumulative_ms": round(ct * 1000, 2),
+            })
+        rows.sort(key=lambda r: r["cumulative_ms"], reverse=True)
+        return rows[:limit]
+
+    @classmethod
+    def capture_path(cls, name, suffix):
+        """Resolve a capture file, refusing anything outside the profile dir."""
+        if suffix not in (".pstats", ".collapsed") or "/" in name or "\\" in name or ".." in name:
+            return None
+        path = cls.profile_dir() / f"{name}{suffix}"
+        return path if path.exists() else None
@@ -0,0 +1,329 @@
+import bisect
+import heapq
+import sys
+import threading
+import time
+from collections import Counter, namedtuple
+from datetime import datetime, timezone
+
+from sqlalchemy import event
+
+from app import db
+from app.models.application import Application
+from app.models.folder import Folder
+from app.models.license import License
+from app.models.secret import Secret
+from app.services.access_service import AccessService
+from app.services.fuzzy_search_service import FUZZY_FIELDS, FuzzySearchService
+from app.services.search_service import tokenize
+
+QUICK_SEARCH_KINDS = {
+    "secrets": Secret,
+    "licenses": License,
+    "applications": Application,
+    "folders": Folder,
+}
+_KIND_BY_MODEL = {model: kind for kind, model in QUICK_SEARCH_KINDS.items()}
+
+# ``text`` is " tok1 tok2 ..." so a prefix test is one substring search;
+# owner_id is None for records every signed-in user may see.
+_Entry = namedtuple("_Entry", "name folded tokens text owner_id")
+
+# Sorts after any token starting with a given prefix.
+_PREFIX_END = "\U0010ffff"
+
+
+def _entry(kind, name, owner_id):
+    tokens = tuple(dict.fromkeys(tokenize(name)))
+    owner = owner_id if kind in ("secrets", "folders") else None
+    return _Entry(name, (name or "").casefold(), tokens, " " + " ".join(tokens), owner)
+
+
+class QuickSearchService:
+    """In-process prefix index over record names for the global quick search.
+
+    The index holds, per kind, a sorted array of ``(token, id)`` keys searched
+    with bisect, plus a dict of entries holding each name's tokens and owner.
+    It is built lazily on first use and patched after every commit that
+    touches an indexed model (via session events, so every write path is
+    covered). A background thread rebuilds it every
+    QUICK_SEARCH_REFRESH_SECONDS to pick up writes made by other worker
+    processes; requests keep reading the previous index meanwhile.
+    """
+
+    _keys = {}
+    _entries = {}
+    _built_at = None
+    _refresh = 300
+    _scan_limit = 2000
+    _stats = {"rebuilds": 0, "rebuild_seconds": None, "built_at": None}
+    _refresher = None
+    _lock = threading.RLock()
+    _build_lock = threading.Lock()
+
+    @classmethod
+    def init_app(cls, app):
+        cls._refresh = app.config["QUICK_SEARCH_REFRESH_SECONDS"]
+        cls._scan_limit = app.config["QUICK_SEARCH_SCAN_LIMIT"]
+        if not event.contains(db.session, "after_flush", cls._collect):
+            event.listen(db.session, "after_flush", cls._collect)
+            event.listen(db.session, "after_commit", cls._apply)
+            event.listen(db.session, "after_rollback", cls._discard)
+        if cls._refresh > 0 and not app.testing:
+
+            @app.before_request
+            def _start_quick_search_refresh():
+                cls._start_refresher(app)
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls._keys = {}
+            cls._entries = {}
+            cls._built_at = None
+
+    # -- Maintenance --------------------------------------------------------
+
+    @classmethod
+    def _collect(cls, session, flush_context):
+        pending = session.info.setdefault("quick_search", {})
+        for obj in session.new | session.dirty:
+            kind = _KIND_BY_MODEL.get(type(obj))
+            if kind:
+                pending[(kind, obj.id)] = _entry(kind, obj.name, getattr(obj, "owner_id", None))
+        for obj in session.deleted:
+            kind = _KIND_BY_MODEL.get(type(obj))
+            if kind:
+                pending[(kind, obj.id)] = None
+
+    @classmethod
+    def _apply(cls, session):
+        pending = session.info.pop("quick_search", None)
+        if not pending or cls._built_at is None:
+            return
+        with cls._lock:
+            for ref, entry in pending.items():
+                cls._remove(ref)
+                if entry is not None and entry.tokens:
+                    cls._insert(ref, entry)
+
+    @classmethod
+    def _discard(cls, session):
+        session.info.pop("quick_search", None)
+
+    @classmethod
+    def _insert(cls, ref, entry):
+        kind, ref_id = ref
+        cls._entries[ref] = entry
+        keys = cls._keys.setdefault(kind, [])
+        for token in entry.tokens:
+            bisect.insort(keys, (token, ref_id))
+
+    @classmethod
+    def _remove(cls, ref):
+        entry = cls._entries.pop(ref, None)
+        if entry is None:
+            return
+        kind, ref_id = ref
+        keys = cls._keys.get(kind, [])
+        for token in entry.tokens:
+            key = (token, ref_id)
+            position = bisect.bisect_left(keys, key)
+            if position < len(keys) and keys[position] == key:
+                del keys[position]
+
+    @classmethod
+    def rebuild(cls):
+        """Reload every indexed name from the database."""
+        started = time.perf_counter()
+        entries = {}
+        keys = {}
+        for kind, model in QUICK_SEARCH_KINDS.items():
+            owner_column = getattr(model, "owner_id", model.id)
+            rows = db.session.query(model.id, model.name, owner_column).yield_per(5000)
+            kind_keys = []
+            for ref_id, name, owner_id in rows:
+                entry = _entry(kind, name, owner_id)
+                if entry.tokens:
+                    entries[(kind, ref_id)] = entry
+                    kind_keys.extend((token, ref_id) for token in entry.tokens)
+            kind_keys.sort()
+            keys[kind] = kind_keys
+        elapsed = time.perf_counter() - started
+        with cls._lock:
+            cls._keys, cls._entries = keys, entries
+            cls._built_at = time.monotonic()
+            cls._stats = {
+                "rebuilds": cls._stats["rebuilds"] + 1,
+                "rebuild_seconds": round(elapsed, 4),
+                "built_at": datetime.now(timezone.utc).isoformat(),
+            }
+
+    @classmethod
+    def _ensure_built(cls):
+        if cls._built_at is None:
+            with cls._build_lock:
+                if cls._built_at is None:
+                    cls.rebuild()
+
+    @classmethod
+    def _start_refresher(cls, app):
+        if cls._refresher is not None:
+            return
+        with cls._build_lock:
+            if cls._refresher is None:
+                cls._refresher = threading.Thread(
+                    target=cls._refresh_loop, args=(app,),
+                    name="quick-search-refresh", daemon=True,
+                )
+                cls._refresher.start()
+
+    @classmethod
+    def _refresh_loop(cls, app):
+        while True:
+            time.sleep(cls._refresh)
+            if cls._built_at is None:
+                continue
+            with app.app_context():
+                try:
+                    with cls._build_lock:
+                        cls.rebuild()
+                except Exception:
+                    db.session.rollback()
+                    app.logger.exception("Quick search index refresh failed")
+                finally:
+                    db.session.remove()
+
+    # -- Queries ------------------------------------------------------------
+
+    @classmethod
+    def search(cls, user, q, limit=10, kinds=None):
+        """Top ``limit`` names matching every word of ``q`` as a prefix.
+
+        Returns ``[(kind, id, name)]`` restricted to what ``user`` can open:
+        all licenses and applications, own folders, and own or shared secrets
+        (everything for admins). With no prefix match at all, falls back to
+        trigram similarity so typos still find something.
+        """
+        terms = list(dict.fromkeys(tokenize(q)))
+        if not terms:
+            return []
+        cls._ensure_built()
+        access = AccessService.context(user)
+
+        candidates = {}
+        drivers = {}
+        for kind in QUICK_SEARCH_KINDS:
+            if kinds and kind not in kinds:
+                continue
+            drivers[kind], found = cls._scan(kind, terms, access)
+            candidates.update(((kind, ref_id), entry) for ref_id, entry in found.items())
+
+        similarity = {}
+        if not candidates:
+            entries = cls._entries
+            for kind in FUZZY_FIELDS:
+                if kinds and kind not in kinds:
+                    continue
+                fuzzy = []
+                for ref_id, score in FuzzySearchService.matches(kind, q):
+                    entry = entries.get((kind, ref_id))
+                    if entry is not None:
+                        fuzzy.append((ref_id, entry))
+                        similarity[(kind, ref_id)] = score
+                candidates.update(
+                    ((kind, ref_id), entry) for ref_id, entry in cls._visible(kind, fuzzy, access)
+                )
+
+        needle = q.strip().casefold()
+        ranked = []
+        for (kind, ref_id), entry in candidates.items():
+            name = entry.folded
+            if similarity:
+                tier = 3
+            elif name.startswith(needle):
+                tier = 0
+            else:
+                tier = 1 if entry.tokens[0].startswith(drivers[kind]) else 2
+            rank = (tier, -similarity.get((kind, ref_id), 0.0), len(name), name)
+            ranked.append((rank, kind, ref_id, entry.name))
+        return [(kind, ref_id, name) for _, kind, ref_id, name in heapq.nsmallest(limit, ranked)]
+
+    @classmethod
+    def _scan(cls, kind, terms, access):
+        """Up to QUICK_SEARCH_SCAN_LIMIT entries of ``kind`` that match every
+        term and that ``access`` may open, as ``(driving term, {id: entry})``.
+
+        The scan is driven by the term with the fewest keys; the other terms
+        are checked against each entry's token string. Keys are read under the
+        lock a chunk at a time, so shares are resolved outside it and the
+        limit counts only visible matches.
+        """
+        with cls._lock:
+            keys = cls._keys.get(kind, [])
+            first = min(terms, key=lambda term: (
+                bisect.bisect_left(keys, (term + _PREFIX_END,))
+                - bisect.bisect_left(keys, (term,))
+            ))
+        rest = [" " + term for term in terms if term != first]
+        low, high = (first,), (first + _PREFIX_END,)
+        found = {}
+        while len(found) < cls._scan_limit:
+            with cls._lock:
+                keys, entries = cls._keys.get(kind, []), cls._entries
+                position = bisect.bisect_right(keys, low)
+                chunk = keys[position:position + cls._scan_limit]
+            matched = []
+            exhausted = len(chunk) < cls._scan_limit
+            for key in chunk:
+                if key >= high:
+                    exhausted = True
+                    break
+                low = key
+                entry = entries.get((kind, key[1]))
+                if entry is not None and key[1] not in found and all(
+                    term in entry.text for term in rest
+                ):
+                    matched.append((key[1], entry))
+            for ref_id, entry in cls._visible(kind, matched, access):
+                found[ref_id] = entry
+                if len(found) >= cls._scan_limit:
+                    break
+            if exhausted:
+                break
+        return first, found
+
+    @staticmethod
+    def _visible(kind, matches, access):
+        """The ``(id, entry)`` pairs of ``matches`` that ``access`` may open."""
+        if access.is_admin():
+            return matches
+        access.prefetch(
+            ref_id for ref_id, entry in matches
+            if kind == "secrets" and entry.owner_id not in (None, access.user_id)
+        )
+        return [
+            (ref_id, entry) for ref_id, entry in matches
+            if entry.owner_id in (None, access.user_id)
+            or (kind == "secrets" and access.can_access(ref_id))
+        ]
+
+    @classmethod
+    def stats(cls):
+        with cls._lock:
+            keys = [key for kind_keys in cls._keys.values() for key in kind_keys]
+            entries = cls._entries
+            memory = sum(sys.getsizeof(kind_keys) for kind_keys in cls._keys.values())
+            memory += sys.getsizeof(entries)
+            memory += sum(sys.getsizeof(key) + sys.getsizeof(key[0]) for key in keys)
+            memory += sum(sys.getsizeof(e) + sys.getsizeof(e.name) + sys.getsizeof(e.folded)
+                          + sys.getsizeof(e.tokens) + sys.getsizeof(e.text)
+                          for e in entries.values())
+            return {
+                "built": cls._built_at is not None,
+                "entries": len(entries),
+                "keys": len(keys),
+                "entries_by_kind": dict(Counter(kind for kind, _ in entries)),
+                "memory_bytes": memory,
+                **cls._stats,
+            }
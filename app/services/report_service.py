@@ -0,0 +1,246 @@
+import threading
+import time
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import case, extract, func, insert, literal, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models.license import License
+from app.models.license_rollup import LicenseRenewalRollup, LicenseSpendRollup
+
+SPEND_GROUPS = ("vendor", "department", "currency")
+
+_ZERO = Decimal("0")
+
+
+class ReportService:
+    """License spend and renewal analytics served from rollup tables.
+
+    The rollups hold one row per (vendor, department, currency) and per
+    (year, month, currency). LicenseService applies each license change as a
+    delta (subtract the old contribution, add the new one), so reports never
+    scan ``licenses``; :meth:`refresh_all` rebuilds both tables with GROUP BY
+    queries (``flask reports-refresh``) to repair any drift from writes made
+    outside the service. Report results are cached per process for
+    REPORT_CACHE_SECONDS and dropped whenever a delta is applied.
+    """
+
+    _cache = {}
+    _cache_seconds = 60
+    _version = 0
+    _lock = threading.Lock()
+
+    @classmethod
+    def init_app(cls, app):
+        cls._cache_seconds = app.config["REPORT_CACHE_SECONDS"]
+        cls._cache = {}
+
+    # -- Maintenance --------------------------------------------------------
+
+    @staticmethod
+    def snapshot(lic):
+        """Capture the fields a license contributes to the rollups."""
+        if lic is None:
+            return None
+        return {
+            "vendor": lic.vendor or "",
+            "department": lic.department or "",
+            "currency": lic.currency or "",
+            "cost": Decimal(str(lic.cost or 0)),
+            "is_active": bool(lic.is_active if lic.is_active is not None else True),
+            "expiration_date": lic.expiration_date,
+        }
+
+    @classmethod
+    def apply_change(cls, before, after):
+        """Move the rollups from snapshot ``before`` to ``after``.
+
+        Either may be ``None`` (create / delete). Runs in the caller's
+        transaction.
+        """
+        spend = defaultdict(lambda: [0, _ZERO, 0, _ZERO])
+        renewals = defaultdict(lambda: [0, _ZERO])
+        for snap, sign in ((before, -1), (after, 1)):
+            if snap is None:
+                continue
+            row = spend[(snap["vendor"], snap["department"], snap["currency"])]
+            row[0] += sign
+            row[1] += sign * snap["cost"]
+            if snap["is_active"]:
+                row[2] += sign
+                row[3] += sign * snap["cost"]
+                expires = snap["expiration_date"]
+                if expires is not None:
+                    bucket = renewals[(expires.year, expires.month, snap["currency"])]
+                    bucket[0] += sign
+                    bucket[1] += sign * snap["cost"]
+
+        for (vendor, department, currency), (count, cost, active, active_cost) in spend.items():
+            if count or cost or active or active_cost:
+                cls._add(
+                    LicenseSpendRollup,
+                    {"vendor": vendor, "department": department, "currency": currency},
+                    {"license_count": count, "total_cost": cost,
+                     "active_count": active, "active_cost": active_cost},
+                )
+        for (year, month, currency), (count, cost) in renewals.items():
+            if count or cost:
+                cls._add(
+                    LicenseRenewalRollup,
+                    {"year": year, "month": month, "currency": currency},
+                    {"license_count": count, "total_cost": cost},
+                )
+        cls._invalidate()
+
+    @staticmethod
+    def _add(model, key, deltas):
+        """Increment one rollup row, creating it on first use."""
+        where = [getattr(model, column) == value for column, value in key.items()]
+        values = {column: getattr(model, column) + delta for column, delta in deltas.items()}
+        stmt = update(model).where(*where).values(**values).execution_options(
+            synchronize_session=False
+        )
+        if db.session.execute(stmt).rowcount:
+            return
+        try:
+            with db.session.begin_nested():
+                db.session.execute(insert(model).values(**key, **deltas))
+        except IntegrityError:
+            # Another transaction created the row first; add to it instead.
+            db.session.execute(stmt)
+
+    @classmethod
+    def refresh_all(cls):
+        """Rebuild both rollup tables from ``licenses``. Commits."""
+        vendor = func.coalesce(License.vendor, "")
+        department = func.coalesce(License.department, "")
+        currency = func.coalesce(License.currency, "")
+        cost = func.coalesce(License.cost, 0)
+        active = License.is_active == True
+
+        db.session.query(LicenseSpendRollup).delete(synchronize_session=False)
+        db.session.execute(
+            insert(LicenseSpendRollup).from_select(
+                ["vendor", "department", "currency", "license_count", "total_cost",
+                 "active_count", "active_cost"],
+                select(
+                    vendor, department, currency,
+                    func.count(License.id),
+                    func.sum(cost),
+                    func.sum(case((active, 1), else_=0)),
+                    func.sum(case((active, cost), else_=literal(0))),
+                ).group_by(vendor, department, currency),
+            )
+        )
+
+        year = extract("year", License.expiration_date)
+        month = extract("month", License.expiration_date)
+        db.session.query(LicenseRenewalRollup).delete(synchronize_session=False)
+        db.session.execute(
+            insert(LicenseRenewalRollup).from_select(
+                ["year", "month", "currency", "license_count", "total_cost"],
+                select(year, month, currency, func.count(License.id), func.sum(cost))
+                .where(active, License.expiration_date.isnot(None))
+                .group_by(year, month, currency),
+            )
+        )
+        db.session.commit()
+        cls._invalidate()
+
+    @classmethod
+    def _invalidate(cls):
+        with cls._lock:
+            cls._version += 1
+            cls._cache = {}
+
+    @classmethod
+    def _cached(cls, key, build):
+        now = time.monotonic()
+        with cls._lock:
+            hit = cls._cache.get(key)
+            version = cls._version
+        if hit and hit[0] == version and now - hit[1] < cls._cache_seconds:
+            return hit[2]
+        value = build()
+        with cls._lock:
+            if cls._version == version:
+                cls._cache[key] = (version, now, value)
+        return value
+
+    # -- Reports ------------------------------------------------------------
+
+    @classmethod
+    def spend(cls, group_by=("vendor",)):
+        """Spend rows grouped by any of vendor/department (always per currency).
+
+        Returns dicts with the group columns plus license_count, total_cost,
+        active_count and active_cost, largest total first.
+        """
+        groups = [g for g in SPEND_GROUPS if g in group_by or g == "currency"]
+
+        def build():
+            columns = [getattr(LicenseSpendRollup, g) for g in groups]
+            totals = (
+                func.sum(LicenseSpendRollup.license_count),
+                func.sum(LicenseSpendRollup.total_cost),
+                func.sum(LicenseSpendRollup.active_count),
+                func.sum(LicenseSpendRollup.active_cost),
+            )
+            rows = (
+                db.session.query(*columns, *totals)
+                .group_by(*columns)
+                .having(func.sum(LicenseSpendRollup.license_count) > 0)
+                .order_by(totals[1].desc(), *columns)
+            )
+            return [
+                {
+                    **dict(zip(groups, row[:len(groups)])),
+                    "license_count": int(row[-4]),
+                    "total_cost": Decimal(row[-3] or 0).quantize(Decimal("0.01")),
+                    "active_count": int(row[-2] or 0),
+                    "active_cost": Decimal(row[-1] or 0).quantize(Decimal("0.01")),
+                }
+                for row in rows
+            ]
+
+        return cls._cached(("spend", tuple(groups)), build)
+
+    @classmethod
+    def renewals(cls, start=None, months=12):
+        """Active licenses expiring per month from ``start`` (a date; default
+        this month) for ``months`` months, per currency."""
+        start = (start or date.today()).replace(day=1)
+        end_index = start.year * 12 + start.month - 1 + months
+
+        def build():
+            bucket = LicenseRenewalRollup.year * 12 + LicenseRenewalRollup.month - 1
+            rows = (
+                db.session.query(
+                    LicenseRenewalRollup.year,
+                    LicenseRenewalRollup.month,
+                    LicenseRenewalRollup.currency,
+                    LicenseRenewalRollup.license_count,
+                    LicenseRenewalRollup.total_cost,
+                )
+                .filter(
+                    bucket >= start.year * 12 + start.month - 1,
+                    bucket < end_index,
+                    LicenseRenewalRollup.license_count > 0,
+                )
+                .order_by(LicenseRenewalRollup.year, LicenseRenewalRollup.month,
+                          LicenseRenewalRollup.currency)
+            )
+            return [
+                {
+                    "month": f"{year:04d}-{month:02d}",
+                    "currency": currency,
+                    "license_count": count,
+                    "total_cost": Decimal(cost or 0).quantize(Decimal("0.01")),
+                }
+                for year, month, currency, count, cost in rows
+            ]
+
+        return cls._cached(("renewals", start, months), build)
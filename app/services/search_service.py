@@ -0,0 +1,422 @@
+import bisect
+import re
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+
+from sqlalchemy import Float, Integer, case, false, inspect, select, text
+
+from app import db
+from app.models.application import Application
+from app.models.license import License
+from app.models.secret import Secret
+from app.models.user import User
+from app.services.fuzzy_search_service import FuzzySearchService
+
+# kind -> (model, indexed columns). The first column is the primary one and
+# is weighted above the rest when ranking.
+INDEXED_FIELDS = {
+    "secrets": (Secret, ("name", "description", "url_domain")),
+    "licenses": (License, ("name", "vendor", "description", "department")),
+    "applications": (Application, ("name", "server_name", "ip_address", "description",
+                                   "responsible_person", "department")),
+    "users": (User, ("username", "full_name", "email")),
+}
+_KIND_BY_MODEL = {model: kind for kind, (model, _) in INDEXED_FIELDS.items()}
+
+PRIMARY_WEIGHT = 10.0
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+def tokenize(value):
+    """Split text into case-folded, accent-stripped alphanumeric tokens.
+
+    Documents and queries go through the same function on every backend, so
+    an email like ``jane.doe@corp.local`` matches a search for ``doe`` whether
+    the index is FTS5, tsvector or in memory.
+    """
+    if not value:
+        return []
+    decomposed = unicodedata.normalize("NFKD", str(value).casefold())
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _TOKEN_RE.findall(stripped)
+
+
+def _document(obj, fields):
+    return [" ".join(tokenize(getattr(obj, field, None))) for field in fields]
+
+
+class _SQLiteBackend:
+    name = "sqlite-fts5"
+
+    @staticmethod
+    def table(kind):
+        return f"search_{kind}"
+
+    def create(self, conn, kind, fields):
+        conn.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table(kind)} "
+            f"USING fts5({', '.join(fields)}, tokenize='unicode61 remove_diacritics 2')"
+        ))
+
+    def clear(self, conn, kind, fields):
+        conn.execute(text(f"DELETE FROM {self.table(kind)}"))
+
+    def upsert(self, conn, kind, fields, rows):
+        table = self.table(kind)
+        conn.execute(
+            text(f"DELETE FROM {table} WHERE rowid = :id"), [{"id": r[0]} for r in rows]
+        )
+        placeholders = ", ".join(f":f{i}" for i in range(len(fields)))
+        conn.execute(
+            text(f"INSERT INTO {table} (rowid, {', '.join(fields)}) VALUES (:id, {placeholders})"),
+            [{"id": r[0], **{f"f{i}": v for i, v in enumerate(r[1])}} for r in rows],
+        )
+
+    def delete(self, conn, kind, ref_id):
+        conn.execute(text(f"DELETE FROM {self.table(kind)} WHERE rowid = :id"), {"id": ref_id})
+
+    def hits(self, kind, fields, terms):
+        table = self.table(kind)
+        weights = ", ".join([str(PRIMARY_WEIGHT)] + ["1.0"] * (len(fields) - 1))
+        match = " ".join(f'"{term}"*' for term in terms)
+        return (
+            text(
+                f"SELECT rowid AS ref_id, bm25({table}, {weights}) AS score "
+                f"FROM {table} WHERE {table} MATCH :match"
+            )
+            .bindparams(match=match)
+            .columns(ref_id=Integer, score=Float)
+            .subquery("search_hits")
+        )
+
+
+class _PostgresBackend:
+    name = "postgresql-tsvector"
+
+    @staticmethod
+    def table(kind):
+        return f"search_{kind}"
+
+    def create(self, conn, kind, fields):
+        table = self.table(kind)
+        conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {table} "
+            f"(ref_id INTEGER PRIMARY KEY, document TSVECTOR NOT NULL)"
+        ))
+        conn.execute(text(
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_document ON {table} USING GIN (document)"
+        ))
+
+    def clear(self, conn, kind, fields):
+        conn.execute(text(f"TRUNCATE {self.table(kind)}"))
+
+    def upsert(self, conn, kind, fields, rows):
+        conn.execute(
+            text(
+                f"INSERT INTO {self.table(kind)} (ref_id, document) VALUES (:id, "
+                f"setweight(to_tsvector('simple', :primary), 'A') || "
+                f"setweight(to_tsvector('simple', :rest), 'B')) "
+                f"ON CONFLICT (ref_id) DO UPDATE SET document = EXCLUDED.document"
+            ),
+            [{"id": r[0], "primary": r[1][0], "rest": " ".join(r[1][1:])} for r in rows],
+        )
+
+    def delete(self, conn, kind, ref_id):
+        conn.execute(text(f"DELETE FROM {self.table(kind)} WHERE ref_id = :id"), {"id": ref_id})
+
+    def hits(self, kind, fields, terms):
+        table = self.table(kind)
+        return (
+            text(
+                f"SELECT ref_id, -ts_rank(document, q) AS score "
+                f"FROM {table}, to_tsquery('simple', :query) q "
+                f"WHERE document @@ q"
+            )
+            .bindparams(query=" & ".join(f"{term}:*" for term in terms))
+            .columns(ref_id=Integer, score=Float)
+            .subquery("search_hits")
+        )
+
+
+class _MemoryIndex:
+    """Inverted index for one kind: token -> {id: weight}, prefix lookup via bisect."""
+
+    def __init__(self):
+        self.postings = defaultdict(dict)
+        self.documents = {}
+        self.loaded_at = time.monotonic()
+        self._vocabulary = None
+
+    def put(self, ref_id, columns):
+        self.remove(ref_id)
+        weights = {}
+        for position, column in enumerate(columns):
+            weight = PRIMARY_WEIGHT if position == 0 else 1.0
+            for token in column.split():
+                weights[token] = weights.get(token, 0.0) + weight
+        for token, weight in weights.items():
+            self.postings[token][ref_id] = weight
+        self.documents[ref_id] = tuple(weights)
+        self._vocabulary = None
+
+    def remove(self, ref_id):
+        for token in self.documents.pop(ref_id, ()):
+            posting = self.postings.get(token)
+            if posting is not None:
+                posting.pop(ref_id, None)
+                if not posting:
+                    del self.postings[token]
+        self._vocabulary = None
+
+    def search(self, terms, limit):
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        vocabulary = self._vocabulary
+        scores = None
+        for term in terms:
+            matched = {}
+            position = bisect.bisect_left(vocabulary, term)
+            while position < len(vocabulary) and vocabulary[position].startswith(term):
+                token = vocabulary[position]
+                position += 1
+                for ref_id, weight in self.postings[token].items():
+                    if weight > matched.get(ref_id, 0.0):
+                        matched[ref_id] = weight
+            if scores is None:
+                scores = matched
+            else:
+                scores = {i: s + matched[i] for i, s in scores.items() if i in matched}
+            if not scores:
+                return []
+        ranked = sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))
+        return [ref_id for ref_id, _ in ranked[:limit]]
+
+
+class SearchService:
+    """Ranked full-text search over secrets, licenses, applications and users.
+
+    The backend follows the database dialect: FTS5 virtual tables on SQLite,
+    tsvector + GIN tables on PostgreSQL, and a per-process inverted index for
+    anything else. The ``search_<kind>`` tables are derived data owned by this
+    service: they are created and filled on first use, kept current by the
+    create/update/delete paths calling :meth:`index` / :meth:`remove`, and can
+    be rebuilt at any time with ``flask search-rebuild``.
+    """
+
+    _mode = "auto"
+    _max_results = 1000
+    _memory_refresh = 300
+    _backend = None
+    _backend_for = None
+    _tables = set()
+    _memory = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def init_app(cls, app):
+        cls._mode = app.config["SEARCH_BACKEND"]
+        cls._max_results = app.config["SEARCH_MAX_RESULTS"]
+        cls._memory_refresh = app.config["SEARCH_MEMORY_REFRESH_SECONDS"]
+        cls.reset()
+
+    @classmethod
+    def reset(cls):
+        cls._backend = None
+        cls._backend_for = None
+        cls._tables = set()
+        cls._memory = {}
+
+    @classmethod
+    def backend(cls):
+        """Return the active backend, or ``None`` for the in-memory index."""
+        engine = db.engine
+        if cls._backend_for is engine:
+            return cls._backend
+        backend = None
+        if cls._mode == "auto":
+            if engine.dialect.name == "sqlite":
+                backend = _SQLiteBackend() if cls._fts5_available() else None
+            elif engine.dialect.name == "postgresql":
+                backend = _PostgresBackend()
+        cls._backend, cls._backend_for = backend, engine
+        return backend
+
+    @staticmethod
+    def _fts5_available():
+        rows = db.session.connection().exec_driver_sql("PRAGMA compile_options")
+        return "ENABLE_FTS5" in {row[0] for row in rows}
+
+    @classmethod
+    def backend_name(cls):
+        if cls._mode == "off":
+            return "off"
+        backend = cls.backend()
+        return backend.name if backend else "memory"
+
+    # -- Writes -------------------------------------------------------------
+
+    @classmethod
+    def index(cls, obj):
+        """Add or refresh one row. Call after flush, before commit."""
+        cls.index_many([obj])
+
+    @classmethod
+    def index_many(cls, objects):
+        by_kind = defaultdict(list)
+        for obj in objects:
+            kind = _KIND_BY_MODEL[type(obj)]
+            by_kind[kind].append((obj.id, _document(obj, INDEXED_FIELDS[kind][1])))
+        for kind, rows in by_kind.items():
+            cls._write(kind, rows)
+
+    @classmethod
+    def index_records(cls, kind, records):
+        """Like :meth:`index_many` for plain dicts (with ``id``) written by
+        bulk statements, without building ORM objects."""
+        fields = INDEXED_FIELDS[kind][1]
+        cls._write(kind, [
+            (record["id"], [" ".join(tokenize(record.get(field))) for field in fields])
+            for record in records
+        ])
+
+    @classmethod
+    def remove(cls, kind, ref_id):
+        if cls._mode == "off":
+            return
+        backend = cls.backend()
+        if backend is None:
+            index = cls._memory.get(kind)
+            if index is not None:
+                with cls._lock:
+                    index.remove(ref_id)
+        elif cls._table_exists(kind):
+            backend.delete(db.session, kind, ref_id)
+
+    @classmethod
+    def _write(cls, kind, rows):
+        if cls._mode == "off":
+            return
+        backend = cls.backend()
+        if backend is None:
+            # Not loaded yet: the first search reads this row from the table.
+            index = cls._memory.get(kind)
+            if index is not None:
+                with cls._lock:
+                    for ref_id, columns in rows:
+                        index.put(ref_id, columns)
+        elif cls._table_exists(kind):
+            # A missing table is built from scratch (including these rows) on
+            # the first search, so there is nothing to do until then.
+            backend.upsert(db.session, kind, INDEXED_FIELDS[kind][1], rows)
+
+    @classmethod
+    def _table_exists(cls, kind):
+        if kind in cls._tables:
+            return True
+        if inspect(db.session.connection()).has_table(f"search_{kind}"):
+            cls._tables.add(kind)
+            return True
+        return False
+
+    # -- Rebuild ------------------------------------------------------------
+
+    @classmethod
+    def rebuild(cls, kind=None, batch_size=1000):
+        """Recreate the index for one kind (or all) from the source tables.
+
+        Returns ``{kind: rows_indexed}``. Each kind is committed on its own
+        connection.
+        """
+        kinds = [kind] if kind else list(INDEXED_FIELDS)
+        return {name: cls._build(name, batch_size) for name in kinds}
+
+    @classmethod
+    def _rows(cls, conn, kind, batch_size):
+        model, fields = INDEXED_FIELDS[kind]
+        columns = [getattr(model, field) for field in fields]
+        query = select(model.id, *columns).order_by(model.id)
+        for row in conn.execute(query.execution_options(yield_per=batch_size)):
+            yield row[0], [" ".join(tokenize(value)) for value in row[1:]]
+
+    @classmethod
+    def _build(cls, kind, batch_size):
+        # SQL backends build in a transaction of their own, so the lazy build
+        # on a first search never commits whatever the request has pending.
+        backend = cls.backend()
+        if backend is None:
+            index = _MemoryIndex()
+            count = 0
+            for ref_id, columns in cls._rows(db.session, kind, batch_size):
+                index.put(ref_id, columns)
+                count += 1
+            with cls._lock:
+                cls._memory[kind] = index
+            return count
+
+        fields = INDEXED_FIELDS[kind][1]
+        with db.engine.begin() as conn:
+            backend.create(conn, kind, fields)
+            backend.clear(conn, kind, fields)
+            rows = list(cls._rows(conn, kind, batch_size))
+            for start in range(0, len(rows), batch_size):
+                backend.upsert(conn, kind, fields, rows[start:start + batch_size])
+        cls._tables.add(kind)
+        return len(rows)
+
+    # -- Queries ------------------------------------------------------------
+
+    @classmethod
+    def hits(cls, kind, q):
+        """Ranked matches for ``q``.
+
+        Returns a ``(ref_id, score)`` subquery on SQL backends (lower score is
+        better), the best SEARCH_MAX_RESULTS ids for the in-memory index, or ``None`` when full-text search does not
+        apply (disabled, or ``q`` has no indexable tokens).
+        """
+        if cls._mode == "off":
+            return None
+        terms = tokenize(q)
+        if not terms:
+            return None
+        backend = cls.backend()
+        if backend is None:
+            index = cls._memory.get(kind)
+            if index is None or time.monotonic() - index.loaded_at > cls._memory_refresh:
+                cls._build(kind, 1000)
+                index = cls._memory[kind]
+            with cls._lock:
+                return index.search(terms, cls._max_results)
+        if not cls._table_exists(kind):
+            cls._build(kind, 1000)
+        return backend.hits(kind, INDEXED_FIELDS[kind][1], terms)
+
+    @staticmethod
+    def _no_hits(hits):
+        if isinstance(hits, list):
+            return not hits
+        return db.session.query(hits.c.ref_id).limit(1).first() is None
+
+    @classmethod
+    def apply(cls, query, kind, q):
+        """Restrict ``query`` to matches for ``q``, best match first.
+
+        When nothing in the index matches, trigram similarity is tried so a
+        typo still finds the record. Returns ``None`` when the caller should
+        fall back to its LIKE filter.
+        """
+        hits = cls.hits(kind, q)
+        if hits is None:
+            return None
+        model = INDEXED_FIELDS[kind][0]
+        if cls._no_hits(hits):
+            fuzzy = FuzzySearchService.matches(kind, q)
+            if fuzzy:
+                hits = [ref_id for ref_id, _ in fuzzy]
+        if isinstance(hits, list):
+            if not hits:
+                return query.filter(false())
+            order = case({ref_id: pos for pos, ref_id in enumerate(hits)}, value=model.id)
+            return query.filter(model.id.in_(hits)).order_by(order)
+        return query.join(hits, hits.c.ref_id == model.id).order_by(hits.c.score)
@@ -1,12 +1,14 @@
-from datetime import datetime, timezone
-
 from sqlalchemy import or_
 
 from app import db
 from app.models.secret import Secret
-from app.models.share import SecretShare
 from app.models.tag import Tag
+from app.services.access_service import AccessService
 from app.services.audit_service import AuditService
+from app.services.breach_service import BreachService
+from app.services.hygiene_service import HygieneService
+from app.services.search_service import SearchService
+from app.services.share_service import ShareService
 
 
 class SecretService:
@@ -15,27 +17,27 @@ class SecretService:
                                favorites_only=False, shared_only=False,
                                page=1, per_page=25):
         """Get secrets the user can access (own + shared)."""
-        # Base query: user's own secrets
-        own_query = Secret.query.filter(Secret.owner_id == user.id)
-
-        # Shared secrets
-        shared_query = Secret.query.join(SecretShare).filter(
-            or_(
-                SecretShare.user_id == user.id,
-                SecretShare.group_id.in_([g.id for g in user.groups]),
-            ),
-            or_(
-                SecretShare.expires_at.is_(None),
-                SecretShare.expires_at > datetime.now(timezone.utc),
-            ),
+        query = SecretService.accessible_query(
+            user, folder_id=folder_id, category=category, q=q,
+            favorites_only=favorites_only, shared_only=shared_only,
+        )
+        return query.order_by(Secret.created_at.desc()).paginate(
+            page=page, per_page=per_page, error_out=False
         )
 
+    @staticmethod
+    def accessible_query(user, folder_id=None, category=None, q=None,
+                         favorites_only=False, shared_only=False):
+        """Unpaginated query behind :meth:`get_accessible_secrets`."""
+        # Shared secrets: explicit shares plus everything under a shared folder
+        shared = ShareService.shared_secret_filter(user)
+
         if shared_only:
-            query = shared_query
+            query = Secret.query.filter(shared)
         elif user.is_admin():
             query = Secret.query
         else:
-            query = own_query.union(shared_query)
+            query = Secret.query.filter(or_(Secret.owner_id == user.id, shared))
 
         # Apply filters
         if folder_id is not None:
@@ -44,7 +46,10 @@ class SecretService:
             query = query.filter(Secret.category == category)
         if favorites_only:
             query = query.filter(Secret.is_favorite.is_(True))
-        if q:
+        ranked = SearchService.apply(query, "secrets", q) if q else None
+        if ranked is not None:
+            query = ranked
+        elif q:
             search = f"%{q}%"
             query = query.filter(
                 or_(
@@ -53,10 +58,7 @@ class SecretService:
                     Secret.url_domain.ilike(search),
                 )
             )
-
-        return query.order_by(Secret.created_at.desc()).paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        return query
 
     @staticmethod
     def create_secret(user, name, category, username=None, password=None,
@@ -88,7 +90,10 @@ class SecretService:
                 secret.tags.append(tag)
 
         db.session.add(secret)
+        db.session.flush()
+        SearchService.index(secret)
         db.session.commit()
+        HygieneService.invalidate()
 
         AuditService.log(
             action="secret_created",
@@ -101,6 +106,13 @@ class SecretService:
 
         return secret
 
+    @staticmethod
+    def password_warnings(password):
+        """Warnings to show after saving ``password`` (it is saved regardless)."""
+        if BreachService.is_breached(password):
+            return ["This password appears in a known data breach. Consider changing it."]
+        return []
+
     @staticmethod
     def update_secret(secret, **kwargs):
         """Update a secret's fields."""
@@ -122,7 +134,9 @@ class SecretService:
                     db.session.add(tag)
                 secret.tags.append(tag)
 
+        SearchService.index(secret)
         db.session.commit()
+        HygieneService.invalidate()
 
         AuditService.log(
             action="secret_updated",
@@ -146,8 +160,10 @@ class SecretService:
             resource_id=secret.id,
             resource_name=secret.name,
         )
+        SearchService.remove("secrets", secret.id)
         db.session.delete(secret)
         db.session.commit()
+        HygieneService.invalidate()
 
     @staticmethod
     def log_view(secret, user):
@@ -176,25 +192,4 @@ class SecretService:
     @staticmethod
     def can_user_access(secret, user, require_write=False):
         """Check if user can access this secret."""
-        if user.is_admin():
-            return True
-        if secret.owner_id == user.id:
-            return True
-
-        share = SecretShare.query.filter(
-            SecretShare.secret_id == secret.id,
-            or_(
-                SecretShare.user_id == user.id,
-                SecretShare.group_id.in_([g.id for g in user.groups]),
-            ),
-            or_(
-                SecretShare.expires_at.is_(None),
-                SecretShare.expires_at > datetime.now(timezone.utc),
-            ),
-        ).first()
-
-        if not share:
-            return False
-        if require_write and share.permission != "write":
-            return False
-        return True
+        return AccessService.context(user).can_access(secret, require_write=require_write)
@@ -0,0 +1,460 @@
+import os
+import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, insert, select
+
+from app import db
+from app.models.application import Application
+from app.models.audit_log import AuditLog
+from app.models.folder import Folder
+from app.models.group import Group, user_groups
+from app.models.license import License, LicenseAssignment
+from app.models.secret import Secret
+from app.models.share import SecretShare
+from app.models.tag import Tag, secret_tags
+from app.models.user import User
+from app.services.application_service import (
+    CRITICALITY_CHOICES,
+    DEPLOYMENT_CHOICES,
+    PLATFORM_CHOICES,
+    SLA_CHOICES,
+)
+from app.services.license_service import LICENSE_TYPES, LicenseService
+from app.services.report_service import ReportService
+
+# Counts generated at --scale 1.0
+DEFAULT_COUNTS = {
+    "users": 500,
+    "groups": 40,
+    "folders": 1000,
+    "secrets": 20000,
+    "licenses": 1000,
+    "applications": 2000,
+    "audit_logs": 200000,
+}
+
+_DEPARTMENTS = [
+    "IT", "Finance", "HR", "Sales", "Marketing", "Operations", "Legal",
+    "Engineering", "Support", "Security", "Procurement", "Logistics",
+]
+_VENDORS = [
+    "Microsoft", "Oracle", "Adobe", "Atlassian", "JetBrains", "VMware",
+    "Red Hat", "Cisco", "SAP", "Autodesk", "Salesforce", "Veeam",
+]
+_PRODUCTS = [
+    "Office", "Database", "Creative Cloud", "Jira", "IntelliJ", "vSphere",
+    "Enterprise Linux", "AnyConnect", "ERP", "AutoCAD", "CRM", "Backup",
+]
+_SYSTEMS = [
+    "jenkins", "gitlab", "oracle", "mssql", "postgres", "redis", "kafka",
+    "grafana", "vcenter", "sap", "exchange", "sharepoint", "nexus", "vault",
+]
+_ENVS = ["prod", "test", "dev", "uat", "dr"]
+_CATEGORIES = ["credential", "url", "api_key", "certificate", "note",
+               "database", "ssh_key", "other"]
+_ACTIONS = ["login", "logout", "secret_viewed", "password_copied",
+            "secret_created", "secret_updated", "license_assigned",
+            "application_updated", "login_failed"]
+_ALPHABET = "abcdefghijkmnopqrstuvwxyzABCDEFGHJKLMNPQRSTUVWXYZ23456789!@#$%^&*"
+
+
+def _init_worker(instance_path, record_version):
+    from app.services.encryption_service import EncryptionService
+
+    EncryptionService.initialize(instance_path, record_version=record_version)
+
+
+def _encrypt_secret_chunk(records):
+    """Encrypt the sensitive fields of generated secrets (runs in workers)."""
+    import json
+
+    from app.services.encryption_service import EncryptionService
+    from app.services.hygiene_service import HygieneService
+
+    encrypted = []
+    for record in records:
+        fingerprint, score = HygieneService.assess(record["password"])
+        hygiene = {"password_fingerprint": fingerprint, "password_score": score}
+        if EncryptionService.record_version == 2:
+            encrypted.append({
+                **hygiene,
+                "encryption_version": 2,
+                "encrypted_blob": EncryptionService.encrypt_record(
+                    record, Secret._RECORD_CONTEXT
+                ),
+            })
+            continue
+
+        row = {**hygiene, "encryption_version": 1}
+        for field, value in record.items():
+            if field == "extra_data":
+                value = json.dumps(value) if value else None
+            row[f"encrypted_{field}"] = (
+                EncryptionService.encrypt(value) if value else None
+            )
+        encrypted.append(row)
+    return encrypted
+
+
+class PerfSeeder:
+    """Generate a large, realistic vault for performance work.
+
+    All generated values derive from ``seed``, so two runs with the same
+    arguments produce the same data (ciphertexts differ only by nonce).
+    Rows are written with executemany Core inserts and the sensitive secret
+    fields are encrypted in a process pool.
+    """
+
+    def __init__(self, instance_path, seed=42, scale=1.0, counts=None,
+                 batch_size=5000, workers=None, record_version=2, echo=print):
+        self.instance_path = instance_path
+        self.seed = seed
+        self.batch_size = batch_size
+        self.workers = workers
+        self.record_version = record_version
+        self.echo = echo
+        self.counts = {
+            name: int(count * scale) for name, count in DEFAULT_COUNTS.items()
+        }
+        self.counts.update({k: v for k, v in (counts or {}).items() if v is not None})
+        self.now = datetime(2026, 1, 1)
+
+        self.user_ids = []
+        self.usernames = []
+        self.group_ids = []
+        self.folders_by_owner = {}
+        self.tag_ids = []
+
+    def _rng(self, kind):
+        return random.Random(f"{self.seed}:{kind}")
+
+    def run(self):
+        self.seed_users_and_groups()
+        self.seed_folders()
+        self.seed_tags()
+        self.seed_secrets()
+        self.seed_licenses()
+        self.seed_applications()
+        self.seed_audit_logs()
+        return self.counts
+
+    # --- helpers ---
+
+    def _bulk_insert(self, model_or_table, rows, return_ids=True):
+        """Insert rows and return their new primary keys in insert order."""
+        table = getattr(model_or_table, "__table__", model_or_table)
+        if not rows:
+            return []
+        if not return_ids or "id" not in table.c:
+            db.session.execute(insert(table), rows)
+            return []
+
+        max_before = db.session.scalar(select(func.max(table.c.id))) or 0
+        db.session.execute(insert(table), rows)
+        return list(db.session.scalars(
+            select(table.c.id).where(table.c.id > max_before).order_by(table.c.id)
+        ))
+
+    def _chunks(self, total):
+        for start in range(0, total, self.batch_size):
+            yield start, min(self.batch_size, total - start)
+
+    def _date_between(self, rng, days_back, days_forward=0):
+        offset = rng.uniform(-days_back, days_forward)
+        return self.now + timedelta(days=offset)
+
+    # --- entities ---
+
+    def seed_users_and_groups(self):
+        rng = self._rng("users")
+        rows = []
+        for i in range(self.counts["users"]):
+            first = rng.choice(["ali", "ayse", "mehmet", "zeynep", "john", "maria",
+                                "can", "elif", "david", "sara", "emre", "deniz"])
+            last = rng.choice(["yilmaz", "kaya", "demir", "sahin", "smith",
+                               "celik", "arslan", "brown", "koc", "aydin"])
+            username = f"perf.{first}.{last}{i}"
+            rows.append({
+                "username": username,
+                "email": f"{username}@company.local",
+                "full_name": f"{first.title()} {last.title()} {i}",
+                "department": rng.choice(_DEPARTMENTS),
+                "role": "admin" if i < 3 else rng.choices(
+                    ["user", "readonly"], weights=[9, 1]
+                )[0],
+                "is_active": rng.random() > 0.03,
+                "failed_login_attempts": 0,
+            })
+            self.usernames.append(username)
+        self.user_ids = self._bulk_insert(User, rows)
+
+        group_rows = [
+            {
+                "name": f"perf-{rng.choice(_DEPARTMENTS).lower()}-{i}",
+                "description": "Generated by seed-perf",
+                "is_ad_synced": rng.random() < 0.5,
+            }
+            for i in range(self.counts["groups"])
+        ]
+        self.group_ids = self._bulk_insert(Group, group_rows)
+
+        memberships = set()
+        for user_id in self.user_ids:
+            for group_id in rng.sample(self.group_ids, k=min(len(self.group_ids),
+                                                             rng.randint(1, 4))):
+                memberships.add((user_id, group_id))
+        self._bulk_insert(user_groups, [
+            {"user_id": u, "group_id": g} for u, g in sorted(memberships)
+        ])
+        db.session.commit()
+        self.echo(f"  users: {len(self.user_ids)}, groups: {len(self.group_ids)}, "
+                  f"memberships: {len(memberships)}")
+
+    def seed_folders(self):
+        rng = self._rng("folders")
+        remaining = self.counts["folders"]
+        parents = []
+        depth = 0
+        while remaining > 0:
+            level = []
+            # Roughly half the folders at each level are roots of new trees.
+            size = remaining if depth >= 3 else max(1, remaining // (2 if depth else 3))
+            for i in range(size):
+                if parents and rng.random() < 0.8:
+                    parent_id, owner_id = rng.choice(parents)
+                else:
+                    parent_id, owner_id = None, rng.choice(self.user_ids)
+                level.append({
+                    "name": f"{rng.choice(_SYSTEMS).title()} {rng.choice(_ENVS)} {depth}-{i}",
+                    "parent_id": parent_id,
+                    "owner_id": owner_id,
+                    "icon": "folder",
+                    "color": rng.choice(["#6c757d", "#0d6efd", "#198754", "#dc3545"]),
+                })
+            ids = self._bulk_insert(Folder, level)
+            for folder_id, row in zip(ids, level):
+                self.folders_by_owner.setdefault(row["owner_id"], []).append(folder_id)
+            parents = [(folder_id, row["owner_id"]) for folder_id, row in zip(ids, level)]
+            remaining -= size
+            depth += 1
+        db.session.commit()
+        self.echo(f"  folders: {self.counts['folders']} (depth {depth})")
+
+    def seed_tags(self):
+        rows = [
+            {"name": f"{system}-{env}", "color": "#007bff"}
+            for system in _SYSTEMS for env in _ENVS
+        ]
+        self.tag_ids = self._bulk_insert(Tag, rows)
+        db.session.commit()
+
+    def seed_secrets(self):
+        rng = self._rng("secrets")
+        total = self.counts["secrets"]
+        shares = 0
+
+        def plain_chunks():
+            for start, size in self._chunks(total):
+                meta, records = [], []
+                for i in range(start, start + size):
+                    system, env = rng.choice(_SYSTEMS), rng.choice(_ENVS)
+                    owner_id = rng.choice(self.user_ids)
+                    category = rng.choice(_CATEGORIES)
+                    host = f"{system}-{env}{rng.randint(1, 40):02d}.company.local"
+                    owner_folders = self.folders_by_owner.get(owner_id)
+                    meta.append({
+                        "name": f"{system}-{env} {category} {i}",
+                        "description": f"{system.title()} {env} access",
+                        "category": category,
+                        "url_domain": host,
+                        "folder_id": (rng.choice(owner_folders)
+                                      if owner_folders and rng.random() < 0.7 else None),
+                        "owner_id": owner_id,
+                        "is_favorite": rng.random() < 0.05,
+                        "expires_at": (self._date_between(rng, 60, 365)
+                                       if rng.random() < 0.2 else None),
+                        "password_last_changed": self._date_between(rng, 720),
+                        "rotation_interval_days": rng.choice([None, None, 30, 90, 180]),
+                        "created_at": self._date_between(rng, 1000),
+                    })
+                    meta[-1]["password_rotate_at"] = Secret.rotation_due(
+                        meta[-1]["password_last_changed"], meta[-1]["rotation_interval_days"]
+                    )
+                    records.append({
+                        "username": f"svc_{system}_{env}",
+                        "password": "".join(rng.choices(_ALPHABET, k=rng.randint(12, 32))),
+                        "url": f"https://{host}/",
+                        "notes": (" ".join(rng.choices(_SYSTEMS + _ENVS, k=rng.randint(20, 600)))
+                                  if rng.random() < 0.3 else None),
+                        "api_key": ("".join(rng.choices(_ALPHABET[:58], k=40))
+                                    if category == "api_key" else None),
+                        "extra_data": ({"port": rng.choice([22, 1433, 1521, 5432])}
+                                       if category == "database" else None),
+                    })
+                yield meta, records
+
+        # Plaintext is generated here so it stays deterministic; encryption
+        # runs in workers with a bounded number of chunks in flight.
+        relations_rng = self._rng("secret_relations")
+        workers = self.workers or os.cpu_count() or 1
+        done = 0
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.instance_path, self.record_version),
+        ) as pool:
+            pending = deque()
+            for meta, records in plain_chunks():
+                pending.append((meta, pool.submit(_encrypt_secret_chunk, records)))
+                if len(pending) < workers * 2:
+                    continue
+                done, shares = self._insert_secret_chunk(
+                    pending.popleft(), relations_rng, done, shares, total
+                )
+            while pending:
+                done, shares = self._insert_secret_chunk(
+                    pending.popleft(), relations_rng, done, shares, total
+                )
+        self.echo(f"  secret shares: {shares}")
+
+    def _insert_secret_chunk(self, item, rng, done, shares, total):
+        meta, future = item
+        rows = [dict(m, **e) for m, e in zip(meta, future.result())]
+        ids = self._bulk_insert(Secret, rows)
+        shares += self._seed_secret_relations(rng, ids, meta)
+        db.session.commit()
+        done += len(ids)
+        self.echo(f"  secrets: {done}/{total}")
+        return done, shares
+
+    def _seed_secret_relations(self, rng, secret_ids, meta):
+        tag_rows, share_rows = [], []
+        for secret_id, row in zip(secret_ids, meta):
+            for tag_id in rng.sample(self.tag_ids, k=rng.randint(0, 3)):
+                tag_rows.append({"secret_id": secret_id, "tag_id": tag_id})
+            if rng.random() < 0.15:
+                expires = (self._date_between(rng, 90, 365)
+                           if rng.random() < 0.3 else None)
+                if rng.random() < 0.5:
+                    target = {"user_id": rng.choice(self.user_ids), "group_id": None}
+                else:
+                    target = {"user_id": None, "group_id": rng.choice(self.group_ids)}
+                share_rows.append(dict(
+                    target,
+                    secret_id=secret_id,
+                    permission=rng.choice(["read", "read", "write"]),
+                    shared_by_id=row["owner_id"],
+                    expires_at=expires,
+                ))
+        self._bulk_insert(secret_tags, tag_rows)
+        self._bulk_insert(SecretShare, share_rows)
+        return len(share_rows)
+
+    def seed_licenses(self):
+        from app.services.encryption_service import EncryptionService
+
+        rng = self._rng("licenses")
+        rows = []
+        for i in range(self.counts["licenses"]):
+            vendor = rng.choice(_VENDORS)
+            seat_count = rng.choice([None, 5, 10, 25, 50, 100, 500, 5000])
+            row = {
+                "name": f"{vendor} {rng.choice(_PRODUCTS)} {i}",
+                "vendor": vendor,
+                "version": f"{rng.randint(1, 24)}.{rng.randint(0, 9)}",
+                "license_type": rng.choice(LICENSE_TYPES)[0],
+                "cost": round(rng.uniform(50, 250000), 2),
+                "currency": rng.choice(["USD", "USD", "EUR", "TRY"]),
+                "purchase_date": self._date_between(rng, 1500, 0),
+                "expiration_date": (self._date_between(rng, 200, 900)
+                                    if rng.random() < 0.8 else None),
+                "seat_count": seat_count,
+                "department": rng.choice(_DEPARTMENTS),
+                "is_active": rng.random() > 0.05,
+                "created_by_id": rng.choice(self.user_ids),
+                "encryption_version": self.record_version,
+            }
+            key = "-".join("".join(rng.choices(_ALPHABET[:58], k=5)) for _ in range(5))
+            if self.record_version == 2:
+                row["encrypted_blob"] = EncryptionService.encrypt_record(
+                    {"license_key": key}, License._RECORD_CONTEXT
+                )
+            else:
+                row["encrypted_license_key"] = EncryptionService.encrypt(key)
+            rows.append(row)
+        license_ids = self._bulk_insert(License, rows)
+
+        assignments = []
+        for license_id, row in zip(license_ids, rows):
+            seats = row["seat_count"] or rng.randint(0, 50)
+            used = rng.randint(0, min(seats, len(self.usernames)))
+            for username in rng.sample(self.usernames, k=used):
+                assignments.append({
+                    "license_id": license_id,
+                    "assigned_to": username,
+                    "assignee_key": username.lower(),
+                    "assigned_by_id": row["created_by_id"],
+                    "is_active": rng.random() > 0.1,
+                    "machine_name": f"PC-{rng.randint(1000, 9999)}",
+                })
+        for start, size in self._chunks(len(assignments)):
+            self._bulk_insert(LicenseAssignment, assignments[start:start + size])
+        db.session.commit()
+        LicenseService.reconcile_seat_counts()
+        ReportService.refresh_all()
+        self.echo(f"  licenses: {len(license_ids)}, assignments: {len(assignments)}")
+
+    def seed_applications(self):
+        rng = self._rng("applications")
+        rows = []
+        for i in range(self.counts["applications"]):
+            system, env = rng.choice(_SYSTEMS), rng.choice(_ENVS)
+            server = f"srv-{system}-{env}{rng.randint(1, 99):02d}"
+            rows.append({
+                "name": f"{system.title()} {env.upper()} {i}",
+                "server_name": server,
+                "ip_address": f"10.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}",
+                "port": rng.choice([80, 443, 8080, 8443, 1521, 5432]),
+                "url": f"https://{server}.company.local/",
+                "status": "active" if rng.random() > 0.15 else "inactive",
+                "operating_system": rng.choice(["Windows Server 2019", "Windows Server 2022",
+                                                "RHEL 8", "RHEL 9", "Ubuntu 22.04"]),
+                "platform": rng.choice(PLATFORM_CHOICES)[0],
+                "database_type": rng.choice([None, "Oracle", "MSSQL", "PostgreSQL"]),
+                "deployment_type": rng.choice(DEPLOYMENT_CHOICES)[0],
+                "responsible_person": rng.choice(self.usernames),
+                "department": rng.choice(_DEPARTMENTS),
+                "sla_level": rng.choice(SLA_CHOICES)[0],
+                "criticality": rng.choice(CRITICALITY_CHOICES)[0],
+                "created_by_id": rng.choice(self.user_ids),
+            })
+        for start, size in self._chunks(len(rows)):
+            self._bulk_insert(Application, rows[start:start + size])
+        db.session.commit()
+        self.echo(f"  applications: {len(rows)}")
+
+    def seed_audit_logs(self):
+        rng = self._rng("audit_logs")
+        total = self.counts["audit_logs"]
+        for start, size in self._chunks(total):
+            rows = []
+            for _ in range(size):
+                index = rng.randrange(len(self.user_ids))
+                rows.append({
+                    "user_id": self.user_ids[index],
+                    "username": self.usernames[index],
+                    "action": rng.choice(_ACTIONS),
+                    "resource_type": "secret",
+                    "resource_id": rng.randint(1, max(1, self.counts["secrets"])),
+                    "ip_address": f"10.0.{rng.randint(0, 255)}.{rng.randint(1, 254)}",
+                    "user_agent": "seed-perf",
+                    "success": rng.random() > 0.02,
+                    "created_at": self._date_between(rng, 365),
+                })
+            self._bulk_insert(AuditLog, rows, return_ids=False)
+            db.session.commit()
+            if (start // self.batch_size) % 20 == 0 or start + size == total:
+                self.echo(f"  audit logs: {start + size}/{total}")
@@ -0,0 +1,300 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import and_, delete, func, insert, literal, null, or_, select, union_all, update
+from sqlalchemy.orm import aliased
+
+from app import db
+from app.models.folder import Folder
+from app.models.group import Group
+from app.models.secret import Secret
+from app.models.share import FolderShare, SecretShare
+from app.models.user import User
+from app.services.access_service import AccessService
+from app.services.audit_service import AuditService
+
+
+class ShareService:
+    """Resolution of secret and folder shares.
+
+    A ``FolderShare`` grants its permission on every secret in the folder
+    and all of its subfolders, so a team folder needs one row per grantee
+    instead of one per secret, and secrets added later are covered at once.
+    Explicit ``SecretShare`` rows extend that (access to secrets outside
+    any shared folder) and override it: when a user has an explicit share
+    on a secret, its permission is used instead of any inherited one.
+    """
+
+    @staticmethod
+    def active_grant(model, user):
+        """Filter for unexpired ``model`` rows granted to ``user`` (a ``User``
+        or ``AccessContext``) directly or through one of their groups."""
+        access = AccessService.context(user)
+        return and_(
+            or_(
+                model.user_id == access.user_id,
+                model.group_id.in_(access.group_ids),
+            ),
+            or_(
+                model.expires_at.is_(None),
+                model.expires_at > datetime.now(timezone.utc),
+            ),
+        )
+
+    @staticmethod
+    def folder_ancestors(folder_id):
+        """SELECT of ``folder_id`` and every folder above it (recursive CTE).
+
+        UNION rather than UNION ALL, so a parent cycle cannot loop forever.
+        """
+        chain = (
+            select(Folder.id, Folder.parent_id)
+            .where(Folder.id == folder_id)
+            .cte("folder_ancestors", recursive=True)
+        )
+        parent = aliased(Folder)
+        chain = chain.union(
+            select(parent.id, parent.parent_id).where(parent.id == chain.c.parent_id)
+        )
+        return select(chain.c.id)
+
+    @staticmethod
+    def shared_folder_permissions(user):
+        """Recursive CTE of ``(id, permission)`` for every folder inside a
+        subtree shared with ``user``, each share's permission carried down."""
+        tree = (
+            select(FolderShare.folder_id.label("id"), FolderShare.permission)
+            .where(ShareService.active_grant(FolderShare, user))
+            .cte("shared_folders", recursive=True)
+        )
+        child = aliased(Folder)
+        return tree.union(
+            select(child.id, tree.c.permission).where(child.parent_id == tree.c.id)
+        )
+
+    @staticmethod
+    def shared_folder_ids(user):
+        """SELECT of every folder inside a subtree shared with ``user``."""
+        return select(ShareService.shared_folder_permissions(user).c.id)
+
+    @staticmethod
+    def shared_secret_filter(user):
+        """Filter on ``Secret`` for secrets shared with ``user`` explicitly or
+        through a folder."""
+        return or_(
+            Secret.id.in_(
+                select(SecretShare.secret_id).where(ShareService.active_grant(SecretShare, user))
+            ),
+            Secret.folder_id.in_(ShareService.shared_folder_ids(user)),
+        )
+
+    @staticmethod
+    def permissions(secret, user):
+        """Permissions ``user`` holds on ``secret`` through shares (a set,
+        empty when it is not shared with them)."""
+        explicit = {
+            permission for permission, in db.session.query(SecretShare.permission).filter(
+                SecretShare.secret_id == secret.id,
+                ShareService.active_grant(SecretShare, user),
+            )
+        }
+        if explicit or secret.folder_id is None:
+            return explicit
+        return {
+            permission for permission, in db.session.query(FolderShare.permission).filter(
+                FolderShare.folder_id.in_(ShareService.folder_ancestors(secret.folder_id)),
+                ShareService.active_grant(FolderShare, user),
+            )
+        }
+
+    @staticmethod
+    def inherited_shares(secret):
+        """Folder shares that reach ``secret``, nearest folder first."""
+        if secret.folder_id is None:
+            return []
+        shares = FolderShare.query.filter(
+            FolderShare.folder_id.in_(ShareService.folder_ancestors(secret.folder_id))
+        ).all()
+        depth = {}
+        folder = secret.folder
+        while folder is not None and folder.id not in depth:
+            depth[folder.id] = len(depth)
+            folder = folder.parent
+        return sorted(shares, key=lambda share: (depth.get(share.folder_id, 0), share.id))
+
+    # -- Folder shares ------------------------------------------------------
+
+    @staticmethod
+    def share_folder(folder, shared_by, user_id=None, group_id=None, permission="read",
+                     expires_at=None):
+        """Grant one user or group access to ``folder`` and its subtree.
+
+        Sharing again with the same target updates the existing grant's
+        permission and expiry instead of adding a second row.
+        """
+        if (user_id is None) == (group_id is None):
+            raise ValueError("Share with exactly one of user_id or group_id")
+        share = FolderShare.query.filter(
+            FolderShare.folder_id == folder.id,
+            ShareService._target(FolderShare, user_id, group_id),
+        ).first()
+        if share is None:
+            share = FolderShare(folder_id=folder.id, user_id=user_id, group_id=group_id)
+        share.permission = permission
+        share.shared_by_id = shared_by.id
+        share.expires_at = expires_at
+        db.session.add(share)
+        db.session.commit()
+
+        AuditService.log(
+            action="folder_shared",
+            user_id=shared_by.id,
+            username=shared_by.username,
+            resource_type="folder",
+            resource_id=folder.id,
+            resource_name=folder.name,
+            details=f"Shared with user_id={user_id} group_id={group_id} permission={permission}",
+        )
+        return share
+
+    @staticmethod
+    def unshare_folder(share, user):
+        folder = share.folder
+        db.session.delete(share)
+        db.session.commit()
+
+        AuditService.log(
+            action="folder_unshared",
+            user_id=user.id,
+            username=user.username,
+            resource_type="folder",
+            resource_id=folder.id,
+            resource_name=folder.name,
+            details=f"Removed user_id={share.user_id} group_id={share.group_id}",
+        )
+
+    # -- Bulk secret shares -------------------------------------------------
+
+    @staticmethod
+    def _target(model, user_id, group_id):
+        return and_(
+            model.user_id.is_(None) if user_id is None else model.user_id == user_id,
+            model.group_id.is_(None) if group_id is None else model.group_id == group_id,
+        )
+
+    @staticmethod
+    def shareable_ids(user, secret_ids):
+        """SELECT of the ids in ``secret_ids`` (a list or a SELECT of ids)
+        that ``user`` may share: their own secrets, or any for an admin."""
+        query = select(Secret.id).where(Secret.id.in_(secret_ids))
+        if not user.is_admin():
+            query = query.where(Secret.owner_id == user.id)
+        return query
+
+    @staticmethod
+    def share_secrets(secret_ids, shared_by, user_id=None, group_id=None, permission="read",
+                      expires_at=None):
+        """Grant one user or group access to every secret in ``secret_ids``
+        that ``shared_by`` may share. Returns ``(created, updated)``.
+
+        Two set-based statements whatever the selection size: existing
+        grants to the same target get the new permission and expiry, and
+        one INSERT ... SELECT adds the rest, so repeating a batch never
+        creates duplicate rows. One audit entry covers the whole batch.
+        """
+        selected = ShareService.shareable_ids(shared_by, secret_ids)
+        target = ShareService._target(SecretShare, user_id, group_id)
+        # Counted through RETURNING: rowcount is unreliable once a recursive
+        # CTE from the selection is hoisted in front of the statement.
+        updated = len(db.session.execute(
+            update(SecretShare)
+            .where(SecretShare.secret_id.in_(selected), target)
+            .values(permission=permission, expires_at=expires_at)
+            .returning(SecretShare.id)
+            .execution_options(synchronize_session=False)
+        ).all())
+        existing = select(SecretShare.id).where(SecretShare.secret_id == Secret.id, target)
+        created = len(db.session.execute(
+            insert(SecretShare).from_select(
+                ["secret_id", "user_id", "group_id", "permission", "shared_by_id", "expires_at"],
+                select(
+                    Secret.id,
+                    literal(user_id, db.Integer) if user_id is not None else null(),
+                    literal(group_id, db.Integer) if group_id is not None else null(),
+                    literal(permission, db.String),
+                    literal(shared_by.id, db.Integer),
+                    literal(expires_at, db.DateTime) if expires_at is not None else null(),
+                ).where(Secret.id.in_(selected), ~existing.exists()),
+            ).returning(SecretShare.id)
+        ).all())
+        db.session.commit()
+
+        AuditService.log(
+            action="secrets_bulk_shared",
+            user_id=shared_by.id,
+            username=shared_by.username,
+            resource_type="secret",
+            details=(
+                f"Shared {created + updated} secrets ({created} new, {updated} updated) "
+                f"with user_id={user_id} group_id={group_id} permission={permission}"
+            ),
+        )
+        return created, updated
+
+    @staticmethod
+    def unshare_secrets(secret_ids, user, user_id=None, group_id=None):
+        """Remove the grants of one user or group from every secret in
+        ``secret_ids`` that ``user`` may share. Returns the number removed."""
+        removed = len(db.session.execute(
+            delete(SecretShare)
+            .where(
+                SecretShare.secret_id.in_(ShareService.shareable_ids(user, secret_ids)),
+                ShareService._target(SecretShare, user_id, group_id),
+            )
+            .returning(SecretShare.id)
+            .execution_options(synchronize_session=False)
+        ).all())
+        db.session.commit()
+
+        AuditService.log(
+            action="secrets_bulk_unshared",
+            user_id=user.id,
+            username=user.username,
+            resource_type="secret",
+            details=f"Removed {removed} shares of user_id={user_id} group_id={group_id}",
+        )
+        return removed
+
+    @staticmethod
+    def share_targets(user, q=None, page=1, per_page=20):
+        """One page of the groups and active users (other than ``user``) a
+        share can go to, groups first. Returns ``(items, total)``.
+
+        The share dialogs search this instead of rendering the whole
+        directory into a select box.
+        """
+        users = select(
+            literal("user").label("kind"), User.id, User.username.label("name"),
+            User.full_name.label("detail"),
+        ).where(User.is_active.is_(True), User.id != user.id)
+        groups = select(
+            literal("group").label("kind"), Group.id, Group.name.label("name"),
+            Group.description.label("detail"),
+        )
+        if q:
+            search = f"%{q}%"
+            users = users.where(or_(
+                User.username.ilike(search),
+                User.full_name.ilike(search),
+                User.email.ilike(search),
+            ))
+            groups = groups.where(Group.name.ilike(search))
+        targets = union_all(groups, users).subquery()
+
+        total = db.session.scalar(select(func.count()).select_from(targets))
+        rows = db.session.execute(
+            select(targets)
+            .order_by(targets.c.kind, func.lower(targets.c.name), targets.c.id)
+            .limit(per_page)
+            .offset((page - 1) * per_page)
+        ).all()
+        return [dict(row._mapping) for row in rows], total
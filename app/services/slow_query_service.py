@@ -0,0 +1,270 @@
+import hashlib
+import logging
+import queue
+import re
+import threading
+import time
+from datetime import datetime, timezone
+
+from flask import has_request_context, request
+
+logger = logging.getLogger("keyvault.slow_query")
+
+_COMMENT_RE = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PARAM_RE = re.compile(r"%\(\w+\)s|%s|:\w+|\?|@\w+")
+_IN_LIST_RE = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.I)
+_SPACE_RE = re.compile(r"\s+")
+
+
+def fingerprint(statement):
+    """Normalize SQL so statements differing only in literals group together.
+
+    Returns ``(fingerprint_id, normalized_sql)``.
+    """
+    sql = _COMMENT_RE.sub(" ", statement)
+    sql = _STRING_RE.sub("?", sql)
+    sql = _PARAM_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _IN_LIST_RE.sub("IN (?+)", sql)
+    sql = _SPACE_RE.sub(" ", sql).strip()
+    digest = hashlib.sha1(sql.encode("utf-8")).hexdigest()[:12]
+    return digest, sql
+
+
+def redact_parameters(parameters):
+    """Describe bound parameters by type only; values never leave the driver."""
+    if parameters is None:
+        return "[]"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(
+            f"{k}: {type(v).__name__}" for k, v in parameters.items()
+        ) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "[" + ", ".join(type(v).__name__ for v in parameters) + "]"
+    return type(parameters).__name__
+
+
+class SlowQueryService:
+    """Log SQL statements slower than SLOW_QUERY_THRESHOLD_MS.
+
+    Each slow statement is logged with its fingerprint, redacted parameters,
+    duration, row count and calling endpoint, and per-fingerprint totals are
+    kept in memory for the admin report. The first occurrence of every
+    fingerprint is queued for a query plan, which a background thread
+    captures on a pooled connection of its own: the caller's connection may
+    still have rows to fetch, and drivers without MARS (pymssql) would drop
+    them.
+    """
+
+    _lock = threading.Lock()
+    _fingerprints = {}
+    _threshold = 0.25
+    _max_fingerprints = 500
+    _engine = None
+    # (fingerprint, statement, parameters) awaiting a plan; full means skip
+    _pending = queue.Queue(maxsize=100)
+    _worker = None
+
+    @classmethod
+    def init_app(cls, app):
+        if not app.config.get("SLOW_QUERY_LOG_ENABLED", True):
+            return
+
+        cls._threshold = app.config["SLOW_QUERY_THRESHOLD_MS"] / 1000.0
+        cls._max_fingerprints = app.config["SLOW_QUERY_MAX_FINGERPRINTS"]
+
+        import os
+
+        log_dir = os.path.join(os.path.dirname(app.root_path), "logs")
+        os.makedirs(log_dir, exist_ok=True)
+        if not logger.handlers:
+            handler = logging.FileHandler(os.path.join(log_dir, "slow_queries.log"))
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            logger.addHandler(handler)
+            logger.setLevel(logging.WARNING)
+
+        from app import db
+
+        with app.app_context():
+            cls._install(db.engine)
+
+        if not app.testing:
+
+            @app.before_request
+            def _start_slow_query_explains():
+                cls._start_worker()
+
+    @classmethod
+    def _install(cls, engine):
+        from sqlalchemy import event
+
+        cls._engine = engine
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _before(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("slow_query_started", []).append(time.perf_counter())
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def _after(conn, cursor, statement, parameters, context, executemany):
+            started = conn.info.get("slow_query_started")
+            if not started:
+                return
+            elapsed = time.perf_counter() - started.pop()
+            if elapsed < cls._threshold:
+                return
+            cls._record(cursor, statement, parameters, executemany, elapsed)
+
+    @classmethod
+    def _record(cls, cursor, statement, parameters, executemany, elapsed):
+        fp, normalized = fingerprint(statement)
+        endpoint = request.endpoint if has_request_context() else None
+        rowcount = getattr(cursor, "rowcount", -1)
+        duration_ms = round(elapsed * 1000, 2)
+
+        with cls._lock:
+            entry = cls._fingerprints.get(fp)
+            first = entry is None
+            if first:
+                if len(cls._fingerprints) >= cls._max_fingerprints:
+                    cheapest = min(cls._fingerprints,
+                                   key=lambda k: cls._fingerprints[k]["total_ms"])
+                    del cls._fingerprints[cheapest]
+                entry = cls._fingerprints[fp] = {
+                    "fingerprint": fp,
+                    "sql": normalized,
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "endpoints": {},
+                    "last_rowcount": None,
+                    "last_seen": None,
+                    "explain": None,
+                }
+            entry["count"] += 1
+            entry["total_ms"] += duration_ms
+            entry["max_ms"] = max(entry["max_ms"], duration_ms)
+            entry["last_rowcount"] = rowcount
+            entry["last_seen"] = datetime.now(timezone.utc).isoformat()
+            key = endpoint or "-"
+            if key in entry["endpoints"] or len(entry["endpoints"]) < 10:
+                entry["endpoints"][key] = entry["endpoints"].get(key, 0) + 1
+
+        logger.warning(
+            "slow_query fp=%s duration_ms=%.1f rows=%s endpoint=%s params=%s sql=%s",
+            fp, duration_ms, rowcount, endpoint or "-",
+            redact_parameters(parameters), normalized,
+        )
+
+        is_query = statement.lstrip().upper().startswith(("SELECT", "WITH"))
+        if first and is_query and not executemany:
+            try:
+                cls._pending.put_nowait((fp, statement, parameters))
+            except queue.Full:
+                pass
+
+    # -- Query plans ----------------------------------------------------------
+
+    @classmethod
+    def _start_worker(cls):
+        if cls._worker is not None:
+            return
+        with cls._lock:
+            if cls._worker is None:
+                cls._worker = threading.Thread(
+                    target=cls._work, name="slow-query-explain", daemon=True,
+                )
+                cls._worker.start()
+
+    @classmethod
+    def _work(cls):
+        while True:
+            cls._capture(*cls._pending.get())
+
+    @classmethod
+    def explain_pending(cls):
+        """Capture the queued plans on the calling thread; returns how many."""
+        done = 0
+        while True:
+            try:
+                item = cls._pending.get_nowait()
+            except queue.Empty:
+                return done
+            cls._capture(*item)
+            done += 1
+
+    @classmethod
+    def _capture(cls, fp, statement, parameters):
+        plan = cls._explain(cls._engine, statement, parameters)
+        if plan:
+            with cls._lock:
+                if fp in cls._fingerprints:
+                    cls._fingerprints[fp]["explain"] = plan
+            logger.warning("slow_query fp=%s plan:\n%s", fp, plan)
+
+    @staticmethod
+    def _explain(engine, statement, parameters):
+        """Capture a query plan on a pooled connection; never raises."""
+        dialect = engine.dialect.name
+        try:
+            with engine.connect() as conn:
+                cursor = conn.connection.cursor()
+                try:
+                    if dialect == "sqlite":
+                        cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters or ())
+                        return "\n".join(
+                            " | ".join(str(c) for c in row) for row in cursor.fetchall()
+                        )
+
+                    if dialect == "postgresql":
+                        cursor.execute("EXPLAIN " + statement, parameters)
+                        return "\n".join(row[0] for row in cursor.fetchall())
+
+                    if dialect == "mssql":
+                        # SHOWPLAN stops execution on the whole connection;
+                        # never hand it back to the pool in that state.
+                        cursor.execute("SET SHOWPLAN_TEXT ON")
+                        try:
+                            cursor.execute(statement, parameters)
+                            lines = []
+                            while True:
+                                lines.extend(str(row[0]) for row in cursor.fetchall())
+                                if not cursor.nextset():
+                                    break
+                            return "\n".join(lines)
+                        finally:
+                            try:
+                                cursor.execute("SET SHOWPLAN_TEXT OFF")
+                            except Exception:
+                                conn.invalidate()
+                                raise
+                finally:
+                    try:
+                        cursor.close()
+                    except Exception:
+                        pass
+        except Exception as e:
+            return f"(plan unavailable: {e})"
+        return None
+
+    @classmethod
+    def top(cls, limit=25, order_by="total_ms"):
+        """Return the aggregated fingerprints with the highest ``order_by``."""
+        with cls._lock:
+            entries = [dict(e, endpoints=dict(e["endpoints"])) for e in cls._fingerprints.values()]
+        for entry in entries:
+            entry["avg_ms"] = round(entry["total_ms"] / entry["count"], 2)
+            entry["total_ms"] = round(entry["total_ms"], 2)
+        entries.sort(key=lambda e: e.get(order_by, 0), reverse=True)
+        return entries[:limit]
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls._fingerprints = {}
+        while True:
+            try:
+                cls._pending.get_nowait()
+            except queue.Empty:
+                break
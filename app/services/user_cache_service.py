@@ -0,0 +1,165 @@
+import threading
+import time
+
+from flask_login import UserMixin
+from sqlalchemy import event, inspect, select
+
+from app import db
+from app.models.user import User
+from app.services.metrics_service import MetricsService
+
+# Columns whose change must reach every request at once
+_WATCHED = ("username", "role", "is_active", "locked_until", "full_name", "display_name")
+
+# Cache bound; it is cleared rather than evicted piecemeal
+_MAX_ENTRIES = 50000
+
+
+class UserSnapshot(UserMixin):
+    """Identity of a logged-in user as served to ``current_user``.
+
+    Carries what nearly every request needs (id, name, role, active and lock
+    state) without a database row. Any other ``User`` attribute loads the
+    row on first use and reads it from there.
+    """
+
+    def __init__(self, id, username, role, is_active, locked_until, full_name,
+                 display_name):
+        self.id = id
+        self.username = username
+        self.role = role
+        self._active = is_active
+        self.locked_until = locked_until
+        self.full_name = full_name
+        self.display_name = display_name
+
+    @property
+    def is_active(self):
+        return self._active
+
+    @property
+    def group_ids(self):
+        from app.services.access_service import AccessService
+
+        return AccessService.group_ids(self.id)
+
+    is_locked = User.is_locked
+    is_admin = User.is_admin
+    is_readonly = User.is_readonly
+    can_write = User.can_write
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(db.session.get(User, self.id), name)
+
+    def __repr__(self):
+        return f"<UserSnapshot {self.username}>"
+
+
+class UserCacheService:
+    """Process-local cache behind ``login_manager.user_loader``.
+
+    Snapshots live for USER_CACHE_SECONDS. A commit that changes a user's
+    role, active flag, lock or name drops that user's entry, so those take
+    effect on the next request in this process (other processes within the
+    TTL). Group memberships come from the AccessService cache, which group
+    edits invalidate the same way. Inactive and locked accounts load as
+    anonymous, ending their existing sessions.
+    """
+
+    _cache = {}
+    _cache_seconds = 15
+    _version = 0
+    _stats = {"hits": 0, "misses": 0}
+    _lock = threading.Lock()
+
+    @classmethod
+    def init_app(cls, app):
+        cls._cache_seconds = app.config["USER_CACHE_SECONDS"]
+        cls._cache = {}
+        cls._stats = {"hits": 0, "misses": 0}
+        if not event.contains(db.session, "after_flush", cls._collect):
+            event.listen(db.session, "after_flush", cls._collect)
+            event.listen(db.session, "after_commit", cls._apply)
+            event.listen(db.session, "after_rollback", cls._discard)
+
+    @classmethod
+    def load(cls, user_id):
+        """Snapshot of an active, unlocked user, or None."""
+        snapshot = cls.get(user_id)
+        if snapshot is None or not snapshot.is_active or snapshot.is_locked():
+            return None
+        return snapshot
+
+    @classmethod
+    def get(cls, user_id):
+        now = time.monotonic()
+        with cls._lock:
+            hit = cls._cache.get(user_id)
+            version = cls._version
+            if hit and now - hit[0] < cls._cache_seconds:
+                cls._stats["hits"] += 1
+            else:
+                hit = None
+                cls._stats["misses"] += 1
+        if hit:
+            MetricsService.incr("user_cache_hit")
+            return hit[1]
+        MetricsService.incr("user_cache_miss")
+
+        row = db.session.execute(
+            select(User.id, User.username, User.role, User.is_active, User.locked_until,
+                   User.full_name, User.display_name)
+            .where(User.id == user_id)
+        ).first()
+        snapshot = UserSnapshot(*row) if row else None
+        with cls._lock:
+            if cls._version == version:
+                if len(cls._cache) >= _MAX_ENTRIES:
+                    cls._cache = {}
+                cls._cache[user_id] = (now, snapshot)
+        return snapshot
+
+    @classmethod
+    def invalidate(cls, user_id=None):
+        """Drop one user's snapshot (or all of them)."""
+        with cls._lock:
+            cls._version += 1
+            if user_id is None:
+                cls._cache = {}
+            else:
+                cls._cache.pop(user_id, None)
+
+    @classmethod
+    def stats(cls):
+        with cls._lock:
+            hits, misses = cls._stats["hits"], cls._stats["misses"]
+            return {
+                "entries": len(cls._cache),
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else None,
+            }
+
+    # -- Session hooks ------------------------------------------------------
+
+    @staticmethod
+    def _collect(session, flush_context):
+        changed = session.info.setdefault("user_cache", set())
+        for obj in session.new | session.dirty | session.deleted:
+            if isinstance(obj, User):
+                attrs = inspect(obj).attrs
+                if obj not in session.dirty or any(
+                    attrs[name].history.has_changes() for name in _WATCHED
+                ):
+                    changed.add(obj.id)
+
+    @classmethod
+    def _apply(cls, session):
+        for user_id in session.info.pop("user_cache", ()):
+            cls.invalidate(user_id)
+
+    @staticmethod
+    def _discard(session):
+        session.info.pop("user_cache", None)
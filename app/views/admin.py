@@ -6,6 +6,7 @@ from flask import (
     redirect,
     render_template,
     request,
+    send_file,
     url_for,
 )
 from flask_login import current_user, login_required
@@ -15,6 +16,10 @@ from app.auth.decorators import admin_required
 from app.models.group import Group
 from app.models.user import User
 from app.services.audit_service import AuditService
+from app.services.metrics_service import MetricsService
+from app.services.profiler_service import ProfilerService
+from app.services.search_service import SearchService
+from app.services.slow_query_service import SlowQueryService
 
 admin_bp = Blueprint("admin", __name__, url_prefix="/admin")
 
@@ -28,7 +33,10 @@ def users():
     q = request.args.get("q", "").strip()
 
     query = User.query
-    if q:
+    ranked = SearchService.apply(query, "users", q) if q else None
+    if ranked is not None:
+        query = ranked
+    elif q:
         search = f"%{q}%"
         query = query.filter(
             User.username.ilike(search)
@@ -130,6 +138,8 @@ def create_user():
             is_active=True,
         )
         db.session.add(user)
+        db.session.flush()
+        SearchService.index(user)
         db.session.commit()
 
         AuditService.log(
@@ -169,6 +179,7 @@ def edit_user(user_id):
         if user.id != current_user.id:
             user.role = request.form.get("role", user.role)
 
+        SearchService.index(user)
         db.session.commit()
 
         AuditService.log(
@@ -227,3 +238,58 @@ def delete_group(group_id):
     db.session.commit()
     flash(f"Group '{name}' deleted.", "success")
     return redirect(url_for("admin.groups"))
+
+
+@admin_bp.route("/metrics")
+@login_required
+@admin_required
+def metrics():
+    return MetricsService.render_prometheus(), 200, {
+        "Content-Type": "text/plain; version=0.0.4; charset=utf-8"
+    }
+
+
+@admin_bp.route("/profiles")
+@login_required
+@admin_required
+def profiles():
+    return render_template(
+        "admin/profiles.html",
+        captures=ProfilerService.list_captures(),
+        sample_rate=current_app.config["PROFILE_SAMPLE_RATE"],
+        sample_blueprints=current_app.config["PROFILE_SAMPLE_BLUEPRINTS"],
+    )
+
+
+@admin_bp.route("/profiles/<name>/<kind>")
+@login_required
+@admin_required
+def download_profile(name, kind):
+    path = ProfilerService.capture_path(name, f".{kind}")
+    if not path:
+        abort(404)
+    return send_file(path, as_attachment=True, download_name=path.name)
+
+
+@admin_bp.route("/slow-queries")
+@login_required
+@admin_required
+def slow_queries():
+    order_by = request.args.get("order_by", "total_ms")
+    if order_by not in ("total_ms", "max_ms", "avg_ms", "count"):
+        order_by = "total_ms"
+    return render_template(
+        "admin/slow_queries.html",
+        queries=SlowQueryService.top(limit=50, order_by=order_by),
+        order_by=order_by,
+        threshold_ms=current_app.config["SLOW_QUERY_THRESHOLD_MS"],
+    )
+
+
+@admin_bp.route("/slow-queries/reset", methods=["POST"])
+@login_required
+@admin_required
+def reset_slow_queries():
+    SlowQueryService.reset()
+    flash("Slow query statistics cleared.", "success")
+    return redirect(url_for("admin.slow_queries"))
@@ -18,11 +18,13 @@ from app.models.application import Application
 from app.services.application_service import (
     CRITICALITY_CHOICES,
     DEPLOYMENT_CHOICES,
+    FACET_FIELDS,
     PLATFORM_CHOICES,
     SLA_CHOICES,
     STATUS_CHOICES,
     ApplicationService,
 )
+from app.services.health_check_service import HealthCheckService
 
 applications_bp = Blueprint(
     "applications", __name__, url_prefix="/applications"
@@ -43,24 +45,29 @@ def list_applications():
     page = request.args.get("page", 1, type=int)
     per_page = current_app.config.get("ITEMS_PER_PAGE", 25)
     q = request.args.get("q", "").strip()
-    status = request.args.get("status", "").strip() or None
-    platform = request.args.get("platform", "").strip() or None
+    filters = {
+        field: request.args.get(field, "").strip()
+        for field in FACET_FIELDS
+        if request.args.get(field, "").strip()
+    }
 
     pagination = ApplicationService.get_applications(
         q=q or None,
-        status=status,
-        platform=platform,
+        filters=filters,
         page=page,
         per_page=per_page,
     )
     return render_template(
         "applications/list.html",
         applications=pagination.items,
+        health=HealthCheckService.latest([a.id for a in pagination.items]),
         pagination=pagination,
+        facets=ApplicationService.facet_counts(q=q or None, filters=filters),
+        filters=filters,
         platform_choices=PLATFORM_CHOICES,
         status_choices=STATUS_CHOICES,
-        current_status=status,
-        current_platform=platform,
+        current_status=filters.get("status"),
+        current_platform=filters.get("platform"),
         search_query=q,
     )
 
@@ -74,6 +81,21 @@ def detail(app_id):
     return render_template("applications/detail.html", app=app_record)
 
 
+@applications_bp.route("/<int:app_id>/health-check", methods=["POST"])
+@login_required
+@admin_required
+def health_check(app_id):
+    app_record = db.session.get(Application, app_id)
+    if not app_record:
+        abort(404)
+    counts = HealthCheckService.run(app_ids=[app_id])
+    if counts:
+        flash(f"Health check finished: {next(iter(counts))}.", "info")
+    else:
+        flash("Nothing to check: set a URL or host and port on an active application.", "warning")
+    return redirect(url_for("applications.detail", app_id=app_id))
+
+
 @applications_bp.route("/new", methods=["GET", "POST"])
 @login_required
 @admin_required
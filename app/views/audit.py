@@ -30,6 +30,8 @@ def logs():
         "login", "login_failed", "logout",
         "secret_created", "secret_viewed", "secret_updated", "secret_deleted",
         "secret_shared", "secret_unshared", "password_copied",
+        "folder_shared", "folder_unshared",
+        "secrets_bulk_shared", "secrets_bulk_unshared",
         "user_role_changed", "user_status_changed",
     ]
 
@@ -19,9 +19,9 @@ def index():
     else:
         total_secrets = Secret.query.filter_by(owner_id=current_user.id).count()
 
-    from app.models.share import SecretShare
+    from app.services.share_service import ShareService
 
-    shared_count = SecretShare.query.filter_by(user_id=current_user.id).count()
+    shared_count = Secret.query.filter(ShareService.shared_secret_filter(current_user)).count()
 
     # Expiring secrets
     expiring = NotificationService.get_expiring_secrets(days_threshold=30)
@@ -12,6 +12,10 @@ from flask_login import current_user, login_required
 from app import db
 from app.auth.decorators import write_required
 from app.models.folder import Folder
+from app.models.group import Group
+from app.models.share import FolderShare
+from app.models.user import User
+from app.services.share_service import ShareService
 
 folders_bp = Blueprint("folders", __name__, url_prefix="/folders")
 
@@ -105,3 +109,64 @@ def delete(folder_id):
     db.session.commit()
     flash(f"Folder '{name}' deleted.", "success")
     return redirect(url_for("folders.list_folders"))
+
+
+@folders_bp.route("/<int:folder_id>/share", methods=["GET", "POST"])
+@login_required
+@write_required
+def share(folder_id):
+    folder = db.session.get(Folder, folder_id)
+    if not folder:
+        abort(404)
+    if folder.owner_id != current_user.id and not current_user.is_admin():
+        abort(403)
+
+    if request.method == "POST":
+        user_id = request.form.get("user_id", type=int)
+        group_id = request.form.get("group_id", type=int)
+        permission = request.form.get("permission", "read")
+
+        error = None
+        target_user = db.session.get(User, user_id) if user_id else None
+        if not user_id and not group_id:
+            error = "Select a user or group to share with."
+        elif user_id and group_id:
+            error = "Share with either a user or a group, not both."
+        elif permission not in ("read", "write"):
+            error = "Permission must be read or write."
+        elif user_id and (not target_user or not target_user.is_active):
+            error = "Unknown user."
+        elif group_id and not db.session.get(Group, group_id):
+            error = "Unknown group."
+        if error:
+            flash(error, "danger")
+            return redirect(url_for("folders.share", folder_id=folder_id))
+
+        ShareService.share_folder(folder, current_user, user_id=user_id, group_id=group_id,
+                                  permission=permission)
+        flash(f"Folder '{folder.name}' shared, including its subfolders.", "success")
+        return redirect(url_for("folders.share", folder_id=folder.id))
+
+    return render_template(
+        "folders/share.html",
+        folder=folder,
+        existing_shares=folder.shares,
+    )
+
+
+@folders_bp.route("/<int:folder_id>/unshare/<int:share_id>", methods=["POST"])
+@login_required
+@write_required
+def unshare(folder_id, share_id):
+    folder = db.session.get(Folder, folder_id)
+    if not folder:
+        abort(404)
+    if folder.owner_id != current_user.id and not current_user.is_admin():
+        abort(403)
+
+    share_entry = db.session.get(FolderShare, share_id)
+    if share_entry and share_entry.folder_id == folder.id:
+        ShareService.unshare_folder(share_entry, current_user)
+        flash("Share removed.", "success")
+
+    return redirect(url_for("folders.share", folder_id=folder.id))
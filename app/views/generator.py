@@ -1,7 +1,12 @@
-from flask import Blueprint, render_template, request
+from flask import Blueprint, flash, render_template, request
 from flask_login import login_required
 
-from app.services.password_generator import PasswordGenerator
+from app.services.password_generator import (
+    CAPITALIZE_MODES,
+    PASSPHRASE_MAX_WORDS,
+    PASSPHRASE_MIN_WORDS,
+    PasswordGenerator,
+)
 
 generator_bp = Blueprint("generator", __name__, url_prefix="/generator")
 
@@ -11,8 +16,29 @@ generator_bp = Blueprint("generator", __name__, url_prefix="/generator")
 def index():
     password = None
     strength = None
+    mode = request.form.get("mode", "password")
 
-    if request.method == "POST":
+    if request.method == "POST" and mode == "passphrase":
+        words = request.form.get("words", 6, type=int)
+        words = max(PASSPHRASE_MIN_WORDS, min(PASSPHRASE_MAX_WORDS, words))
+        capitalize = request.form.get("capitalize", "none")
+        digits = request.form.get("digits", 0, type=int)
+        try:
+            password = PasswordGenerator.generate_passphrase(
+                words=words,
+                separator=request.form.get("separator", "-")[:3],
+                capitalize=capitalize,
+                digits=digits,
+            )
+        except ValueError as exc:
+            flash(str(exc), "danger")
+        else:
+            strength = PasswordGenerator.calculate_strength(password)
+            strength["entropy"] = round(
+                PasswordGenerator.passphrase_entropy(words, capitalize, digits), 1
+            )
+
+    elif request.method == "POST":
         length = request.form.get("length", 20, type=int)
         length = max(8, min(128, length))
 
@@ -30,4 +56,8 @@ def index():
         "generator/index.html",
         password=password,
         strength=strength,
+        mode=mode,
+        capitalize_modes=CAPITALIZE_MODES,
+        min_words=PASSPHRASE_MIN_WORDS,
+        max_words=PASSPHRASE_MAX_WORDS,
     )
@@ -52,9 +52,7 @@ def list_licenses():
 @licenses_bp.route("/my")
 @login_required
 def my_licenses():
-    assignments = LicenseService.get_user_licenses(
-        current_user.username, current_user.full_name
-    )
+    assignments = LicenseService.get_user_licenses(current_user)
     return render_template(
         "licenses/my_licenses.html",
         assignments=assignments,
@@ -18,9 +18,9 @@ from app.models.folder import Folder
 from app.models.secret import Secret
 from app.models.share import SecretShare
 from app.models.tag import Tag
-from app.models.user import User
 from app.services.audit_service import AuditService
 from app.services.secret_service import SecretService
+from app.services.share_service import ShareService
 
 secrets_bp = Blueprint("secrets", __name__, url_prefix="/secrets")
 
@@ -117,6 +117,8 @@ def create():
             rotation_interval_days=rotation,
         )
         flash(f"Secret '{secret.name}' created successfully.", "success")
+        for warning in SecretService.password_warnings(request.form.get("secret_password")):
+            flash(warning, "warning")
         return redirect(url_for("secrets.detail", secret_id=secret.id))
 
     folders = Folder.query.filter_by(owner_id=current_user.id).all()
@@ -145,6 +147,7 @@ def detail(secret_id):
         "secrets/detail.html",
         secret=secret,
         shares=shares,
+        inherited_shares=ShareService.inherited_shares(secret),
         is_owner=secret.owner_id == current_user.id,
     )
 
@@ -204,6 +207,8 @@ def edit(secret_id):
 
         SecretService.update_secret(secret, **kwargs)
         flash(f"Secret '{secret.name}' updated successfully.", "success")
+        for warning in SecretService.password_warnings(new_password):
+            flash(warning, "warning")
         return redirect(url_for("secrets.detail", secret_id=secret.id))
 
     folders = Folder.query.filter_by(owner_id=current_user.id).all()
@@ -299,17 +304,11 @@ def share(secret_id):
         flash("Secret shared successfully.", "success")
         return redirect(url_for("secrets.detail", secret_id=secret.id))
 
-    users = User.query.filter(User.id != current_user.id, User.is_active.is_(True)).all()
-    from app.models.group import Group
-
-    groups = Group.query.all()
     existing_shares = SecretShare.query.filter_by(secret_id=secret.id).all()
 
     return render_template(
         "secrets/share.html",
         secret=secret,
-        users=users,
-        groups=groups,
         existing_shares=existing_shares,
     )
 
@@ -0,0 +1,180 @@
+"""Encryption throughput benchmarks.
+
+Measures EncryptionService cost by payload size for both record formats,
+batch decrypt scaling across thread and process pools, and the cost of
+materializing full Secret rows through the model property accessors.
+
+    python -m benchmarks.bench_encryption --output encryption.json
+    python -m benchmarks.bench_encryption --quick --compare encryption.json
+"""
+
+import argparse
+import random
+import string
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from benchmarks.harness import measure, print_table, summarize, write_report
+
+PAYLOADS = {
+    "field_32b": 32,
+    "note_4kb": 4 * 1024,
+    "cert_64kb": 64 * 1024,
+}
+
+SECRET_FIELDS = ("username", "password", "url", "notes", "api_key", "extra_data")
+
+
+def _payload(size, rng):
+    # Certificates and notes are mostly printable, moderately repetitive text.
+    alphabet = string.ascii_letters + string.digits + "+/=\n"
+    return "".join(rng.choice(alphabet) for _ in range(size))
+
+
+def _init_worker(instance_path):
+    from app.services.encryption_service import EncryptionService
+
+    EncryptionService.initialize(instance_path)
+
+
+def _decrypt_chunk(tokens):
+    from app.services.encryption_service import EncryptionService
+
+    return [EncryptionService.decrypt(t) for t in tokens]
+
+
+def bench_payloads(iterations, rng):
+    from app.services.encryption_service import EncryptionService
+
+    results = []
+    for label, size in PAYLOADS.items():
+        n = max(20, iterations // max(1, size // 1024))
+        value = _payload(size, rng)
+        token = EncryptionService.encrypt(value)
+        blob = EncryptionService.encrypt_record({"notes": value}, b"secrets")
+
+        results.append(measure("v1.encrypt", lambda: EncryptionService.encrypt(value),
+                               n, payload=label))
+        results.append(measure("v1.decrypt", lambda: EncryptionService.decrypt(token),
+                               n, payload=label))
+        results.append(measure(
+            "v2.encrypt_record",
+            lambda: EncryptionService.encrypt_record({"notes": value}, b"secrets"),
+            n, payload=label,
+        ))
+        results.append(measure(
+            "v2.decrypt_record",
+            lambda: EncryptionService.decrypt_record(blob, b"secrets"),
+            n, payload=label,
+        ))
+    return results
+
+
+def bench_batch_decrypt(instance_path, batch_size, workers_list, rounds, rng):
+    from app.services.encryption_service import EncryptionService
+
+    tokens = [EncryptionService.encrypt(_payload(64, rng)) for _ in range(batch_size)]
+    results = [measure("batch_decrypt.serial", lambda: _decrypt_chunk(tokens),
+                       rounds, warmup=1, items_per_op=batch_size, batch=batch_size)]
+
+    for workers in workers_list:
+        chunks = [tokens[i::workers] for i in range(workers)]
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results.append(measure(
+                "batch_decrypt.threads",
+                lambda: list(pool.map(_decrypt_chunk, chunks)),
+                rounds, warmup=1, items_per_op=batch_size,
+                batch=batch_size, workers=workers,
+            ))
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(instance_path,)) as pool:
+            results.append(measure(
+                "batch_decrypt.processes",
+                lambda: list(pool.map(_decrypt_chunk, chunks)),
+                rounds, warmup=1, items_per_op=batch_size,
+                batch=batch_size, workers=workers,
+            ))
+    return results
+
+
+def bench_secret_rows(rows, rng):
+    """Time loading Secret rows from SQLite and reading every sensitive field."""
+    from app import create_app, db
+    from app.models.secret import Secret
+
+    app = create_app("testing")
+    results = []
+    with app.app_context():
+        db.create_all()
+        for version in (1, 2):
+            Secret.query.delete()
+            for i in range(rows):
+                secret = Secret(name=f"bench-{i}", category="credential",
+                                owner_id=1, encryption_version=version)
+                secret.username = f"svc_{i}"
+                secret.password = _payload(24, rng)
+                secret.url = f"https://host{i}.company.local/login"
+                secret.notes = _payload(512, rng)
+                secret.api_key = _payload(40, rng)
+                secret.extra_data = {"port": 5432, "env": "prod"}
+                db.session.add(secret)
+            db.session.commit()
+
+            latencies = []
+            for _ in range(5):
+                db.session.expunge_all()
+                start = time.perf_counter_ns()
+                for secret in Secret.query.all():
+                    for field in SECRET_FIELDS:
+                        getattr(secret, field)
+                latencies.append(time.perf_counter_ns() - start)
+            results.append(summarize("secret.materialize", latencies,
+                                     items_per_op=rows, rows=rows,
+                                     encryption_version=version))
+        db.drop_all()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000,
+                        help="operations per small-payload benchmark")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--workers", default="2,4,8",
+                        help="comma-separated pool sizes for batch decrypt")
+    parser.add_argument("--rows", type=int, default=1000,
+                        help="Secret rows for the materialization benchmark")
+    parser.add_argument("--quick", action="store_true",
+                        help="small sizes for a smoke run")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write JSON results to this path")
+    parser.add_argument("--compare", help="previous JSON report to diff against")
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        args.iterations, args.batch_size, args.rows = 200, 500, 100
+
+    from app.services.encryption_service import EncryptionService
+
+    rng = random.Random(args.seed)
+    workers_list = [int(w) for w in args.workers.split(",") if w]
+    rounds = 3 if args.quick else 10
+
+    with tempfile.TemporaryDirectory() as instance_path:
+        EncryptionService.initialize(instance_path)
+        results = bench_payloads(args.iterations, rng)
+        results += bench_batch_decrypt(instance_path, args.batch_size,
+                                       workers_list, rounds, rng)
+    results += bench_secret_rows(args.rows, rng)
+
+    print_table(results, compare_path=args.compare)
+    if args.output:
+        write_report(args.output, "encryption", results, args=vars(args))
+        print(f"\nWrote {len(results)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""End-to-end HTTP load benchmark for the hot endpoints.
+
+Boots ``create_app`` under waitress (as wsgi.py does) against an existing,
+seeded database and drives scripted user journeys from concurrent virtual
+users. Reports RPS, p50/p95/p99 latency and SQL statements per request for
+every endpoint.
+
+    flask --app run.py seed-perf --scale 1          # with DATABASE_URL set
+    python -m benchmarks.bench_http --database-url sqlite:////tmp/perf.db \\
+        --concurrency 16 --duration 60 --output http.json
+"""
+
+import argparse
+import http.cookiejar
+import os
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+
+from benchmarks.harness import print_table, summarize, write_report
+
+_CSRF_RE = re.compile(r'name="csrf_token"[^>]*value="([^"]+)"')
+
+
+class StatementCounter:
+    """Attribute SQL statements to the Flask endpoint that issued them."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.statements = defaultdict(int)
+        self.requests = defaultdict(int)
+
+    def install(self, app, engine):
+        from flask import g, has_request_context, request
+        from sqlalchemy import event
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _count(conn, cursor, statement, parameters, context, executemany):
+            if has_request_context():
+                g.bench_statements = g.get("bench_statements", 0) + 1
+
+        @app.after_request
+        def _record(response):
+            endpoint = request.endpoint or "<unmatched>"
+            with self._lock:
+                self.requests[endpoint] += 1
+                self.statements[endpoint] += g.get("bench_statements", 0)
+            return response
+
+    def per_request(self):
+        return {
+            endpoint: round(self.statements[endpoint] / count, 2)
+            for endpoint, count in self.requests.items()
+        }
+
+
+def boot_server(database_url, threads):
+    """Start the app under waitress in a daemon thread; return (app, base_url)."""
+    os.environ["DATABASE_URL"] = database_url
+
+    from waitress import create_server
+
+    from app import create_app, db, limiter
+
+    app = create_app("development")
+    limiter.enabled = False
+
+    counter = StatementCounter()
+    with app.app_context():
+        counter.install(app, db.engine)
+
+    server = create_server(app, host="127.0.0.1", port=0, threads=threads)
+    threading.Thread(target=server.run, daemon=True).start()
+    return app, counter, f"http://127.0.0.1:{server.effective_port}"
+
+
+def session_cookie_for(app, user_id):
+    """Forge a logged-in session cookie for a seeded (non-LDAP) user."""
+    serializer = app.session_interface.get_signing_serializer(app)
+    return serializer.dumps({"_user_id": str(user_id), "_fresh": True})
+
+
+class VirtualUser:
+    def __init__(self, base_url, rng, secret_ids, session_cookie=None):
+        self.base_url = base_url
+        self.rng = rng
+        self.secret_ids = secret_ids
+        self.cookies = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(self.cookies)
+        )
+        self.csrf_token = None
+        if session_cookie:
+            host = urllib.parse.urlsplit(base_url).hostname
+            self.cookies.set_cookie(http.cookiejar.Cookie(
+                0, "session", session_cookie, None, False, host, False, False,
+                "/", True, False, None, False, None, None, {},
+            ))
+
+    def request(self, label, path, data=None):
+        """Issue one request; return (label, latency_ns, ok, body)."""
+        body = urllib.parse.urlencode(data).encode() if data is not None else None
+        start = time.perf_counter_ns()
+        try:
+            with self.opener.open(self.base_url + path, data=body, timeout=60) as resp:
+                payload = resp.read()
+                ok = resp.status < 400
+        except urllib.error.HTTPError as e:
+            payload, ok = e.read(), False
+        except OSError:
+            payload, ok = b"", False
+        return label, time.perf_counter_ns() - start, ok, payload
+
+    def login(self):
+        label, latency, ok, page = self.request("auth.login[GET]", "/auth/login")
+        results = [(label, latency, ok)]
+        match = _CSRF_RE.search(page.decode("utf-8", "replace"))
+        if match:
+            self.csrf_token = match.group(1)
+        label, latency, ok, _ = self.request(
+            "auth.login[POST]", "/auth/login",
+            {"username": "admin", "password": "admin",
+             "csrf_token": self.csrf_token or ""},
+        )
+        results.append((label, latency, ok))
+        return results
+
+    def journey(self, is_admin):
+        """One scripted pass over the hot pages; yields (label, latency, ok)."""
+        secret_id = self.rng.choice(self.secret_ids) if self.secret_ids else 1
+        steps = [
+            ("dashboard", "/"),
+            ("secrets.list", "/secrets/"),
+            ("secrets.search", "/secrets/?q=" + urllib.parse.quote(self.rng.choice(
+                ["oracle", "prod", "jenkins", "svc", "db"]))),
+        ]
+        for label, path in steps:
+            yield self.request(label, path)[:3]
+
+        label, latency, ok, page = self.request("secrets.detail", f"/secrets/{secret_id}")
+        yield label, latency, ok
+        match = _CSRF_RE.search(page.decode("utf-8", "replace"))
+        if match:
+            self.csrf_token = match.group(1)
+        yield self.request("secrets.copy_password", f"/secrets/{secret_id}/copy-password",
+                           {"csrf_token": self.csrf_token or ""})[:3]
+
+        for label, path in (
+            ("folders.list", "/folders/"),
+            ("api.folders", "/api/v1/folders"),
+            ("api.search", "/api/v1/search?q=" + urllib.parse.quote(self.rng.choice(
+                ["ora", "prod db", "jenk", "svc", "git dr"]))),
+            ("api.secrets.list", "/api/v1/secrets?per_page=50"),
+            ("api.secrets.get", f"/api/v1/secrets/{secret_id}"),
+            ("api.secrets.export", "/api/v1/secrets/export"),
+            ("licenses.list", "/licenses/"),
+            ("audit.logs" if is_admin else "audit.my_logs",
+             "/audit/" if is_admin else "/audit/my"),
+        ):
+            yield self.request(label, path)[:3]
+
+
+def run_load(base_url, app, concurrency, duration, admin_share, seed):
+    from app import db
+    from app.models.secret import Secret
+    from app.models.user import User
+
+    with app.app_context():
+        # The dev login bypass creates "admin" with the default role; make
+        # sure admin journeys actually exercise the admin-only pages.
+        admin = User.query.filter_by(username="admin").first()
+        if not admin:
+            admin = User(username="admin", full_name="Admin User")
+            db.session.add(admin)
+        admin.role = "admin"
+        db.session.commit()
+
+        all_ids = [row[0] for row in db.session.query(Secret.id).limit(50000)]
+        users = (
+            User.query.filter(User.role == "user", User.is_active.is_(True))
+            .order_by(User.id).limit(concurrency).all()
+        )
+        own_ids = {
+            u.id: [row[0] for row in db.session.query(Secret.id)
+                   .filter(Secret.owner_id == u.id).limit(500)]
+            for u in users
+        }
+
+    samples = defaultdict(list)
+    errors = defaultdict(int)
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def record(results):
+        with lock:
+            for label, latency, ok in results:
+                samples[label].append(latency)
+                if not ok:
+                    errors[label] += 1
+
+    def worker(index):
+        rng = random.Random(f"{seed}:{index}")
+        as_admin = not users or rng.random() < admin_share
+        if as_admin:
+            vu = VirtualUser(base_url, rng, all_ids)
+            record(vu.login())
+        else:
+            user = users[index % len(users)]
+            vu = VirtualUser(base_url, rng, own_ids[user.id] or all_ids,
+                             session_cookie=session_cookie_for(app, user.id))
+        while time.monotonic() < deadline:
+            record(list(vu.journey(as_admin)))
+
+    started = time.monotonic()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return samples, errors, time.monotonic() - started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=os.environ.get("DATABASE_URL"),
+                        required=not os.environ.get("DATABASE_URL"),
+                        help="seeded database to serve (see flask seed-perf)")
+    parser.add_argument("--concurrency", type=int, default=8,
+                        help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30.0,
+                        help="seconds to run journeys")
+    parser.add_argument("--threads", type=int, default=8,
+                        help="waitress worker threads")
+    parser.add_argument("--admin-share", type=float, default=0.25,
+                        help="fraction of virtual users logging in as admin")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write JSON results to this path")
+    parser.add_argument("--compare", help="previous JSON report to diff against")
+    args = parser.parse_args(argv)
+
+    app, counter, base_url = boot_server(args.database_url, args.threads)
+    samples, errors, elapsed = run_load(
+        base_url, app, args.concurrency, args.duration, args.admin_share, args.seed
+    )
+
+    statements = counter.per_request()
+    endpoint_of = {
+        "dashboard": "dashboard.index", "secrets.list": "secrets.list_secrets",
+        "secrets.search": "secrets.list_secrets", "secrets.detail": "secrets.detail",
+        "secrets.copy_password": "secrets.copy_password",
+        "folders.list": "folders.list_folders", "api.folders": "api_v1.api_list_folders",
+        "api.search": "api_v1.api_quick_search",
+        "api.secrets.list": "api_v1.api_list_secrets",
+        "api.secrets.get": "api_v1.api_get_secret",
+        "api.secrets.export": "api_v1.api_export_secrets",
+        "licenses.list": "licenses.list_licenses", "audit.logs": "audit.logs",
+        "audit.my_logs": "audit.my_logs", "auth.login[GET]": "auth.login",
+        "auth.login[POST]": "auth.login",
+    }
+
+    results = []
+    for label in sorted(samples):
+        row = summarize(label, samples[label])
+        row["rps"] = round(len(samples[label]) / elapsed, 2)
+        row["errors"] = errors[label]
+        row["statements_per_request"] = statements.get(endpoint_of.get(label))
+        results.append(row)
+
+    total = sum(len(v) for v in samples.values())
+    print(f"{total} requests in {elapsed:.1f}s ({total / elapsed:,.1f} req/s), "
+          f"{sum(errors.values())} errors\n")
+    print_table(results, compare_path=args.compare)
+    print("\nSQL statements per request:")
+    for endpoint, value in sorted(statements.items()):
+        print(f"  {endpoint:<40} {value:>8}")
+
+    if args.output:
+        write_report(
+            args.output, "http", results,
+            args={k: v for k, v in vars(args).items() if k != "database_url"},
+            totals={"requests": total, "seconds": round(elapsed, 2),
+                    "rps": round(total / elapsed, 2), "errors": sum(errors.values())},
+            statements_per_endpoint=statements,
+        )
+        print(f"\nWrote {len(results)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
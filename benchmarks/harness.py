@@ -0,0 +1,115 @@
+"""Shared timing and reporting helpers for the benchmark scripts."""
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def summarize(name, latencies_ns, items_per_op=1, **params):
+    """Build a result row from per-operation latencies in nanoseconds."""
+    latencies = sorted(latencies_ns)
+    total_s = sum(latencies) / 1e9
+    ops = len(latencies)
+    return {
+        "name": name,
+        "params": params,
+        "ops": ops,
+        "ops_per_sec": round(ops / total_s, 2) if total_s else None,
+        "items_per_sec": round(ops * items_per_op / total_s, 2) if total_s else None,
+        "mean_us": round(statistics.fmean(latencies) / 1e3, 2) if latencies else None,
+        "p50_us": round(percentile(latencies, 50) / 1e3, 2),
+        "p95_us": round(percentile(latencies, 95) / 1e3, 2),
+        "p99_us": round(percentile(latencies, 99) / 1e3, 2),
+    }
+
+
+def measure(name, fn, iterations, warmup=10, items_per_op=1, **params):
+    """Call ``fn`` repeatedly and return its latency summary."""
+    for _ in range(warmup):
+        fn()
+    latencies = []
+    clock = time.perf_counter_ns
+    for _ in range(iterations):
+        start = clock()
+        fn()
+        latencies.append(clock() - start)
+    return summarize(name, latencies, items_per_op=items_per_op, **params)
+
+
+def environment():
+    """Describe the machine and revision a run was taken on."""
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=False,
+        ).stdout.strip() or None
+    except OSError:
+        revision = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "revision": revision,
+    }
+
+
+def write_report(path, suite, results, **extra):
+    report = {"suite": suite, "environment": environment(), "results": results}
+    report.update(extra)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+def print_table(results, compare_path=None):
+    """Print results, optionally with the rate change against an older run.
+
+    Rows carrying an ``rps`` value (HTTP benchmarks) are ranked by it instead
+    of the serial ``ops_per_sec`` derived from latencies.
+    """
+    baseline = {}
+    if compare_path:
+        with open(compare_path, encoding="utf-8") as f:
+            for row in json.load(f).get("results", []):
+                baseline[_row_key(row)] = row
+
+    header = f"{'benchmark':<48} {'ops/s':>12} {'p50 us':>10} {'p95 us':>10} {'p99 us':>10}"
+    if baseline:
+        header += f" {'change':>9}"
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        rate = row.get("rps", row["ops_per_sec"]) or 0
+        line = (
+            f"{_row_label(row):<48} {rate:>12,.1f} "
+            f"{row['p50_us']:>10,.1f} {row['p95_us']:>10,.1f} {row['p99_us']:>10,.1f}"
+        )
+        old = baseline.get(_row_key(row))
+        old_rate = old and old.get("rps", old.get("ops_per_sec"))
+        if old_rate:
+            change = (rate - old_rate) / old_rate * 100
+            line += f" {change:>+8.1f}%"
+        print(line)
+
+
+def _row_key(row):
+    return (row["name"], json.dumps(row.get("params", {}), sort_keys=True))
+
+
+def _row_label(row):
+    params = ",".join(f"{k}={v}" for k, v in sorted(row.get("params", {}).items()))
+    return f"{row['name']}[{params}]" if params else row["name"]
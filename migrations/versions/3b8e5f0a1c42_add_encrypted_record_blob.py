@@ -0,0 +1,32 @@
+"""add_encrypted_record_blob
+
+Revision ID: 3b8e5f0a1c42
+Revises: 19aaaec39038
+Create Date: 2026-10-19 09:12:05.221904
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b8e5f0a1c42'
+down_revision = '19aaaec39038'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('secrets', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('encrypted_blob', sa.LargeBinary(), nullable=True))
+
+    with op.batch_alter_table('licenses', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('encrypted_blob', sa.LargeBinary(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('licenses', schema=None) as batch_op:
+        batch_op.drop_column('encrypted_blob')
+
+    with op.batch_alter_table('secrets', schema=None) as batch_op:
+        batch_op.drop_column('encrypted_blob')
@@ -0,0 +1,43 @@
+"""add_trigram_indexes
+
+Revision ID: 5c1d7e2b9f60
+Revises: 3b8e5f0a1c42
+Create Date: 2026-10-19 10:02:41.118230
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '5c1d7e2b9f60'
+down_revision = '3b8e5f0a1c42'
+branch_labels = None
+depends_on = None
+
+# PostgreSQL only: other databases use FuzzySearchService's in-memory index.
+TRIGRAM_COLUMNS = [
+    ('secrets', 'name'),
+    ('secrets', 'url_domain'),
+    ('applications', 'name'),
+    ('applications', 'server_name'),
+    ('licenses', 'name'),
+    ('licenses', 'vendor'),
+]
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for table, column in TRIGRAM_COLUMNS:
+        op.create_index(
+            f'ix_{table}_{column}_trgm', table, [column],
+            postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'},
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table, column in TRIGRAM_COLUMNS:
+        op.drop_index(f'ix_{table}_{column}_trgm', table_name=table)
@@ -0,0 +1,37 @@
+"""add_license_active_seat_count
+
+Revision ID: 7a4e9c3d2b18
+Revises: 5c1d7e2b9f60
+Create Date: 2026-10-19 10:31:12.604519
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a4e9c3d2b18'
+down_revision = '5c1d7e2b9f60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('licenses', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('active_seat_count', sa.Integer(), nullable=False, server_default='0'))
+
+    licenses = sa.table('licenses', sa.column('id'), sa.column('active_seat_count'))
+    assignments = sa.table(
+        'license_assignments', sa.column('license_id'), sa.column('is_active', sa.Boolean)
+    )
+    active = (
+        sa.select(sa.func.count())
+        .where(assignments.c.license_id == licenses.c.id, assignments.c.is_active == sa.true())
+        .scalar_subquery()
+    )
+    op.execute(licenses.update().values(active_seat_count=active))
+
+
+def downgrade():
+    with op.batch_alter_table('licenses', schema=None) as batch_op:
+        batch_op.drop_column('active_seat_count')
@@ -0,0 +1,61 @@
+"""unique_active_license_assignment
+
+Revision ID: 8b2f6d4a7c91
+Revises: 7a4e9c3d2b18
+Create Date: 2026-10-19 11:05:47.390126
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b2f6d4a7c91'
+down_revision = '7a4e9c3d2b18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    licenses = sa.table('licenses', sa.column('id'), sa.column('active_seat_count'))
+    assignments = sa.table(
+        'license_assignments',
+        sa.column('id'),
+        sa.column('license_id'),
+        sa.column('assigned_to'),
+        sa.column('is_active', sa.Boolean),
+    )
+
+    # Deactivate duplicate active assignments (keeping the oldest) so the
+    # unique index can be built, then recount seats.
+    keep = (
+        sa.select(sa.func.min(assignments.c.id))
+        .where(assignments.c.is_active == sa.true())
+        .group_by(assignments.c.license_id, assignments.c.assigned_to)
+    )
+    keep = sa.select(keep.subquery().c[0])
+    op.execute(
+        assignments.update()
+        .where(assignments.c.is_active == sa.true(), assignments.c.id.not_in(keep))
+        .values(is_active=False)
+    )
+    active = (
+        sa.select(sa.func.count())
+        .where(assignments.c.license_id == licenses.c.id, assignments.c.is_active == sa.true())
+        .scalar_subquery()
+    )
+    op.execute(licenses.update().values(active_seat_count=active))
+
+    op.create_index(
+        'uq_license_assignments_active',
+        'license_assignments',
+        ['license_id', 'assigned_to'],
+        unique=True,
+        sqlite_where=sa.text('is_active = 1'),
+        postgresql_where=sa.text('is_active'),
+        mssql_where=sa.text('is_active = 1'),
+    )
+
+
+def downgrade():
+    op.drop_index('uq_license_assignments_active', table_name='license_assignments')
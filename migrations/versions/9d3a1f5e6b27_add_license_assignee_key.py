@@ -0,0 +1,56 @@
+"""add_license_assignee_key
+
+Revision ID: 9d3a1f5e6b27
+Revises: 8b2f6d4a7c91
+Create Date: 2026-10-19 11:48:20.512377
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d3a1f5e6b27'
+down_revision = '8b2f6d4a7c91'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('license_assignments', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('assignee_key', sa.String(length=255), nullable=True))
+        batch_op.create_index(batch_op.f('ix_license_assignments_assignee_key'), ['assignee_key'], unique=False)
+
+    # Resolve existing free text the way LicenseService.assignee_keys does:
+    # ignore case and a leading DOMAIN\, and map a username, email or full
+    # name (in that order of preference) to the username; anything else keys
+    # on its own lowercased text.
+    conn = op.get_bind()
+    users = sa.table('users', sa.column('username'), sa.column('email'), sa.column('full_name'))
+    assignments = sa.table('license_assignments', sa.column('assigned_to'), sa.column('assignee_key'))
+
+    rows = conn.execute(sa.select(users.c.username, users.c.email, users.c.full_name)).all()
+    known = {}
+    for field in (2, 1, 0):  # username last, so it wins
+        for row in rows:
+            if row[field]:
+                known[row[field].casefold()] = row[0].casefold()
+
+    names = conn.execute(
+        sa.select(assignments.c.assigned_to).where(assignments.c.assigned_to.isnot(None)).distinct()
+    ).scalars().all()
+    for name in names:
+        if not name.strip():
+            continue
+        normalized = name.strip().rsplit('\\', 1)[-1].casefold()
+        conn.execute(
+            assignments.update()
+            .where(assignments.c.assigned_to == name)
+            .values(assignee_key=known.get(normalized, normalized))
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('license_assignments', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_license_assignments_assignee_key'))
+        batch_op.drop_column('assignee_key')
@@ -0,0 +1,74 @@
+"""add_license_report_rollups
+
+Revision ID: b4e8c2a6d013
+Revises: 9d3a1f5e6b27
+Create Date: 2026-10-19 14:05:37.218904
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4e8c2a6d013'
+down_revision = '9d3a1f5e6b27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    spend = op.create_table('license_spend_rollups',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('vendor', sa.String(length=255), nullable=False),
+    sa.Column('department', sa.String(length=200), nullable=False),
+    sa.Column('currency', sa.String(length=3), nullable=False),
+    sa.Column('license_count', sa.Integer(), nullable=False),
+    sa.Column('total_cost', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('active_count', sa.Integer(), nullable=False),
+    sa.Column('active_cost', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('vendor', 'department', 'currency', name='uq_license_spend_rollup')
+    )
+    renewals = op.create_table('license_renewal_rollups',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('month', sa.Integer(), nullable=False),
+    sa.Column('currency', sa.String(length=3), nullable=False),
+    sa.Column('license_count', sa.Integer(), nullable=False),
+    sa.Column('total_cost', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('year', 'month', 'currency', name='uq_license_renewal_rollup')
+    )
+
+    # Same aggregates as ReportService.refresh_all.
+    licenses = sa.table('licenses', sa.column('id'), sa.column('vendor'), sa.column('department'),
+                        sa.column('currency'), sa.column('cost'), sa.column('is_active'),
+                        sa.column('expiration_date', sa.DateTime))
+    vendor = sa.func.coalesce(licenses.c.vendor, '')
+    department = sa.func.coalesce(licenses.c.department, '')
+    currency = sa.func.coalesce(licenses.c.currency, '')
+    cost = sa.func.coalesce(licenses.c.cost, 0)
+    active = licenses.c.is_active == sa.true()
+    op.execute(spend.insert().from_select(
+        ['vendor', 'department', 'currency', 'license_count', 'total_cost', 'active_count', 'active_cost'],
+        sa.select(
+            vendor, department, currency,
+            sa.func.count(licenses.c.id),
+            sa.func.sum(cost),
+            sa.func.sum(sa.case((active, 1), else_=0)),
+            sa.func.sum(sa.case((active, cost), else_=0)),
+        ).group_by(vendor, department, currency)
+    ))
+    year = sa.extract('year', licenses.c.expiration_date)
+    month = sa.extract('month', licenses.c.expiration_date)
+    op.execute(renewals.insert().from_select(
+        ['year', 'month', 'currency', 'license_count', 'total_cost'],
+        sa.select(year, month, currency, sa.func.count(licenses.c.id), sa.func.sum(cost))
+        .where(active, licenses.c.expiration_date.isnot(None))
+        .group_by(year, month, currency)
+    ))
+
+
+def downgrade():
+    op.drop_table('license_renewal_rollups')
+    op.drop_table('license_spend_rollups')
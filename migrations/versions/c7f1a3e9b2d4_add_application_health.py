@@ -0,0 +1,38 @@
+"""add_application_health
+
+Revision ID: c7f1a3e9b2d4
+Revises: b4e8c2a6d013
+Create Date: 2026-10-19 15:22:41.093615
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7f1a3e9b2d4'
+down_revision = 'b4e8c2a6d013'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('application_health',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('application_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=10), nullable=False),
+    sa.Column('tcp_ms', sa.Float(), nullable=True),
+    sa.Column('http_status', sa.Integer(), nullable=True),
+    sa.Column('http_ms', sa.Float(), nullable=True),
+    sa.Column('tls_expires_at', sa.DateTime(), nullable=True),
+    sa.Column('error', sa.String(length=255), nullable=True),
+    sa.Column('checked_at', sa.DateTime(), nullable=False),
+    sa.Column('history', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['application_id'], ['applications.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('application_id')
+    )
+
+
+def downgrade():
+    op.drop_table('application_health')
@@ -0,0 +1,38 @@
+"""add_secret_password_hygiene
+
+Revision ID: d5a2b8f4c619
+Revises: c7f1a3e9b2d4
+Create Date: 2026-10-19 16:40:13.518204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5a2b8f4c619'
+down_revision = 'c7f1a3e9b2d4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Fingerprints need the master key and plaintext; existing rows are
+    # filled in by `flask hygiene-backfill`.
+    with op.batch_alter_table('secrets', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('password_fingerprint', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('password_score', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('password_rotate_at', sa.DateTime(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_secrets_password_fingerprint'), ['password_fingerprint'], unique=False)
+        batch_op.create_index(batch_op.f('ix_secrets_password_score'), ['password_score'], unique=False)
+        batch_op.create_index(batch_op.f('ix_secrets_password_rotate_at'), ['password_rotate_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('secrets', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_secrets_password_rotate_at'))
+        batch_op.drop_index(batch_op.f('ix_secrets_password_score'))
+        batch_op.drop_index(batch_op.f('ix_secrets_password_fingerprint'))
+        batch_op.drop_column('password_rotate_at')
+        batch_op.drop_column('password_score')
+        batch_op.drop_column('password_fingerprint')
@@ -0,0 +1,48 @@
+"""add_folder_shares
+
+Revision ID: e8c4f1a7d302
+Revises: d5a2b8f4c619
+Create Date: 2026-10-19 17:25:48.730164
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8c4f1a7d302'
+down_revision = 'd5a2b8f4c619'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('folder_shares',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('folder_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('group_id', sa.Integer(), nullable=True),
+    sa.Column('permission', sa.String(length=20), nullable=True),
+    sa.Column('shared_by_id', sa.Integer(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.CheckConstraint('user_id IS NOT NULL OR group_id IS NOT NULL', name='folder_share_target_check'),
+    sa.ForeignKeyConstraint(['folder_id'], ['folders.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['group_id'], ['groups.id'], ),
+    sa.ForeignKeyConstraint(['shared_by_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('folder_shares', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_folder_shares_folder_id'), ['folder_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_folder_shares_group_id'), ['group_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_folder_shares_user_id'), ['user_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('folder_shares', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_folder_shares_user_id'))
+        batch_op.drop_index(batch_op.f('ix_folder_shares_group_id'))
+        batch_op.drop_index(batch_op.f('ix_folder_shares_folder_id'))
+
+    op.drop_table('folder_shares')
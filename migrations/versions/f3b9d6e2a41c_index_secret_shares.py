@@ -0,0 +1,30 @@
+"""index_secret_shares
+
+Revision ID: f3b9d6e2a41c
+Revises: e8c4f1a7d302
+Create Date: 2026-10-19 18:40:12.518306
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b9d6e2a41c'
+down_revision = 'e8c4f1a7d302'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('secret_shares', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_secret_shares_group_id'), ['group_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_secret_shares_secret_id'), ['secret_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_secret_shares_user_id'), ['user_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('secret_shares', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_secret_shares_user_id'))
+        batch_op.drop_index(batch_op.f('ix_secret_shares_secret_id'))
+        batch_op.drop_index(batch_op.f('ix_secret_shares_group_id'))
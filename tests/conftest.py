@@ -1,6 +1,8 @@
 import pytest
+from flask import g
 
 from app import create_app, db as _db
+from app.models.user import User
 
 
 @pytest.fixture(scope="session")
@@ -22,3 +24,36 @@ def db(app):
     with app.app_context():
         yield _db
         _db.session.rollback()
+
+
+@pytest.fixture
+def make_user(db):
+    """Get or create a user by username (the database is shared by all tests)."""
+
+    def make(username, role="user", **fields):
+        user = User.query.filter_by(username=username).first()
+        if not user:
+            user = User(username=username, full_name=username.title(), role=role, **fields)
+            db.session.add(user)
+            db.session.commit()
+        return user
+
+    return make
+
+
+@pytest.fixture
+def login_as(client, make_user):
+    """Log the test client in as a user (or a username, created on demand)."""
+
+    def login(user, role="user"):
+        if isinstance(user, str):
+            user = make_user(user, role)
+        # The app context outlives requests here, so drop flask-login's
+        # cached user or the previous login would stick.
+        g.pop("_login_user", None)
+        with client.session_transaction() as sess:
+            sess["_user_id"] = str(user.id)
+            sess["_fresh"] = True
+        return user
+
+    return login
@@ -0,0 +1,116 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app.models.folder import Folder
+from app.models.group import Group
+from app.models.share import SecretShare
+from app.services.access_service import AccessService
+from app.services.secret_service import SecretService
+from app.services.share_service import ShareService
+
+
+@contextmanager
+def _statements(db):
+    seen = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        seen.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        yield seen
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+
+
+def test_memberships_resolved_once_per_request(app, db, make_user):
+    owner = make_user("access.owner")
+    member = make_user("access.member")
+    team = Group(name="access team", members=[member])
+    db.session.add(team)
+    db.session.commit()
+    secret = SecretService.create_secret(owner, "Access shared", "note", notes="n")
+    db.session.add(SecretShare(secret_id=secret.id, group_id=team.id, permission="read",
+                               shared_by_id=owner.id))
+    db.session.commit()
+
+    with app.test_request_context():
+        with _statements(db) as seen:
+            for _ in range(3):
+                assert SecretService.can_user_access(secret, member)
+                assert not SecretService.can_user_access(secret, member, require_write=True)
+        assert sum("user_groups" in s for s in seen) <= 1
+        assert sum("secret_shares" in s for s in seen) == 1
+        with _statements(db) as seen:
+            assert secret.id in {s.id for s in SecretService.get_accessible_secrets(member).items}
+        assert not any("user_groups" in s for s in seen)
+        assert AccessService.context(member) is AccessService.context(member)
+
+    # The membership cache is shared by the next request.
+    with app.test_request_context(), _statements(db) as seen:
+        assert SecretService.can_user_access(secret, member)
+    assert not any("user_groups" in s for s in seen)
+
+
+def test_membership_change_applies_at_once(app, db, make_user):
+    owner = make_user("access.owner2")
+    member = make_user("access.member2")
+    team = Group(name="access team2")
+    db.session.add(team)
+    db.session.commit()
+    secret = SecretService.create_secret(owner, "Access grant", "note", notes="n")
+    db.session.add(SecretShare(secret_id=secret.id, group_id=team.id, permission="write",
+                               shared_by_id=owner.id))
+    db.session.commit()
+
+    with app.test_request_context():
+        assert not SecretService.can_user_access(secret, member)
+    team.members.append(member)
+    db.session.commit()
+    with app.test_request_context():
+        assert SecretService.can_user_access(secret, member, require_write=True)
+    db.session.delete(team)
+    db.session.commit()
+    with app.test_request_context():
+        assert not SecretService.can_user_access(secret, member)
+
+
+def test_prefetch_matches_single_checks(app, db, make_user):
+    owner = make_user("access.owner3")
+    member = make_user("access.member3")
+    root = Folder(name="access root", owner_id=owner.id)
+    db.session.add(root)
+    db.session.flush()
+    child = Folder(name="access child", owner_id=owner.id, parent_id=root.id)
+    db.session.add(child)
+    db.session.commit()
+    ShareService.share_folder(root, owner, user_id=member.id, permission="write")
+    inherited = SecretService.create_secret(owner, "Access inherited", "note", notes="n",
+                                            folder_id=child.id)
+    overridden = SecretService.create_secret(owner, "Access overridden", "note", notes="n",
+                                             folder_id=child.id)
+    loose = SecretService.create_secret(owner, "Access loose", "note", notes="n")
+    mine = SecretService.create_secret(member, "Access mine", "note", notes="n")
+    db.session.add(SecretShare(secret_id=overridden.id, user_id=member.id, permission="read",
+                               shared_by_id=owner.id))
+    db.session.commit()
+    secrets = [inherited, overridden, loose, mine]
+    ids = [s.id for s in secrets]
+
+    with app.test_request_context():
+        access = AccessService.context(member)
+        with _statements(db) as seen:
+            access.prefetch(ids + [10 ** 9])
+            answers = [(access.can_access(i), access.can_access(i, require_write=True))
+                       for i in ids]
+            assert not access.can_access(10 ** 9)
+        assert len(seen) == 3
+    assert answers == [(True, True), (True, False), (False, False), (True, True)]
+
+    with app.test_request_context():
+        assert answers == [
+            (SecretService.can_user_access(s, member),
+             SecretService.can_user_access(s, member, require_write=True))
+            for s in secrets
+        ]
@@ -0,0 +1,86 @@
+from sqlalchemy import event
+
+from app.models.application import Application
+from app.models.user import User
+from app.services.application_service import FACET_FIELDS, ApplicationService
+
+
+def _seed(db):
+    owner = User.query.filter_by(username="facet.admin").first()
+    if owner:
+        return owner
+    owner = User(username="facet.admin", full_name="Facet Admin", role="admin")
+    db.session.add(owner)
+    db.session.commit()
+    rows = [
+        ("Facetdemo Billing", "Finance", "Mission Critical", "java", "active"),
+        ("Facetdemo Ledger", "Finance", "Business Critical", "java", "active"),
+        ("Facetdemo Portal", "Sales", "Mission Critical", "python", "active"),
+        ("Facetdemo Archive", "Sales", "Administrative", "java", "inactive"),
+    ]
+    for name, department, criticality, platform, status in rows:
+        db.session.add(Application(name=name, department=department, criticality=criticality,
+                                   platform=platform, status=status, created_by_id=owner.id))
+    db.session.commit()
+    return owner
+
+
+def test_facet_counts_exclude_own_filter(db):
+    _seed(db)
+    facets = ApplicationService.facet_counts(
+        q="facetdemo", filters={"department": "Finance", "platform": "java"}
+    )
+    assert set(facets) == set(FACET_FIELDS)
+    # department ignores its own filter but honours platform=java
+    assert facets["department"] == [("Finance", 2), ("Sales", 1)]
+    # platform ignores its own filter but honours department=Finance
+    assert facets["platform"] == [("java", 2)]
+    assert facets["criticality"] == [("Business Critical", 1), ("Mission Critical", 1)]
+    assert facets["sla_level"] == []
+
+    page = ApplicationService.get_applications(
+        q="facetdemo", filters={"department": "Finance", "criticality": "Mission Critical"}
+    )
+    assert [a.name for a in page.items] == ["Facetdemo Billing"]
+
+
+def test_facet_counts_use_one_query(db):
+    _seed(db)
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", capture)
+    try:
+        ApplicationService.facet_counts(filters={"status": "active"})
+    finally:
+        event.remove(db.engine, "before_cursor_execute", capture)
+    assert len(statements) == 1 and statements[0].count("UNION ALL") == len(FACET_FIELDS) - 1
+
+
+def test_list_page_shows_facets(client, db, login_as):
+    owner = _seed(db)
+    login_as(owner)
+
+    page = client.get("/applications/?q=facetdemo&department=Sales").get_data(as_text=True)
+    assert "Facetdemo Portal" in page and "Facetdemo Billing" not in page
+    assert '<option value="Sales" selected>Sales (2)</option>' in page
+    assert '<option value="Finance" >Finance (2)</option>' in page
+
+
+def test_status_and_platform_filters(client, db, login_as):
+    login_as(_seed(db))
+
+    page = ApplicationService.get_applications(q="facetdemo", filters={"status": "inactive"})
+    assert [a.name for a in page.items] == ["Facetdemo Archive"]
+    page = ApplicationService.get_applications(q="facetdemo", platform="python")
+    assert [a.name for a in page.items] == ["Facetdemo Portal"]
+    page = ApplicationService.get_applications(q="facetdemo", status="active",
+                                               filters={"platform": "java"})
+    assert [a.name for a in page.items] == ["Facetdemo Billing", "Facetdemo Ledger"]
+
+    html = client.get("/applications/?q=facetdemo&status=inactive").get_data(as_text=True)
+    assert "Facetdemo Archive" in html and "Facetdemo Portal" not in html
+    html = client.get("/applications/?q=facetdemo&platform=python").get_data(as_text=True)
+    assert "Facetdemo Portal" in html and "Facetdemo Billing" not in html
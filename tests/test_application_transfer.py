@@ -0,0 +1,103 @@
+import csv
+import io
+import json
+
+from sqlalchemy import func
+
+from app.models.application import Application
+from app.models.audit_log import AuditLog
+from app.models.user import User
+from app.services.application_service import ApplicationService
+
+
+def test_import_upserts_by_name_and_server(db):
+    user = User(username="transfer.cmdb", full_name="CMDB Sync", role="admin")
+    db.session.add(user)
+    db.session.commit()
+    db.session.add(Application(name="Transfer CRM", server_name="crm01", port=8080,
+                               department="Sales", created_by_id=user.id))
+    db.session.commit()
+
+    rows = [
+        {"name": "Transfer CRM", "server_name": "crm01", "port": "8443", "department": "Sales"},
+        {"name": "Transfer CRM", "server_name": "crm02", "port": "8443"},
+        {"name": "Transfer CRM", "server_name": "crm02", "port": "9999"},
+        {"name": "Transfer ERP", "maintenance_date": "2031-02-03", "status": "inactive"},
+        {"name": "", "server_name": "nameless"},
+        {"name": "Transfer Bad", "port": "http"},
+    ]
+    preview = ApplicationService.import_applications(rows, user, dry_run=True, chunk_size=2)
+    assert (preview["created"], preview["updated"], preview["skipped"]) == (2, 1, 1)
+    assert preview["preview"][0] == {"action": "update", "id": preview["preview"][0]["id"],
+                                     "name": "Transfer CRM", "server_name": "crm01",
+                                     "changes": {"port": [8080, 8443]}}
+    assert [e["row"] for e in preview["errors"]] == [5, 6]
+    assert Application.query.filter(Application.name.like("Transfer %")).count() == 1
+
+    done = []
+    summary = ApplicationService.import_applications(rows, user, chunk_size=2, progress=done.append)
+    assert (summary["created"], summary["updated"], summary["unchanged"]) == (2, 1, 0)
+    assert done == [2, 6]
+    apps = {(a.name, a.server_name): a for a in
+            Application.query.filter(Application.name.like("Transfer %"))}
+    assert apps[("Transfer CRM", "crm01")].port == 8443
+    assert apps[("Transfer CRM", "crm01")].department == "Sales"
+    assert apps[("Transfer CRM", "crm02")].port == 8443
+    assert apps[("Transfer ERP", None)].status == "inactive"
+    assert apps[("Transfer ERP", None)].created_by_id == user.id
+    assert AuditLog.query.filter_by(action="applications_imported", user_id=user.id).count() == 2
+
+    again = ApplicationService.import_applications(rows[:4], user)
+    assert (again["created"], again["updated"], again["unchanged"]) == (0, 0, 3)
+
+    # Keys compare without case, as under SQL Server's default collation.
+    cased = ApplicationService.import_applications(
+        [{"name": "transfer crm", "server_name": "CRM01", "port": "8444"},
+         {"name": "TRANSFER CRM", "server_name": "crm01", "port": "1"}], user, chunk_size=10 ** 6
+    )
+    assert (cased["created"], cased["updated"], cased["skipped"]) == (0, 1, 1)
+    assert Application.query.filter(func.lower(Application.name) == "transfer crm").count() == 2
+    assert apps[("Transfer CRM", "crm01")].port == 8444
+    assert [a.name for a in ApplicationService.get_applications(q="Transfer ERP").items] == [
+        "Transfer ERP"
+    ]
+
+
+def test_export_streams_csv_and_ndjson(client, db, login_as):
+    user = login_as("transfer.admin", "admin")
+    db.session.add(Application(name="Transfer Export", server_name="exp01", port=443,
+                               created_by_id=user.id))
+    db.session.commit()
+
+    response = client.get("/api/v1/applications/export?format=csv")
+    assert response.is_streamed
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    row = next(r for r in rows if r["name"] == "Transfer Export")
+    assert row["server_name"] == "exp01" and row["port"] == "443"
+
+    response = client.get("/api/v1/applications/export?format=ndjson")
+    records = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert {"name": "Transfer Export", "server_name": "exp01"}.items() <= next(
+        r for r in records if r["name"] == "Transfer Export").items()
+    assert client.get("/api/v1/applications/export?format=xml").status_code == 400
+
+
+def test_import_api_accepts_ndjson_with_dry_run(client, db, login_as):
+    login_as("transfer.admin", "admin")
+    body = "\n".join(json.dumps(r) for r in [
+        {"name": "Transfer Api", "server_name": "api01", "url": "https://api01"},
+        {"name": "Transfer Api", "server_name": "api01"},
+    ])
+    response = client.post("/api/v1/applications/import?dry_run=1", data=body,
+                           content_type="application/x-ndjson")
+    data = response.get_json()["data"]
+    assert data["dry_run"] and data["created"] == 1 and data["skipped"] == 1
+    assert data["preview"][0]["changes"] == {"url": [None, "https://api01"]}
+    assert not Application.query.filter_by(name="Transfer Api").count()
+
+    response = client.post("/api/v1/applications/import", data=body,
+                           content_type="application/x-ndjson")
+    assert response.get_json()["data"]["created"] == 1
+    assert Application.query.filter_by(name="Transfer Api").one().url == "https://api01"
+    assert client.post("/api/v1/applications/import", data="",
+                       content_type="text/csv").status_code == 400
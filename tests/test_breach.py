@@ -0,0 +1,68 @@
+import hashlib
+
+import pytest
+
+from app.services.breach_service import BreachService
+from app.services.password_generator import PasswordGenerator
+
+BREACHED = ["Password2024!", "letmein", "Summer2023?", "hunter2"]
+
+
+def _line(password, count=1):
+    return f"{hashlib.sha1(password.encode()).hexdigest().upper()}:{count}\n"
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    previous = (BreachService._path, BreachService._index)
+    BreachService._path, BreachService._index = tmp_path / "pwned.bin", None
+    BreachService._checked_at = float("-inf")
+    noise = [_line(f"noise-{i}") for i in range(300)]
+    lines = noise[:150] + [_line(p, 9) for p in BREACHED] + noise[150:] + [_line("letmein")]
+    yield tmp_path, lines
+    BreachService._path, BreachService._index = previous
+    BreachService._checked_at = float("-inf")
+
+
+@pytest.mark.parametrize("bloom", [None, 0.01])
+def test_build_and_lookup(corpus, bloom):
+    tmp_path, lines = corpus
+    count = BreachService.build(iter(lines + ["garbage\n"]), tmp_path / "pwned.bin",
+                                chunk_size=64, bloom_error_rate=bloom)
+    assert count == 304
+    assert (tmp_path / "pwned.bin").stat().st_size == 304 * 20
+    assert BreachService.stats()["bloom"] is bool(bloom)
+
+    for password in BREACHED:
+        assert BreachService.is_breached(password) is True
+    assert BreachService.is_breached("noise-299") is True
+    assert BreachService.is_breached("correct horse battery staple") is False
+    assert BreachService.is_breached("") is None
+
+
+def test_rebuild_is_picked_up(corpus):
+    tmp_path, lines = corpus
+    BreachService.build(iter(lines[:10]), tmp_path / "pwned.bin")
+    assert BreachService.is_breached("hunter2") is False
+    BreachService.build(iter(lines), tmp_path / "pwned.bin")
+    assert BreachService.is_breached("hunter2") is True
+
+
+def test_strength_and_secret_api_flag_breached(corpus, client, db, login_as):
+    tmp_path, lines = corpus
+    BreachService.build(iter(lines), tmp_path / "pwned.bin")
+
+    result = PasswordGenerator.calculate_strength("Password2024!")
+    assert result["breached"] is True and result["strength"] == "weak"
+    assert result["feedback"][0] == "Found in a known data breach"
+    assert PasswordGenerator.calculate_strength("xT9#qLm2$vR8!pZw")["breached"] is False
+
+    login_as("breach.writer")
+    response = client.post("/api/v1/secrets", json={"name": "Breach demo", "password": "hunter2"})
+    assert response.status_code == 201
+    assert response.get_json()["warnings"]
+
+
+def test_missing_index_is_unknown(corpus):
+    assert BreachService.is_breached("hunter2") is None
+    assert PasswordGenerator.calculate_strength("hunter2")["breached"] is None
@@ -0,0 +1,112 @@
+from app.models.audit_log import AuditLog
+from app.models.folder import Folder
+from app.models.group import Group
+from app.models.share import SecretShare
+from app.services.secret_service import SecretService
+
+
+def _shares(secret_ids, **target):
+    return SecretShare.query.filter(SecretShare.secret_id.in_(secret_ids)).filter_by(**target).all()
+
+
+def test_bulk_share_by_ids_upserts_and_skips_foreign(client, db, make_user, login_as):
+    owner = make_user("bulk.owner")
+    grantee = make_user("bulk.grantee")
+    stranger = make_user("bulk.stranger")
+    mine = [SecretService.create_secret(owner, f"Bulk {i}", "note", notes="n") for i in range(4)]
+    theirs = SecretService.create_secret(stranger, "Bulk foreign", "note", notes="n")
+    ids = [s.id for s in mine]
+    login_as(owner)
+
+    body = {"secret_ids": ids[:2], "user_id": grantee.id, "permission": "read"}
+    assert client.post("/api/v1/shares/bulk", json=body).get_json()["data"] == {
+        "created": 2, "updated": 0,
+    }
+
+    # Repeating over a wider selection updates existing grants in place.
+    body = {"secret_ids": ids + [theirs.id], "user_id": grantee.id, "permission": "write",
+            "expires_at": "2031-01-01T00:00:00"}
+    assert client.post("/api/v1/shares/bulk", json=body).get_json()["data"] == {
+        "created": 2, "updated": 2,
+    }
+    shares = _shares(ids + [theirs.id], user_id=grantee.id)
+    assert sorted(s.secret_id for s in shares) == ids
+    assert {(s.permission, s.expires_at.year, s.shared_by_id) for s in shares} == {
+        ("write", 2031, owner.id)
+    }
+    assert SecretService.can_user_access(mine[3], grantee, require_write=True)
+    assert AuditLog.query.filter_by(action="secrets_bulk_shared", user_id=owner.id).count() == 2
+
+    removed = client.delete("/api/v1/shares/bulk",
+                            json={"secret_ids": ids[:3], "user_id": grantee.id})
+    assert removed.get_json()["data"] == {"removed": 3}
+    assert [s.secret_id for s in _shares(ids, user_id=grantee.id)] == [ids[3]]
+    assert AuditLog.query.filter_by(action="secrets_bulk_unshared", user_id=owner.id).count() == 1
+
+
+def test_bulk_share_by_filter(client, db, make_user, login_as):
+    owner = make_user("bulk.filter")
+    team = Group(name="bulk filter team")
+    db.session.add(team)
+    folder = Folder(name="bulk filter folder", owner_id=owner.id)
+    db.session.add(folder)
+    db.session.commit()
+    inside = [
+        SecretService.create_secret(owner, f"Bulk filtered {i}", "api_key", api_key="k",
+                                    folder_id=folder.id)
+        for i in range(3)
+    ]
+    outside = SecretService.create_secret(owner, "Bulk unfiltered", "note", notes="n",
+                                          folder_id=folder.id)
+    login_as(owner)
+
+    body = {"filter": {"folder_id": folder.id, "category": "api_key"}, "group_id": team.id}
+    assert client.post("/api/v1/shares/bulk", json=body).get_json()["data"]["created"] == 3
+    assert {s.secret_id for s in _shares([s.id for s in inside] + [outside.id],
+                                         group_id=team.id)} == {s.id for s in inside}
+
+    body = {"filter": {"folder_id": folder.id}, "group_id": team.id}
+    assert client.delete("/api/v1/shares/bulk", json=body).get_json()["data"] == {"removed": 3}
+
+
+def test_bulk_share_validation(client, db, make_user, login_as):
+    owner = make_user("bulk.validate")
+    other = make_user("bulk.validate.other")
+    gone = make_user("bulk.validate.gone", is_active=False)
+    secret = SecretService.create_secret(owner, "Bulk validate", "note", notes="n")
+    login_as(owner)
+
+    for body in (
+        {"user_id": other.id},
+        {"secret_ids": "1,2", "user_id": other.id},
+        {"secret_ids": [secret.id]},
+        {"secret_ids": [secret.id], "user_id": other.id, "group_id": 1},
+        {"secret_ids": [secret.id], "user_id": gone.id},
+        {"secret_ids": [secret.id], "user_id": other.id, "permission": "admin"},
+    ):
+        response = client.post("/api/v1/shares/bulk", json=body)
+        assert response.status_code == 400, body
+    assert _shares([secret.id]) == []
+
+
+def test_share_targets_are_searched_and_paged(client, db, make_user, login_as):
+    me = make_user("targets.me")
+    for i in range(5):
+        make_user(f"targets.user{i}")
+    make_user("targets.inactive", is_active=False)
+    db.session.add(Group(name="targets group"))
+    db.session.commit()
+    login_as(me)
+
+    first = client.get("/api/v1/shares/targets?q=targets&per_page=4").get_json()
+    assert first["pagination"]["total"] == 6
+    assert first["pagination"]["pages"] == 2
+    assert first["data"][0] == {"kind": "group", "id": first["data"][0]["id"],
+                                "name": "targets group", "detail": None}
+    second = client.get("/api/v1/shares/targets?q=targets&per_page=4&page=2").get_json()
+    names = [t["name"] for t in first["data"][1:] + second["data"]]
+    assert names == [f"targets.user{i}" for i in range(5)]
+
+    page = client.get(f"/secrets/{SecretService.create_secret(me, 'T', 'note', notes='n').id}/share")
+    assert b"targets.user0" not in page.data
+    assert b"api/v1/shares/targets" in page.data
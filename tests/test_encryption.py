@@ -1,4 +1,9 @@
+import pytest
+
+from app.models.license import License
+from app.models.secret import Secret
 from app.services.encryption_service import EncryptionService
+from app.services.record_migration_service import RecordMigrationService
 
 
 def test_encrypt_decrypt(app):
@@ -41,3 +46,145 @@ def test_different_plaintexts_different_ciphertexts(app):
         # But both decrypt to the same value
         assert EncryptionService.decrypt(enc1) == plaintext
         assert EncryptionService.decrypt(enc2) == plaintext
+
+
+def test_record_roundtrip(app):
+    """Test v2 record encrypt/decrypt cycle."""
+    with app.app_context():
+        record = {"username": "svc_app", "password": "Türkçe!", "extra_data": {"port": 22}}
+        blob = EncryptionService.encrypt_record(record, b"secrets")
+
+        assert isinstance(blob, bytes)
+        assert blob[0] == 2
+        assert EncryptionService.decrypt_record(blob, b"secrets") == record
+
+
+def test_record_compresses_large_payloads(app):
+    """Test large, repetitive notes are compressed before encryption."""
+    with app.app_context():
+        notes = "-----BEGIN CERTIFICATE-----\n" + "MIIB" * 4000
+        blob = EncryptionService.encrypt_record({"notes": notes}, b"secrets")
+
+        assert blob[1] & 0x01
+        assert len(blob) < len(notes)
+        assert EncryptionService.decrypt_record(blob, b"secrets")["notes"] == notes
+
+
+def test_record_bound_to_context(app):
+    """Test a blob cannot be decrypted under a different record type."""
+    with app.app_context():
+        blob = EncryptionService.encrypt_record({"license_key": "X"}, b"licenses")
+        with pytest.raises(ValueError):
+            EncryptionService.decrypt_record(blob, b"secrets")
+
+
+def test_secret_v2_fields(db):
+    """Test Secret property accessors on the v2 record format."""
+    secret = Secret(name="v2", category="credential", owner_id=1, encryption_version=2)
+    secret.username = "alice"
+    secret.password = "s3cret!"
+    secret.extra_data = {"host": "db01"}
+    db.session.add(secret)
+    db.session.commit()
+    db.session.expire(secret)
+
+    assert secret.encrypted_username is None
+    assert secret.encrypted_password is None
+    assert secret.has_password
+    assert secret.username == "alice"
+    assert secret.password == "s3cret!"
+    assert secret.extra_data == {"host": "db01"}
+
+    secret.password = None
+    assert not secret.has_password
+    assert secret.username == "alice"
+
+
+def test_migrate_v1_secrets(db):
+    """Test the batch migrator converts v1 rows without losing data."""
+    secret = Secret(name="legacy", category="credential", owner_id=1, encryption_version=1)
+    secret.username = "bob"
+    secret.password = "legacy-pass"
+    secret.notes = "rotate quarterly"
+    db.session.add(secret)
+    db.session.commit()
+    secret_id = secret.id
+    assert secret.encrypted_password
+    # Rows written before the hygiene columns existed have no fingerprint.
+    db.session.execute(
+        Secret.__table__.update().where(Secret.id == secret_id)
+        .values(password_fingerprint=None, password_score=None)
+    )
+    db.session.commit()
+
+    converted = RecordMigrationService.migrate_secrets(batch_size=1)
+    assert converted >= 1
+
+    migrated = db.session.get(Secret, secret_id)
+    assert migrated.encryption_version == 2
+    assert migrated.encrypted_password is None
+    assert migrated.username == "bob"
+    assert migrated.password == "legacy-pass"
+    assert migrated.notes == "rotate quarterly"
+    assert migrated.password_fingerprint == EncryptionService.fingerprint("legacy-pass")
+    assert migrated.password_score is not None
+
+
+def test_legacy_null_version_reads_as_v1(db):
+    """Test a stored row without a version is read as v1 and left alone."""
+    secret = Secret(name="unversioned", category="credential", owner_id=1, encryption_version=1)
+    secret.password = "old-pass"
+    db.session.add(secret)
+    db.session.commit()
+    db.session.execute(
+        Secret.__table__.update().where(Secret.id == secret.id).values(encryption_version=None)
+    )
+    db.session.commit()
+    db.session.expire(secret)
+
+    assert secret.password == "old-pass"
+    assert secret.encryption_version is None
+    assert secret not in db.session.dirty
+
+
+def test_legacy_null_version_license_reads_as_v1(db, monkeypatch):
+    """Test a stored license without a version keeps its v1 key."""
+    lic = License(name="unversioned license", created_by_id=1, encryption_version=1)
+    lic.license_key = "AAAA-BBBB"
+    db.session.add(lic)
+    db.session.commit()
+    db.session.execute(
+        License.__table__.update().where(License.id == lic.id).values(encryption_version=None)
+    )
+    db.session.commit()
+    db.session.expire(lic)
+    monkeypatch.setattr(EncryptionService, "record_version", 2)
+
+    assert lic.license_key == "AAAA-BBBB"
+    assert lic.encryption_version is None
+    assert lic not in db.session.dirty
+    db.session.execute(License.__table__.delete().where(License.id == lic.id))
+    db.session.commit()
+
+
+def test_stale_passwords_skip_v2_secrets_without_password(db):
+    """Test rotation reminders only cover secrets that hold a password."""
+    from datetime import datetime, timedelta, timezone
+
+    from app.services.notification_service import NotificationService
+
+    long_ago = datetime.now(timezone.utc) - timedelta(days=400)
+    with_password = Secret(name="stale pw", category="credential", owner_id=1,
+                           encryption_version=2, rotation_interval_days=30)
+    with_password.password = "rotate-me"
+    username_only = Secret(name="stale user", category="credential", owner_id=1,
+                           encryption_version=2, rotation_interval_days=30)
+    username_only.username = "svc_only"
+    for secret in (with_password, username_only):
+        secret.password_last_changed = long_ago
+    db.session.add_all([with_password, username_only])
+    db.session.commit()
+
+    stale = {s.id for s in NotificationService.get_stale_passwords()}
+    assert with_password.id in stale
+    assert username_only.id not in stale
@@ -0,0 +1,153 @@
+from datetime import datetime, timedelta, timezone
+
+from app.models.audit_log import AuditLog
+from app.models.folder import Folder
+from app.models.group import Group
+from app.models.share import FolderShare, SecretShare
+from app.services.secret_service import SecretService
+from app.services.share_service import ShareService
+
+
+def _tree(db, owner, prefix):
+    root = Folder(name=f"{prefix} root", owner_id=owner.id)
+    db.session.add(root)
+    db.session.flush()
+    child = Folder(name=f"{prefix} child", owner_id=owner.id, parent_id=root.id)
+    db.session.add(child)
+    db.session.flush()
+    leaf = Folder(name=f"{prefix} leaf", owner_id=owner.id, parent_id=child.id)
+    db.session.add(leaf)
+    db.session.commit()
+    return root, child, leaf
+
+
+def _visible(user, **kwargs):
+    return {s.id for s in SecretService.get_accessible_secrets(user, per_page=1000, **kwargs).items}
+
+
+def test_folder_share_covers_subtree_and_new_secrets(db, make_user):
+    owner = make_user("fshare.owner")
+    member = make_user("fshare.member")
+    outsider = make_user("fshare.outsider")
+    team = Group(name="fshare team", members=[member])
+    db.session.add(team)
+    db.session.commit()
+    root, child, leaf = _tree(db, owner, "fshare")
+    deep = SecretService.create_secret(owner, "fshare deep", "credential", password="x",
+                                       folder_id=leaf.id)
+    loose = SecretService.create_secret(owner, "fshare loose", "credential", password="x")
+
+    ShareService.share_folder(child, owner, group_id=team.id)
+
+    assert SecretService.can_user_access(deep, member)
+    assert not SecretService.can_user_access(deep, member, require_write=True)
+    assert not SecretService.can_user_access(deep, outsider)
+    assert not SecretService.can_user_access(loose, member)
+
+    # A secret created later under the shared subtree is visible at once.
+    later = SecretService.create_secret(owner, "fshare later", "note", notes="n",
+                                        folder_id=child.id)
+    above = SecretService.create_secret(owner, "fshare above", "note", notes="n",
+                                        folder_id=root.id)
+    assert {deep.id, later.id} <= _visible(member)
+    assert {deep.id, later.id} <= _visible(member, shared_only=True)
+    assert not {above.id, loose.id} & _visible(member)
+    assert FolderShare.query.filter_by(folder_id=child.id).count() == 1
+    assert SecretShare.query.filter(SecretShare.secret_id.in_([deep.id, later.id])).count() == 0
+    assert AuditLog.query.filter_by(action="folder_shared", resource_id=child.id).count() == 1
+
+
+def test_explicit_share_overrides_and_extends(db, make_user):
+    owner = make_user("fshare.owner2")
+    member = make_user("fshare.member2")
+    _, child, leaf = _tree(db, owner, "fshare2")
+    pinned = SecretService.create_secret(owner, "fshare2 pinned", "credential", password="x",
+                                         folder_id=leaf.id)
+    other = SecretService.create_secret(owner, "fshare2 other", "credential", password="x",
+                                        folder_id=leaf.id)
+    loose = SecretService.create_secret(owner, "fshare2 loose", "credential", password="x")
+    ShareService.share_folder(child, owner, user_id=member.id, permission="write")
+    db.session.add_all([
+        SecretShare(secret_id=pinned.id, user_id=member.id, permission="read",
+                    shared_by_id=owner.id),
+        SecretShare(secret_id=loose.id, user_id=member.id, permission="write",
+                    shared_by_id=owner.id),
+    ])
+    db.session.commit()
+
+    assert SecretService.can_user_access(other, member, require_write=True)
+    assert SecretService.can_user_access(pinned, member)
+    assert not SecretService.can_user_access(pinned, member, require_write=True)
+    assert SecretService.can_user_access(loose, member, require_write=True)
+    assert [s.folder_id for s in ShareService.inherited_shares(pinned)] == [child.id]
+
+
+def test_expired_share_and_parent_cycle(db, make_user):
+    owner = make_user("fshare.owner3")
+    member = make_user("fshare.member3")
+    root, child, leaf = _tree(db, owner, "fshare3")
+    secret = SecretService.create_secret(owner, "fshare3 secret", "credential", password="x",
+                                         folder_id=leaf.id)
+    ShareService.share_folder(root, owner, user_id=member.id,
+                              expires_at=datetime.now(timezone.utc) - timedelta(days=1))
+    assert not SecretService.can_user_access(secret, member)
+    assert secret.id not in _visible(member)
+
+    # A parent cycle must not make the recursive lookups loop.
+    root.parent_id = leaf.id
+    db.session.commit()
+    ShareService.share_folder(child, owner, user_id=member.id)
+    assert SecretService.can_user_access(secret, member)
+    assert secret.id in _visible(member)
+
+
+def test_folder_share_api(client, db, make_user, login_as):
+    owner = make_user("fshare.api", role="admin")
+    grantee = make_user("fshare.api.grantee")
+    folder = Folder(name="fshare api", owner_id=owner.id)
+    db.session.add(folder)
+    db.session.commit()
+    login_as(owner)
+
+    url = f"/api/v1/folders/{folder.id}/shares"
+    assert client.post(url, json={"permission": "write"}).status_code == 400
+    assert client.post(url, json={"user_id": 10 ** 9}).status_code == 400
+    assert client.post(url, json={"group_id": 10 ** 9}).status_code == 400
+    team = Group(name="fshare api team")
+    db.session.add(team)
+    db.session.commit()
+    both = client.post(url, json={"user_id": grantee.id, "group_id": team.id})
+    assert both.status_code == 400
+    first = client.post(url, json={"user_id": grantee.id, "permission": "read"})
+    assert first.status_code == 201
+    # Sharing again with the same user updates the grant in place.
+    created = client.post(url, json={"user_id": grantee.id, "permission": "write"})
+    assert created.get_json()["data"]["id"] == first.get_json()["data"]["id"]
+    shares = client.get(url).get_json()["data"]
+    assert [(s["user_id"], s["permission"]) for s in shares] == [(grantee.id, "write")]
+
+    assert client.delete(f"{url}/{shares[0]['id']}").get_json()["success"]
+    assert client.get(url).get_json()["data"] == []
+    assert AuditLog.query.filter_by(action="folder_unshared", resource_id=folder.id).count() == 1
+
+
+def test_folder_share_form_validates_input(client, db, make_user, login_as):
+    owner = login_as("fshare.form")
+    grantee = make_user("fshare.form.grantee")
+    inactive = make_user("fshare.form.inactive", is_active=False)
+    team = Group(name="fshare form team")
+    folder = Folder(name="fshare form", owner_id=owner.id)
+    db.session.add_all([team, folder])
+    db.session.commit()
+
+    url = f"/folders/{folder.id}/share"
+    for form in ({"user_id": grantee.id, "permission": "admin"},
+                 {"user_id": 10 ** 9}, {"user_id": inactive.id}, {"group_id": 10 ** 9},
+                 {"user_id": grantee.id, "group_id": team.id}):
+        assert client.post(url, data=form).status_code == 302
+    assert FolderShare.query.filter_by(folder_id=folder.id).count() == 0
+
+    client.post(url, data={"group_id": team.id})
+    client.post(url, data={"group_id": team.id, "permission": "write"})
+    db.session.expire(folder)
+    assert [(s.group_id, s.permission) for s in folder.shares] == [(team.id, "write")]
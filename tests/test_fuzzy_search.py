@@ -0,0 +1,55 @@
+import pytest
+
+from app.services.application_service import ApplicationService
+from app.services.fuzzy_search_service import FuzzySearchService, trigrams
+from app.services.license_service import LicenseService
+from app.services.quick_search_service import QuickSearchService
+
+
+@pytest.fixture
+def fuzzy():
+    FuzzySearchService.reset()
+    QuickSearchService.reset()
+    yield FuzzySearchService
+    FuzzySearchService.reset()
+    QuickSearchService.reset()
+
+
+def test_trigrams_ignore_separators():
+    assert trigrams("jenkins-prod") == trigrams("Jenkins_PROD")
+    assert "  o" in trigrams("oracle")
+
+
+def test_typo_falls_back_to_similarity(db, fuzzy, make_user):
+    owner = make_user("fuzzy.owner", "admin")
+    ApplicationService.create_application(owner, name="Orcaleum Billing", server_name="bill-db-01")
+    ApplicationService.create_application(owner, name="Unrelated tool")
+
+    names = [a.name for a in ApplicationService.get_applications(q="orcalem").items]
+    assert names == ["Orcaleum Billing"]
+
+    # The posting lists follow later commits.
+    ApplicationService.create_application(owner, name="Zanzibar_prod")
+    assert [a.name for a in ApplicationService.get_applications(q="zanzibr").items] == ["Zanzibar_prod"]
+
+
+def test_exact_matches_skip_fuzzy(db, fuzzy, monkeypatch, make_user):
+    owner = make_user("fuzzy.exact", "admin")
+    LicenseService.create_license(owner, name="Quillvector Suite", vendor="Quill")
+    monkeypatch.setattr(FuzzySearchService, "matches", classmethod(lambda *a, **k: pytest.fail()))
+    assert [l.name for l in LicenseService.get_licenses(q="quillvector").items] == ["Quillvector Suite"]
+
+
+def test_threshold_rejects_weak_matches(db, fuzzy, monkeypatch, make_user):
+    owner = make_user("fuzzy.threshold", "admin")
+    ApplicationService.create_application(owner, name="Marmalade Gateway")
+    assert FuzzySearchService.matches("applications", "marmalad")
+    monkeypatch.setattr(FuzzySearchService, "_threshold", 0.95)
+    assert FuzzySearchService.matches("applications", "marmalad") == []
+
+
+def test_quick_search_typo(db, fuzzy, make_user):
+    owner = make_user("fuzzy.quick", "admin")
+    LicenseService.create_license(owner, name="Tessellate Studio")
+    results = QuickSearchService.search(owner, "tesselate")
+    assert ("licenses", "Tessellate Studio") in [(kind, name) for kind, _, name in results]
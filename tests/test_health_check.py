@@ -0,0 +1,140 @@
+import asyncio
+import socket
+import ssl
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+
+from app.models.application import Application
+from app.models.user import User
+from app.services.health_check_service import HealthCheckService, _Prober, probe_target
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(503 if self.path == "/broken" else 200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def http_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def https_server(tmp_path):
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = datetime.now(timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name).issuer_name(name).public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(days=1))
+        .not_valid_after(now + timedelta(days=5))
+        .sign(key, hashes.SHA256())
+    )
+    cert_file, key_file = tmp_path / "cert.pem", tmp_path / "key.pem"
+    cert_file.write_bytes(cert.public_bytes(serialization.Encoding.PEM))
+    key_file.write_bytes(key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ))
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert_file, key_file)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server.server_address[1], cert.not_valid_after_utc.replace(tzinfo=None)
+    server.shutdown()
+    server.server_close()
+
+
+def _closed_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _app(db, name, **fields):
+    owner = User.query.filter_by(username="health.admin").first()
+    if not owner:
+        owner = User(username="health.admin", full_name="Health Admin", role="admin")
+        db.session.add(owner)
+        db.session.commit()
+    record = Application(name=name, created_by_id=owner.id, **fields)
+    db.session.add(record)
+    db.session.commit()
+    return record
+
+
+def test_probe_target_prefers_host_and_port():
+    record = Application(id=1, url="https://portal.example.com/login")
+    assert probe_target(record) == (1, "portal.example.com", 443, "https://portal.example.com/login")
+    record = Application(id=2, ip_address="10.0.0.5", port=1521)
+    assert probe_target(record) == (2, "10.0.0.5", 1521, None)
+    assert probe_target(Application(id=3, server_name="db01")) is None
+
+
+def test_run_records_status_against_local_servers(db, http_server, https_server):
+    tls_port, tls_expiry = https_server
+    up = _app(db, "Health Up", url=f"http://127.0.0.1:{http_server}/")
+    broken = _app(db, "Health Broken", url=f"http://127.0.0.1:{http_server}/broken")
+    closed = _app(db, "Health Closed", ip_address="127.0.0.1", port=_closed_port())
+    tls = _app(db, "Health TLS", url=f"https://localhost:{tls_port}/")
+    skipped = _app(db, "Health Inactive", url=f"http://127.0.0.1:{http_server}/",
+                   status="inactive")
+    ids = [up.id, broken.id, closed.id, tls.id, skipped.id]
+
+    counts = HealthCheckService.run(app_ids=ids)
+    assert counts == {"up": 1, "down": 2, "degraded": 1}
+
+    health = HealthCheckService.latest(ids)
+    assert skipped.id not in health
+    assert health[up.id].http_status == 200 and health[up.id].tcp_ms is not None
+    assert health[broken.id].status == "down" and health[broken.id].http_status == 503
+    assert health[closed.id].error and health[closed.id].http_status is None
+    # Self-signed and expiring within HEALTH_CHECK_TLS_WARN_DAYS
+    assert health[tls.id].status == "degraded"
+    assert health[tls.id].tls_expires_at.replace(microsecond=0) == tls_expiry.replace(microsecond=0)
+
+    HealthCheckService.run(app_ids=[up.id])
+    db.session.refresh(health[up.id])
+    assert [entry[1] for entry in health[up.id].history_entries] == ["up", "up"]
+
+
+def test_prober_spaces_probes_per_host(http_server):
+    prober = _Prober(concurrency=10, timeout=2, host_interval=0.1, slow_ms=2000, tls_warn_days=14)
+    targets = [probe_target(Application(id=i, ip_address="127.0.0.1", port=http_server))
+               for i in range(4)]
+    started = time.monotonic()
+    results = asyncio.run(prober.run(targets))
+    assert time.monotonic() - started >= 0.3
+    assert {r["status"] for r in results} == {"up"}
+
+
+def test_health_badges_render_from_stored_results(client, db, http_server, login_as):
+    record = _app(db, "Health Badge", url=f"http://127.0.0.1:{http_server}/")
+    HealthCheckService.run(app_ids=[record.id])
+    login_as(User.query.filter_by(username="health.admin").first())
+
+    page = client.get("/applications/?q=Health Badge").get_data(as_text=True)
+    assert "bg-success" in page and " ms</small>" in page
+    page = client.get(f"/applications/{record.id}").get_data(as_text=True)
+    assert "TCP Connect" in page and "<code>200</code>" in page
@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import update
+
+from app.models.secret import Secret
+from app.services.hygiene_service import WEAK_SCORE, HygieneService
+from app.services.secret_service import SecretService
+
+REUSED = "Shared-Pa55word!hygiene"
+
+
+def test_setter_keeps_fingerprint_score_and_rotation(db, make_user):
+    user = make_user("hygiene.setter")
+    first = SecretService.create_secret(user, "Hygiene A", "credential", password=REUSED,
+                                        rotation_interval_days=30)
+    second = SecretService.create_secret(user, "Hygiene B", "credential", password=REUSED)
+    other = SecretService.create_secret(user, "Hygiene C", "credential", password="abc")
+
+    assert len(first.password_fingerprint) == 64
+    assert REUSED not in first.password_fingerprint
+    assert first.password_fingerprint == second.password_fingerprint
+    assert other.password_fingerprint != first.password_fingerprint
+    assert other.password_score < WEAK_SCORE <= first.password_score
+    assert first.password_rotate_at - first.password_last_changed == timedelta(days=30)
+    assert second.password_rotate_at is None
+
+    SecretService.update_secret(second, rotation_interval_days=7, password=None)
+    assert second.password_fingerprint is None and second.password_score is None
+    assert second.password_rotate_at == second.password_last_changed + timedelta(days=7)
+
+
+def test_report_endpoint(client, db, make_user, login_as):
+    owner = make_user("hygiene.owner")
+    reused = [
+        SecretService.create_secret(owner, f"Hygiene reuse {i}", "credential",
+                                    password="Reused#Hygiene-2031")
+        for i in range(3)
+    ]
+    weak = SecretService.create_secret(owner, "Hygiene weak", "credential", password="qwerty")
+    stale = SecretService.create_secret(owner, "Hygiene stale", "credential",
+                                        password="Stale#Hygiene-2031", rotation_interval_days=30)
+    stale.password_last_changed = datetime.now(timezone.utc) - timedelta(days=45)
+    db.session.commit()
+    HygieneService.invalidate()
+
+    login_as("hygiene.admin", "admin")
+    assert client.get("/api/v1/reports/password-hygiene?limit=0").status_code == 400
+    data = client.get("/api/v1/reports/password-hygiene?limit=500").get_json()["data"]
+
+    group = next(g for g in data["reuse_groups"]
+                 if {s["id"] for s in g["secrets"]} & {s.id for s in reused})
+    assert group["size"] == 3
+    assert {s["id"] for s in group["secrets"]} == {s.id for s in reused}
+    assert group["secrets"][0]["owner"] == "hygiene.owner"
+    assert weak.id in {s["id"] for s in data["weak"]}
+    assert stale.id in {s["id"] for s in data["overdue"]}
+    assert reused[0].id not in {s["id"] for s in data["overdue"] + data["weak"]}
+    assert data["summary"]["reused"] >= 3 and data["summary"]["reuse_groups"] >= 1
+
+    # A secret write drops the cached report.
+    SecretService.update_secret(reused[2], password="Changed#Hygiene-2031")
+    data = client.get("/api/v1/reports/password-hygiene?limit=500").get_json()["data"]
+    group = next(g for g in data["reuse_groups"]
+                 if {s["id"] for s in g["secrets"]} & {s.id for s in reused})
+    assert group["size"] == 2
+
+
+def _assessments(ids):
+    return {
+        s.id: (s.password_fingerprint, s.password_score, s.password_rotate_at)
+        for s in Secret.query.filter(Secret.id.in_(ids))
+    }
+
+
+def test_backfill_restores_assessments(app, db, make_user):
+    user = make_user("hygiene.backfill")
+    secrets = [
+        SecretService.create_secret(user, f"Hygiene backfill {i}", "credential",
+                                    password=f"Backfill#{i % 3}-Hygiene", rotation_interval_days=90)
+        for i in range(7)
+    ]
+    SecretService.create_secret(user, "Hygiene no password", "note", notes="nothing secret")
+    ids = [s.id for s in secrets]
+    expected = _assessments(ids)
+
+    for workers in (1, 2):
+        db.session.execute(
+            update(Secret).where(Secret.id.in_(ids))
+            .values(password_fingerprint=None, password_score=None, password_rotate_at=None)
+        )
+        db.session.commit()
+        done = HygieneService.backfill(app.instance_path, batch_size=3, workers=workers)
+        db.session.expire_all()
+        assert done >= len(ids)
+        assert _assessments(ids) == expected
+
+    # Already-assessed rows are skipped unless a full reassessment is asked for.
+    assert HygieneService.backfill(app.instance_path, workers=1) <= done - len(ids)
+    assert HygieneService.backfill(app.instance_path, workers=1, recompute=True) >= 8
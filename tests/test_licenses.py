@@ -0,0 +1,223 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from app.models.license import License, LicenseAssignment
+from app.models.user import User
+from app.services.license_service import LicenseService
+
+
+def test_seat_counter_follows_assignments(db, make_user):
+    admin = make_user("license.admin", "admin")
+    lic = LicenseService.create_license(admin, name="Counter Suite", seat_count=2)
+    assert lic.used_seats == 0
+
+    first, _ = LicenseService.assign_user(lic, "alice", admin)
+    LicenseService.assign_user(lic, "bob", admin)
+    assert lic.used_seats == 2
+    assert lic.available_seats == 0
+    assert lic.utilization_percent == 100.0
+
+    _, error = LicenseService.assign_user(lic, "carol", admin)
+    assert error == "No available seats for this license."
+
+    LicenseService.unassign_user(first, admin)
+    LicenseService.unassign_user(first, admin)  # already inactive: no double decrement
+    assert lic.used_seats == 1
+
+
+def test_reconcile_fixes_drift(db, make_user):
+    admin = make_user("license.admin", "admin")
+    lic = LicenseService.create_license(admin, name="Drift Suite", seat_count=10)
+    LicenseService.assign_user(lic, "dave", admin)
+    db.session.add(LicenseAssignment(license_id=lic.id, assigned_to="erin",
+                                     assigned_by_id=admin.id))
+    db.session.commit()
+    assert lic.used_seats == 1
+
+    assert LicenseService.reconcile_seat_counts() == [lic.id]
+    db.session.refresh(lic)
+    assert lic.used_seats == 2
+    assert LicenseService.reconcile_seat_counts() == []
+
+
+def test_assign_users_claims_batch(db, make_user):
+    admin = make_user("license.admin", "admin")
+    lic = LicenseService.create_license(admin, name="Batch Suite", seat_count=3)
+    LicenseService.assign_user(lic, "frank", admin)
+
+    assignments, error = LicenseService.assign_users(lic, ["frank", "gina", "hal", "gina"], admin)
+    assert error is None
+    assert sorted(a.assigned_to for a in assignments) == ["gina", "hal"]
+    assert lic.used_seats == 3
+
+    assignments, error = LicenseService.assign_users(lic, ["ivy"], admin)
+    assert assignments == [] and error.startswith("Not enough seats")
+    assert LicenseAssignment.query.filter_by(license_id=lic.id, is_active=True).count() == 3
+
+
+def test_unique_active_assignment_enforced(db, make_user):
+    admin = make_user("license.admin", "admin")
+    lic = LicenseService.create_license(admin, name="Unique Suite")
+    LicenseService.assign_user(lic, "jack", admin)
+    db.session.add(LicenseAssignment(license_id=lic.id, assigned_to="jack",
+                                     assigned_by_id=admin.id))
+    with pytest.raises(IntegrityError):
+        db.session.commit()
+    db.session.rollback()
+
+
+def test_parallel_assignments_never_oversubscribe(tmp_path, monkeypatch):
+    from app import create_app, db as _db
+    from app.config import TestingConfig
+
+    monkeypatch.setattr(TestingConfig, "SQLALCHEMY_DATABASE_URI",
+                        f"sqlite:///{tmp_path / 'seats.db'}")
+    monkeypatch.setattr(TestingConfig, "SQLALCHEMY_ENGINE_OPTIONS",
+                        {"connect_args": {"timeout": 30}}, raising=False)
+    stress_app = create_app("testing")
+    with stress_app.app_context():
+        _db.create_all()
+        admin = User(username="stress.admin", full_name="Stress", role="admin")
+        _db.session.add(admin)
+        _db.session.commit()
+        license_id = LicenseService.create_license(admin, name="Stress Suite", seat_count=7).id
+        admin_id = admin.id
+
+    def worker(n):
+        with stress_app.app_context():
+            lic = _db.session.get(License, license_id)
+            user = _db.session.get(User, admin_id)
+            for attempt in range(50):
+                try:
+                    if n % 3 == 0:
+                        _, error = LicenseService.assign_users(
+                            lic, [f"batch{n}-a", f"batch{n}-b"], user
+                        )
+                    else:
+                        _, error = LicenseService.assign_user(lic, f"user{n}", user)
+                    return error
+                except OperationalError:  # "database is locked": retry
+                    _db.session.rollback()
+            return "gave up"
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(worker, range(24)))
+
+    with stress_app.app_context():
+        lic = _db.session.get(License, license_id)
+        active = LicenseAssignment.query.filter_by(license_id=license_id, is_active=True).count()
+        assert active == lic.used_seats
+        assert 0 < active <= 7
+        assert "gave up" not in results
+        assert any(r and "seats" in r for r in results)
+        _db.drop_all()
+
+
+def test_parallel_unassigns_release_each_seat_once(tmp_path, monkeypatch):
+    from app import create_app, db as _db
+    from app.config import TestingConfig
+
+    monkeypatch.setattr(TestingConfig, "SQLALCHEMY_DATABASE_URI",
+                        f"sqlite:///{tmp_path / 'release.db'}")
+    monkeypatch.setattr(TestingConfig, "SQLALCHEMY_ENGINE_OPTIONS",
+                        {"connect_args": {"timeout": 30}}, raising=False)
+    stress_app = create_app("testing")
+    with stress_app.app_context():
+        _db.create_all()
+        admin = User(username="release.admin", full_name="Release", role="admin")
+        _db.session.add(admin)
+        _db.session.commit()
+        lic = LicenseService.create_license(admin, name="Release Suite", seat_count=10)
+        assignments, _ = LicenseService.assign_users(lic, [f"held{i}" for i in range(6)], admin)
+        license_id, admin_id = lic.id, admin.id
+        assignment_ids = [a.id for a in assignments[:4]]
+
+    loaded = threading.Barrier(16)
+
+    def worker(n):
+        with stress_app.app_context():
+            user = _db.session.get(User, admin_id)
+            # Every worker holds the row as active before anyone releases it.
+            assignment = _db.session.get(LicenseAssignment, assignment_ids[n % 4])
+            assert assignment.is_active
+            _db.session.commit()
+            loaded.wait()
+            for attempt in range(50):
+                try:
+                    LicenseService.unassign_user(assignment, user)
+                    return
+                except OperationalError:  # "database is locked": retry
+                    _db.session.rollback()
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        list(pool.map(worker, range(16)))
+
+    with stress_app.app_context():
+        lic = _db.session.get(License, license_id)
+        assert lic.used_seats == 2
+        assert LicenseAssignment.query.filter_by(license_id=license_id,
+                                                 is_active=True).count() == 2
+        _db.drop_all()
+
+
+def test_assignee_key_resolves_users(db, make_user):
+    admin = make_user("license.admin", "admin")
+    person = User(username="kim.lee", full_name="Kim Lee", email="Kim.Lee@corp.local", role="user")
+    db.session.add(person)
+    db.session.commit()
+
+    lic = LicenseService.create_license(admin, name="Keyed Suite")
+    LicenseService.assign_user(lic, "CORP\\kim.lee", admin)
+    keys = LicenseService.assignee_keys(["kim lee", "KIM.LEE@corp.local", "Someone Else"])
+    assert keys == {"kim lee": "kim.lee", "KIM.LEE@corp.local": "kim.lee",
+                    "Someone Else": "someone else"}
+
+    # A username match wins over another user's full name or email.
+    db.session.add_all([
+        User(username="jo.park", full_name="Jo Park", role="user"),
+        User(username="jo.other", full_name="jo.park", email="JO.PARK", role="user"),
+    ])
+    db.session.commit()
+    assert LicenseService.assignee_keys(["CORP\\Jo.Park"]) == {"CORP\\Jo.Park": "jo.park"}
+
+    other = LicenseService.create_license(admin, name="Other Suite")
+    LicenseService.assign_user(other, "kim", admin)  # substring match no longer counts
+
+    assert [a.license.name for a in LicenseService.get_user_licenses(person)] == ["Keyed Suite"]
+
+
+def test_bulk_import_reports_per_row(client, db, make_user, login_as):
+    admin = make_user("license.admin", "admin")
+    login_as(admin)
+    lic = LicenseService.create_license(admin, name="Import Suite", seat_count=3)
+    LicenseService.assign_user(lic, "liam", admin)
+
+    csv_body = "assigned_to,machine_name\nliam,PC-1\nmia,PC-2\n,PC-3\nnoah,\nMIA,\nolivia,\n"
+    response = client.post(f"/api/v1/licenses/{lic.id}/assignments/import",
+                           data=csv_body, content_type="text/csv")
+    assert response.status_code == 200, response.data[:300]
+    data = response.get_json()["data"]
+
+    statuses = [(r["assigned_to"], r["status"]) for r in data["results"]]
+    assert statuses == [("liam", "skipped"), ("mia", "assigned"), ("", "error"),
+                        ("noah", "assigned"), ("MIA", "skipped"), ("olivia", "error")]
+    assert data["summary"] == {"skipped": 2, "assigned": 2, "error": 2}
+    assert data["available_seats"] == 0
+    assert LicenseAssignment.query.filter_by(license_id=lic.id, is_active=True).count() == 3
+
+    assign_url = f"/api/v1/licenses/{lic.id}/assignments"
+    assert client.post(assign_url, json=[{"assigned_to": "zed"}]).status_code == 400
+    assert client.post(assign_url, data="zed", content_type="text/plain").status_code == 400
+    assert client.post(assign_url, json={}).status_code == 400
+
+    url = f"/api/v1/licenses/{lic.id}/assignments/import"
+    assert client.post(url, json="liam").status_code == 400
+    assert client.post(url, json=[]).status_code == 400
+    other = LicenseService.create_license(admin, name="Import List Suite")
+    response = client.post(f"/api/v1/licenses/{other.id}/assignments/import",
+                           json=[{"assigned_to": "zed"}])
+    assert response.status_code == 200
+    assert response.get_json()["data"]["summary"] == {"assigned": 1}
@@ -0,0 +1,39 @@
+from app.services.metrics_service import MetricsService
+
+
+def test_metrics_requires_admin(client, db, login_as):
+    login_as("metrics_user", "user")
+    assert client.get("/admin/metrics").status_code == 403
+
+
+def test_metrics_records_requests(client, db, login_as):
+    MetricsService.reset()
+    login_as("metrics_admin", "admin")
+
+    assert client.get("/secrets/").status_code == 200
+    response = client.get("/admin/metrics")
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    body = response.get_data(as_text=True)
+    assert 'keyvault_requests_total{endpoint="secrets.list_secrets",status="200"} 1' in body
+    assert 'keyvault_request_duration_seconds_count{endpoint="secrets.list_secrets"} 1' in body
+    statements = [
+        line for line in body.splitlines()
+        if line.startswith('keyvault_db_statements_total{endpoint="secrets.list_secrets"}')
+    ]
+    assert statements and int(statements[0].split()[-1]) > 0
+
+
+def test_crypto_operations_counted_per_request(app):
+    from app.services.encryption_service import EncryptionService
+
+    MetricsService.reset()
+    with app.test_request_context("/nowhere"):
+        app.preprocess_request()
+        EncryptionService.decrypt(EncryptionService.encrypt("value"))
+        app.process_response(app.response_class())
+
+    body = MetricsService.render_prometheus()
+    assert 'keyvault_crypto_operations_total{endpoint="unmatched",op="decrypt"} 1' in body
+    assert 'keyvault_crypto_operations_total{endpoint="unmatched",op="encrypt"} 1' in body
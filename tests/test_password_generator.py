@@ -41,3 +41,116 @@ def test_strength_weak():
 def test_strength_strong():
     result = PasswordGenerator.calculate_strength("MyStr0ng!Password123")
     assert result["strength"] == "strong"
+
+
+def test_batch_keeps_class_guarantees_and_options():
+    symbols = "#%"
+    batch = list(PasswordGenerator.generate_batch(
+        500, length=12, custom_symbols=symbols, exclude_ambiguous=True
+    ))
+    assert len(batch) == 500
+    allowed = set(string.ascii_letters + string.digits + symbols) - set("lOI01")
+    for password, strength in batch:
+        assert len(password) == 12 and set(password) <= allowed
+        assert any(c.islower() for c in password) and any(c.isupper() for c in password)
+        assert any(c.isdigit() for c in password) and any(c in symbols for c in password)
+        assert strength == PasswordGenerator.calculate_strength(password)
+    assert len({password for password, _ in batch}) == 500
+
+
+def test_short_length_keeps_first_classes():
+    password = PasswordGenerator.generate(length=2, use_uppercase=False, use_symbols=False)
+    assert len(password) == 2
+    assert any(c.islower() for c in password) and any(c.isdigit() for c in password)
+
+
+def test_random_buffer_is_unbiased():
+    from collections import Counter
+
+    from app.services.password_generator import _RandomBuffer
+
+    rng = _RandomBuffer()
+    counts = Counter(rng.below(3) for _ in range(30000))
+    assert set(counts) == {0, 1, 2}
+    assert all(abs(n - 10000) < 600 for n in counts.values())
+    assert all(0 <= rng.below(1000) < 1000 for _ in range(1000))
+
+
+def test_batch_api_streams_ndjson(client, db, login_as):
+    import json
+
+    login_as("generator.batch")
+
+    response = client.post("/api/v1/generator/password",
+                           json={"count": 450, "length": 16, "symbols": False})
+    assert response.mimetype == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert len(lines) == 450
+    assert all(len(line["password"]) == 16 and line["password"].isalnum() for line in lines)
+    assert client.post("/api/v1/generator/password", json={"count": 0}).status_code == 400
+    assert client.post("/api/v1/generator/password", json={"count": True}).status_code == 400
+    single = client.post("/api/v1/generator/password", json={"custom_symbols": "@"}).get_json()
+    assert "@" in single["data"]["password"]
+
+
+def test_wordlist_is_packed_and_passphrases_follow_options():
+    import math
+    import re
+
+    from app.services.password_generator import _wordlist
+
+    wordlist = _wordlist()
+    words = [wordlist[i] for i in range(len(wordlist))]
+    assert len(words) == len(set(words)) == 4096
+    assert all(re.fullmatch(r"[a-z]{3,9}", word) for word in words)
+
+    phrase = PasswordGenerator.generate_passphrase(words=5, separator=".")
+    assert len(phrase.split(".")) == 5 and set(phrase.split(".")) <= set(words)
+    assert PasswordGenerator.passphrase_entropy(words=5) == 60
+
+    for phrase, strength in PasswordGenerator.generate_passphrase_batch(
+        200, words=6, separator="", capitalize="title", digits=2
+    ):
+        parts = re.findall(r"[A-Z][a-z]+\d?", phrase)
+        assert "".join(parts) == phrase and len(parts) == 6
+        assert sum(part[-1].isdigit() for part in parts) == 2
+        assert strength["entropy"] == round(72 + math.log2(15) + 2 * math.log2(10), 2)
+
+    capitals = [
+        sum(word[0].isupper() for word in phrase.split("-"))
+        for phrase, _ in PasswordGenerator.generate_passphrase_batch(300, capitalize="random")
+    ]
+    assert len(set(capitals)) > 3
+    assert abs(sum(capitals) / len(capitals) - 3) < 0.5
+
+
+def test_passphrase_options_are_checked():
+    import pytest
+
+    for options in ({"words": 2}, {"capitalize": "upper"}, {"digits": 7},
+                    {"separator": "x"}, {"separator": ""}):
+        with pytest.raises(ValueError):
+            PasswordGenerator.generate_passphrase(**options)
+    with pytest.raises(ValueError):
+        PasswordGenerator.generate_passphrase_batch(10, separator="1")
+
+
+def test_passphrase_api(client, db, login_as):
+    import json
+
+    login_as("generator.passphrase")
+
+    single = client.post("/api/v1/generator/password",
+                         json={"mode": "passphrase", "words": 4, "separator": " "}).get_json()
+    assert len(single["data"]["password"].split(" ")) == 4
+    assert single["data"]["strength"]["entropy"] == 48
+
+    response = client.post("/api/v1/generator/password",
+                           json={"mode": "passphrase", "count": 300, "digits": 1})
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert len(lines) == 300
+    assert all(sum(c.isdigit() for c in line["password"]) == 1 for line in lines)
+
+    bad = client.post("/api/v1/generator/password",
+                      json={"mode": "passphrase", "count": 5, "separator": "a"})
+    assert bad.status_code == 400
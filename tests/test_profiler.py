@@ -0,0 +1,46 @@
+import pytest
+
+from app.services.profiler_service import PROFILE_HEADER, ProfilerService
+
+
+@pytest.fixture
+def profile_dir(app, tmp_path, monkeypatch):
+    monkeypatch.setattr(app, "instance_path", str(tmp_path))
+    return tmp_path / "profiles"
+
+
+def test_admin_flag_captures_profile(app, client, db, profile_dir, login_as):
+    login_as("profile_admin", "admin")
+
+    assert client.get("/secrets/?_profile=1").status_code == 200
+
+    with app.test_request_context():
+        captures = ProfilerService.list_captures()
+    assert len(captures) == 1
+    assert captures[0]["endpoint"] == "secrets.list_secrets"
+    assert captures[0]["mode"] == "flag"
+    assert captures[0]["top_functions"]
+    assert len(list(profile_dir.glob("*.pstats"))) == 1
+
+    response = client.get("/admin/profiles")
+    assert response.status_code == 200
+    assert b"secrets.list_secrets" in response.data
+
+
+def test_flag_ignored_for_non_admin(client, db, profile_dir, login_as):
+    login_as("profile_user", "user")
+
+    assert client.get("/secrets/?_profile=1").status_code == 200
+    assert not profile_dir.exists() or not list(profile_dir.glob("*.json"))
+
+
+def test_signed_header_captures_profile(app, client, db, profile_dir, login_as):
+    login_as("profile_user", "user")
+    with app.test_request_context():
+        token = ProfilerService.create_token()
+
+    client.get("/secrets/", headers={PROFILE_HEADER: "forged"})
+    assert not profile_dir.exists() or not list(profile_dir.glob("*.json"))
+
+    client.get("/secrets/", headers={PROFILE_HEADER: token})
+    assert len(list(profile_dir.glob("*.json"))) == 1
@@ -0,0 +1,124 @@
+import time
+
+import pytest
+
+from app.models.application import Application
+from app.models.folder import Folder
+from app.models.share import SecretShare
+from app.models.user import User
+from app.services.quick_search_service import QuickSearchService
+from app.services.secret_service import SecretService
+
+
+@pytest.fixture
+def index():
+    QuickSearchService.reset()
+    yield QuickSearchService
+    QuickSearchService.reset()
+
+
+def _names(client, q, **params):
+    response = client.get("/api/v1/search", query_string={"q": q, **params})
+    assert response.status_code == 200
+    return [(r["type"], r["name"]) for r in response.get_json()["data"]]
+
+
+def test_quick_search_filters_by_access(client, db, index, login_as):
+    other = login_as("quick.other")
+    hidden = SecretService.create_secret(other, "Nimbus hidden", "credential")
+    shared = SecretService.create_secret(other, "Nimbus shared", "credential")
+    db.session.add(Folder(name="Nimbus folder", owner_id=other.id))
+    db.session.commit()
+
+    me = login_as("quick.me")
+    db.session.add(SecretShare(secret_id=shared.id, user_id=me.id, shared_by_id=other.id))
+    SecretService.create_secret(me, "Nimbus mine", "credential")
+    db.session.add(Application(name="Nimbus Portal", created_by_id=other.id))
+    db.session.commit()
+
+    results = _names(client, "nimb")
+    assert ("secrets", "Nimbus mine") in results
+    assert ("secrets", "Nimbus shared") in results
+    assert ("applications", "Nimbus Portal") in results
+    assert ("secrets", hidden.name) not in results
+    assert ("folders", "Nimbus folder") not in results
+
+    assert _names(client, "portal nimb") == [("applications", "Nimbus Portal")]
+    assert _names(client, "nimbus", types="applications") == [("applications", "Nimbus Portal")]
+
+
+def test_quick_search_updates_on_commit(client, db, index, login_as):
+    me = login_as("quick.writer")
+    assert _names(client, "halcyon") == []
+    assert index.stats()["built"]
+
+    secret = SecretService.create_secret(me, "Halcyon vault", "credential")
+    assert _names(client, "halc") == [("secrets", "Halcyon vault")]
+
+    SecretService.update_secret(secret, name="Borealis vault")
+    assert _names(client, "halc") == []
+    assert _names(client, "bore") == [("secrets", "Borealis vault")]
+
+    SecretService.delete_secret(secret, me)
+    assert _names(client, "bore") == []
+
+
+def test_quick_search_scan_limit_counts_visible_hits(client, db, index, monkeypatch, login_as):
+    other = login_as("quick.zorblax.other")
+    foreign = [SecretService.create_secret(other, f"Zorblax foreign {i}", "credential")
+               for i in range(30)]
+    shared = SecretService.create_secret(other, "Zorblax shared", "credential")
+    me = login_as("quick.zorblax")
+    db.session.add(SecretShare(secret_id=shared.id, user_id=me.id, shared_by_id=other.id))
+    SecretService.create_secret(me, "Zorblax mine", "credential")
+    db.session.add_all([Application(name=f"Zorblax app {i}", created_by_id=me.id)
+                        for i in range(30)])
+    db.session.commit()
+    monkeypatch.setattr(QuickSearchService, "_scan_limit", 20)
+
+    results = _names(client, "zorblax", limit=50)
+    assert ("secrets", "Zorblax mine") in results
+    assert ("secrets", "Zorblax shared") in results
+    assert not {("secrets", s.name) for s in foreign} & set(results)
+    assert len([r for r in results if r[0] == "applications"]) == 20
+
+
+def test_quick_search_stale_index_not_rebuilt_in_request(client, db, index, login_as):
+    login_as("quick.stale")
+    _names(client, "a")
+    rebuilds = index.stats()["rebuilds"]
+    index._built_at -= index._refresh + 1
+    _names(client, "a")
+    assert index.stats()["rebuilds"] == rebuilds
+
+
+def test_quick_search_rolled_back_writes_not_indexed(client, db, index, login_as):
+    me = login_as("quick.rollback")
+    _names(client, "x")
+    db.session.add(Application(name="Phantom app", created_by_id=me.id))
+    db.session.flush()
+    db.session.rollback()
+    assert _names(client, "phantom") == []
+
+
+def test_quick_search_stats_requires_admin(client, db, index, login_as):
+    login_as("quick.plain")
+    assert client.get("/api/v1/search/stats").status_code == 403
+
+
+def test_quick_search_stats(client, db, index, login_as):
+    login_as("quick.admin", role="admin")
+    _names(client, "a")
+    data = client.get("/api/v1/search/stats").get_json()["data"]
+    assert data["entries"] > 0
+    assert data["memory_bytes"] > 0
+    assert data["rebuild_seconds"] is not None
+
+
+def test_quick_search_prefix_lookup_is_fast(app, db, index):
+    user = User.query.filter_by(username="quick.me").first()
+    index.search(user, "warmup")
+    started = time.perf_counter()
+    for _ in range(100):
+        index.search(user, "nim")
+    assert (time.perf_counter() - started) / 100 < 0.01
@@ -0,0 +1,100 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import event
+
+from app.models.license_rollup import LicenseRenewalRollup, LicenseSpendRollup
+from app.models.user import User
+from app.services.license_service import LicenseService
+from app.services.report_service import ReportService
+
+
+def _rollups():
+    spend = {
+        (r.vendor, r.department, r.currency): (r.license_count, Decimal(r.total_cost),
+                                               r.active_count, Decimal(r.active_cost))
+        for r in LicenseSpendRollup.query.filter(LicenseSpendRollup.license_count != 0)
+    }
+    renewals = {
+        (r.year, r.month, r.currency): (r.license_count, Decimal(r.total_cost))
+        for r in LicenseRenewalRollup.query.filter(LicenseRenewalRollup.license_count != 0)
+    }
+    return spend, renewals
+
+
+def test_incremental_rollups_match_full_refresh(db):
+    user = User(username="reports.admin", full_name="Reports Admin", role="admin")
+    db.session.add(user)
+    db.session.commit()
+
+    kept = LicenseService.create_license(user, name="Rollup A", vendor="Rollup Corp",
+                                         department="IT", cost=Decimal("100.50"),
+                                         currency="EUR", expiration_date=datetime(2031, 3, 1))
+    moved = LicenseService.create_license(user, name="Rollup B", vendor="Rollup Corp",
+                                          department="IT", cost=Decimal("40"), currency="EUR",
+                                          expiration_date=datetime(2031, 3, 15))
+    gone = LicenseService.create_license(user, name="Rollup C", vendor="Rollup Corp", cost=10)
+    LicenseService.update_license(moved, user, department="Finance",
+                                  expiration_date=datetime(2031, 5, 2))
+    LicenseService.update_license(kept, user, is_active=False)
+    LicenseService.delete_license(gone, user)
+
+    spend, renewals = _rollups()
+    assert spend[("Rollup Corp", "IT", "EUR")] == (1, Decimal("100.50"), 0, Decimal("0"))
+    assert spend[("Rollup Corp", "Finance", "EUR")] == (1, Decimal("40"), 1, Decimal("40"))
+    assert ("Rollup Corp", "", "USD") not in spend
+    assert (2031, 3, "EUR") not in renewals
+    assert renewals[(2031, 5, "EUR")] == (1, Decimal("40"))
+
+    ReportService.refresh_all()
+    assert _rollups() == (spend, renewals)
+
+
+def test_report_api_reads_only_rollups(client, db, app, login_as):
+    user = login_as("reports.viewer", "admin")
+    LicenseService.create_license(user, name="Rollup D", vendor="Api Vendor", department="Ops",
+                                  cost=Decimal("250"), currency="USD",
+                                  expiration_date=datetime(2032, 1, 20))
+
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", capture)
+    try:
+        response = client.get("/api/v1/reports/license-spend?group_by=vendor,department")
+        renewals = client.get("/api/v1/reports/license-renewals?from=2032-01&months=1")
+    finally:
+        event.remove(db.engine, "before_cursor_execute", capture)
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["group_by"] == ["vendor", "department", "currency"]
+    row = next(r for r in body["data"] if r["vendor"] == "Api Vendor")
+    assert row == {"vendor": "Api Vendor", "department": "Ops", "currency": "USD",
+                   "license_count": 1, "total_cost": "250.00",
+                   "active_count": 1, "active_cost": "250.00"}
+    assert renewals.get_json()["data"][0]["month"] == "2032-01"
+    assert any("license_spend_rollups" in s for s in statements)
+    assert not [s for s in statements if "FROM licenses" in s]
+
+
+def test_report_csv_and_validation(client, db, login_as):
+    user = login_as("reports.csv", "admin")
+    LicenseService.create_license(user, name="Rollup E", vendor="Csv Vendor", cost=5,
+                                  currency="GBP", expiration_date=datetime(2033, 7, 1))
+
+    response = client.get("/api/v1/reports/license-spend?group_by=vendor&format=csv")
+    assert response.mimetype == "text/csv"
+    lines = response.get_data(as_text=True).splitlines()
+    assert lines[0] == "vendor,currency,license_count,total_cost,active_count,active_cost"
+    assert "Csv Vendor,GBP,1,5.00,1,5.00" in lines
+
+    response = client.get("/api/v1/reports/license-renewals?from=2033-07&months=1&format=csv")
+    assert response.get_data(as_text=True).splitlines()[1:] == ["2033-07,GBP,1,5.00"]
+
+    assert client.get("/api/v1/reports/license-spend?group_by=owner").status_code == 400
+    assert client.get("/api/v1/reports/license-renewals?months=0").status_code == 400
+    assert client.get("/api/v1/reports/license-renewals?from=07-2033").status_code == 400
+    assert ReportService.renewals(start=date(2033, 7, 1), months=1)[0]["license_count"] == 1
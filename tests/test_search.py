@@ -0,0 +1,70 @@
+import pytest
+
+from app.models.application import Application
+from app.models.secret import Secret
+from app.models.user import User
+from app.services.application_service import ApplicationService
+from app.services.search_service import SearchService, tokenize
+from app.services.secret_service import SecretService
+
+
+@pytest.fixture(params=["auto", "memory"])
+def backend(request, monkeypatch, db):
+    monkeypatch.setattr(SearchService, "_mode", request.param)
+    SearchService.reset()
+    yield request.param
+    owners = [u.id for u in User.query.filter(User.username.like("search.%"))]
+    Application.query.filter(Application.created_by_id.in_(owners)).delete()
+    Secret.query.filter(Secret.owner_id.in_(owners)).delete()
+    db.session.commit()
+    SearchService.rebuild()
+    SearchService.reset()
+
+
+def test_tokenize_normalizes():
+    assert tokenize("Jane.Doe@Corp.local") == ["jane", "doe", "corp", "local"]
+    assert tokenize("Şifre Güçlü_app") == ["sifre", "guclu", "app"]
+    assert tokenize("%%") == []
+
+
+def test_application_search_ranked_and_maintained(db, backend, make_user):
+    owner = make_user("search.owner")
+    if backend == "auto":
+        assert SearchService.backend_name() == "sqlite-fts5"
+    ApplicationService.create_application(owner, name="Zephyr Billing", department="Finance")
+    mentioned = ApplicationService.create_application(
+        owner, name="Ledger", description="Feeds the zephyr billing export"
+    )
+
+    names = [a.name for a in ApplicationService.get_applications(q="zeph bill").items]
+    assert names == ["Zephyr Billing", "Ledger"]
+
+    ApplicationService.update_application(mentioned, owner, description="Nightly batch")
+    assert [a.name for a in ApplicationService.get_applications(q="zephyr").items] == ["Zephyr Billing"]
+
+    ApplicationService.delete_application(Application.query.filter_by(name="Zephyr Billing").one(), owner)
+    assert ApplicationService.get_applications(q="zephyr").items == []
+
+    # No indexable tokens: falls back to the LIKE filter.
+    ApplicationService.create_application(owner, name="Quirk #", description="n/a")
+    assert [a.name for a in ApplicationService.get_applications(q="#").items] == ["Quirk #"]
+
+
+def test_secret_search_respects_access(db, backend, make_user):
+    alice = make_user("search.alice")
+    bob = make_user("search.bob")
+    SecretService.create_secret(alice, "Orchid relay", "credential")
+    SecretService.create_secret(bob, "Orchid backup", "credential")
+
+    names = [s.name for s in SecretService.get_accessible_secrets(alice, q="orchid").items]
+    assert names == ["Orchid relay"]
+
+
+def test_rebuild_indexes_existing_rows(db, backend, make_user):
+    owner = make_user("search.rebuild")
+    db.session.add(Application(name="Quasar Gateway", created_by_id=owner.id))
+    db.session.commit()
+
+    counts = SearchService.rebuild(kind="applications")
+    assert counts["applications"] == Application.query.count()
+    assert [a.name for a in ApplicationService.get_applications(q="quasar").items] == ["Quasar Gateway"]
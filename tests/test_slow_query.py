@@ -0,0 +1,48 @@
+import logging
+
+from sqlalchemy import text
+
+from app.services.slow_query_service import (
+    SlowQueryService, fingerprint, logger, redact_parameters,
+)
+
+
+def test_fingerprint_normalizes_literals():
+    fp1, sql = fingerprint("SELECT * FROM secrets WHERE id IN (1, 2, 3) AND name = 'a'")
+    fp2, _ = fingerprint("select * from secrets\n WHERE id IN (7) AND name = 'other'")
+
+    assert sql == "SELECT * FROM secrets WHERE id IN (?+) AND name = ?"
+    assert fp1 != fp2  # keyword case is preserved
+    assert fingerprint("SELECT a FROM t WHERE b = :b_1")[0] == fingerprint("SELECT a FROM t WHERE b = ?")[0]
+
+
+def test_parameters_are_redacted():
+    assert redact_parameters(("hunter2", 5)) == "[str, int]"
+    assert "hunter2" not in redact_parameters({"password": "hunter2"})
+
+
+def test_slow_statement_recorded_with_plan(db, monkeypatch, tmp_path):
+    SlowQueryService.reset()
+    monkeypatch.setattr(SlowQueryService, "_threshold", 0.0)
+    # Every statement is "slow" at threshold 0; keep the log out of the repo.
+    handler = logging.FileHandler(tmp_path / "slow_queries.log")
+    monkeypatch.setattr(logger, "handlers", [handler])
+
+    result = db.session.execute(text("SELECT username FROM users ORDER BY id"))
+    expected = [row[0] for row in db.session.execute(text("SELECT username FROM users ORDER BY id"))]
+    db.session.execute(text("SELECT id FROM secrets WHERE name = :name"), {"name": "x"})
+    db.session.execute(text("SELECT id FROM secrets WHERE name = :name"), {"name": "y"})
+    # Plans are captured later, off the caller's connection and result set.
+    assert [row[0] for row in result] == expected
+    assert SlowQueryService.explain_pending() >= 2
+
+    entries = [e for e in SlowQueryService.top(limit=100)
+               if e["sql"] == "SELECT id FROM secrets WHERE name = ?"]
+    assert len(entries) == 1
+    assert entries[0]["count"] == 2
+    assert "SCAN" in entries[0]["explain"] or "SEARCH" in entries[0]["explain"]
+
+    handler.close()
+    log = (tmp_path / "slow_queries.log").read_text()
+    assert "sql=SELECT id FROM secrets WHERE name = ?" in log
+    assert "params=[str]" in log
@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import update
+
+from app.models.group import Group
+from app.models.user import User
+from app.services import user_cache_service
+from app.services.metrics_service import MetricsService
+from app.services.user_cache_service import UserCacheService
+
+
+def test_snapshot_served_from_cache(app, db, make_user):
+    user = make_user("ucache.reader")
+    team = Group(name="ucache team")
+    db.session.add(team)
+    db.session.commit()
+
+    first = UserCacheService.load(user.id)
+    before = UserCacheService.stats()
+    second = UserCacheService.load(user.id)
+    assert second is first
+    assert UserCacheService.stats()["hits"] == before["hits"] + 1
+    assert (first.username, first.role, first.is_admin(), first.can_write()) == (
+        "ucache.reader", "user", False, True,
+    )
+    # Attributes outside the snapshot come from the row.
+    assert first.created_at == user.created_at
+
+    team.members.append(user)
+    db.session.commit()
+    assert UserCacheService.load(user.id).group_ids == {team.id}
+
+
+def test_admin_changes_apply_at_once(client, db, make_user, login_as):
+    admin = make_user("ucache.admin", role="admin")
+    target = make_user("ucache.target")
+    assert UserCacheService.load(target.id).role == "user"
+    login_as(admin)
+    client.get("/admin/users")
+
+    client.post(f"/admin/users/{target.id}/role", data={"role": "readonly"})
+    assert UserCacheService.load(target.id).role == "readonly"
+    client.post(f"/admin/users/{target.id}/toggle-active")
+    assert UserCacheService.load(target.id) is None
+
+    target.is_active = True
+    target.locked_until = datetime.now(timezone.utc) + timedelta(minutes=15)
+    db.session.commit()
+    assert UserCacheService.load(target.id) is None
+
+
+def test_revocation_elsewhere_applies_within_ttl(app, client, db, monkeypatch, make_user, login_as):
+    user = make_user("ucache.remote")
+    login_as(user)
+    assert client.get("/").status_code == 200
+
+    # Another worker deactivates the account; no session hook fires here.
+    db.session.execute(update(User).where(User.id == user.id).values(is_active=False))
+    db.session.commit()
+    login_as(user)
+    assert client.get("/").status_code == 200
+
+    now = user_cache_service.time.monotonic()
+    ttl = app.config["USER_CACHE_SECONDS"]
+    monkeypatch.setattr(user_cache_service.time, "monotonic", lambda: now + ttl + 1)
+    login_as(user)
+    response = client.get("/")
+    assert response.status_code == 302
+    assert "/auth/login" in response.headers["Location"]
+
+
+def test_hit_rate_metrics(client, db, make_user, login_as):
+    user = make_user("ucache.metrics")
+    MetricsService.reset()
+    for _ in range(3):
+        login_as(user)
+        assert client.get("/").status_code == 200
+
+    text = MetricsService.render_prometheus()
+    assert 'keyvault_user_cache_lookups_total{endpoint="dashboard.index",result="miss"} 1' in text
+    assert 'keyvault_user_cache_lookups_total{endpoint="dashboard.index",result="hit"} 2' in text